@@ -0,0 +1,80 @@
+# Command-line entry point: `python -m app solve ...` solves word lists without the
+# GUI and prints JSON, and `python -m app gui` opens the GUI. It is meant to be run
+# as a short-lived process many times over, so only what the chosen command needs is
+# imported: the solver module on first use (see solvers.py), Tk only for the GUI.
+import argparse
+import json
+import sys
+
+from app.solvers import SOLVERS
+
+def read_puzzle(path, grid_size):
+    """Reads the word list in a file, or stdin for '-', as a puzzle dict; raises ValueError if it cannot."""
+    from app.batch import parse_puzzle
+
+    if path == '-':
+        name, text = '<stdin>', sys.stdin.read()
+    else:
+        name = path
+        try:
+            with open(path) as f:
+                text = f.read()
+        except OSError as error:
+            raise ValueError(f"{path}: {error.strerror}") from None
+    try:
+        puzzle = parse_puzzle(text, name, grid_size)
+    except ValueError as error:
+        raise ValueError(f"{name}: {error}") from None
+    if puzzle is None:
+        raise ValueError(f"{name}: no words")
+    return puzzle
+
+def solve_command(args):
+    """Solves each input, printing one JSON result per line. Returns the exit status."""
+    from app.batch import solve_puzzle
+
+    status = 0
+    for path in args.inputs or ['-']:
+        try:
+            puzzle = read_puzzle(path, args.grid_size)
+        except ValueError as error:
+            result = {'id': path, 'solver': args.solver, 'status': 'error', 'reason': str(error)}
+        else:
+            result = solve_puzzle(puzzle, args.solver, args.timeout, args.max_nodes, args.cache)
+        if result['status'] == 'error':
+            status = 1
+        print(json.dumps(result, indent=2 if args.pretty else None), flush=True)
+    return status
+
+def gui_command(args):
+    from app.main import main
+    main()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m app', description="Arrowword maker.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    solve_parser = subparsers.add_parser(
+        'solve', help="Solve word lists and print the results as JSON.",
+        description="Solve word lists and print one JSON result per input. Each input holds one word "
+                    "list: words separated by commas, spaces or newlines, a JSON list, or a JSON object "
+                    "with 'words' and optionally 'id' and 'grid_size'.",
+    )
+    solve_parser.add_argument('inputs', nargs='*', metavar='FILE', help="Word list files (default, or -: stdin).")
+    solve_parser.add_argument('--solver', choices=list(SOLVERS), default='final', help="Solver to use.")
+    solve_parser.add_argument('--grid-size', type=int, default=8, help="Grid size for inputs that do not give one.")
+    solve_parser.add_argument('--timeout', type=float, help="Time budget per word list in seconds.")
+    solve_parser.add_argument('--max-nodes', type=int, help="Search node budget per word list.")
+    solve_parser.add_argument('--cache', metavar='DIR', help="Directory of cached results to reuse and add to.")
+    solve_parser.add_argument('--pretty', action='store_true', help="Indent the JSON output.")
+    solve_parser.set_defaults(run=solve_command)
+
+    gui_parser = subparsers.add_parser('gui', help="Open the GUI.")
+    gui_parser.set_defaults(run=gui_command)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
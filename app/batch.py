@@ -0,0 +1,175 @@
+import argparse
+import collections
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+
+from app.solvers import SOLVERS, solve
+
+_caches = {}  # cache directory -> SolutionCache of this process
+_WORD = re.compile(r'[A-Za-z]+')
+
+def parse_puzzle(line, line_number, default_grid_size):
+    """
+    Parses one input line into a puzzle dict with 'id', 'words' and 'grid_size'.
+    A line is a JSON object ({"id": ..., "words": [...], "grid_size": ...}), a JSON
+    list of words, or plain words separated by commas or whitespace. Words are letters
+    only. Returns None for a blank line and raises ValueError for one that cannot be
+    read, giving the line and column of the error within it, like json.loads.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    puzzle = {'id': line_number, 'grid_size': default_grid_size}
+    if line[0] in '[{':
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"invalid JSON: {error}") from None
+        if isinstance(data, dict):
+            puzzle['id'] = data.get('id', line_number)
+            puzzle['grid_size'] = data.get('grid_size', default_grid_size)
+            data = data.get('words')
+        if not isinstance(data, list) or not all(isinstance(word, str) for word in data):
+            raise ValueError("expected a list of words")
+        words = [word.strip() for word in data if word.strip()]
+        for word in words:
+            if not _WORD.fullmatch(word):
+                raise ValueError(f"invalid word {word!r}: expected letters only")
+        puzzle['words'] = [word.upper() for word in words]
+    else:
+        puzzle['words'] = []
+        for match in re.finditer(r'[^\s,]+', line):
+            word = match.group()
+            if not _WORD.fullmatch(word):
+                row = line.count('\n', 0, match.start()) + 1
+                column = match.start() - line.rfind('\n', 0, match.start())
+                raise ValueError(f"invalid word {word!r} at line {row} column {column}: expected letters only")
+            puzzle['words'].append(word.upper())
+    if not isinstance(puzzle['grid_size'], int) or puzzle['grid_size'] < 1:
+        raise ValueError(f"invalid grid_size {puzzle['grid_size']!r}")
+    if not puzzle['words']:
+        raise ValueError("no words")
+    return puzzle
+
+def solve_puzzle(puzzle, solver_name, timeout=None, max_nodes=None, cache_dir=None):
+    """
+    Solves one puzzle and returns its result record. The status is 'solved' when every
+    word is placed, 'partial' when the solver finished without placing them all,
+    'timeout' when the budget ran out first (with the best layout found so far) and
+    'error' when the solver raised; `reason` explains anything but 'solved'.
+    With a `cache_dir`, results are shared through a SolutionCache in that directory.
+    """
+    result = {'id': puzzle['id'], 'solver': solver_name, 'grid_size': puzzle['grid_size']}
+    words = puzzle['words']
+    cache = None
+    if cache_dir is not None:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            from app.solution_cache import SolutionCache
+            cache = _caches[cache_dir] = SolutionCache(cache_dir)
+    start = time.perf_counter()
+    try:
+        # Some solvers print progress; results are the only thing that goes to the output.
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            grid, placed_words_info, complete = solve(solver_name, words, puzzle['grid_size'], timeout, max_nodes, cache)
+    except Exception as error:
+        result.update(status='error', reason=f"{type(error).__name__}: {error}", time=time.perf_counter() - start)
+        return result
+    result['time'] = time.perf_counter() - start
+
+    placed_words_info = placed_words_info or []
+    unplaced = collections.Counter(words)
+    unplaced.subtract(info['word'] for info in placed_words_info)
+    unplaced_words = sorted(unplaced.elements())
+    if not unplaced_words:
+        result.update(status='solved', reason=None)
+    elif not complete:
+        result.update(status='timeout', reason="budget ran out before every word was placed")
+    else:
+        result.update(status='partial', reason=f"{solver_name} could not place {len(unplaced_words)} word(s)")
+    result.update(
+        words_placed=len(placed_words_info),
+        word_count=len(words),
+        placements=placed_words_info,
+        unplaced_words=unplaced_words,
+        grid=[''.join(char or '.' for char in row) for row in grid] if grid is not None else None,
+    )
+    return result
+
+def run_batch(lines, output, solver_name, grid_size=8, timeout=None, max_nodes=None,
+              max_workers=None, max_in_flight=None, cache_dir=None):
+    """
+    Solves every puzzle read from `lines` across a pool of worker processes and writes
+    one JSON result per line to `output` as each finishes, so results come out in
+    completion order. Input is read only as fast as workers free up: at most
+    `max_in_flight` puzzles (default: twice the worker count) are queued or running,
+    so memory use does not grow with the size of the input. With a `cache_dir`,
+    puzzles solved before, in this run or an earlier one, are answered from the
+    SolutionCache there. Returns a Counter of result statuses.
+    """
+    # Lazy, like the pool imports of FinalArrowwordSolver.solve_parallel.
+    import concurrent.futures
+
+    statuses = collections.Counter()
+
+    def write(result):
+        statuses[result['status']] += 1
+        output.write(json.dumps(result) + '\n')
+        output.flush()
+
+    if max_in_flight is None:
+        max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        pending = set()
+        for line_number, line in enumerate(lines, 1):
+            try:
+                puzzle = parse_puzzle(line, line_number, grid_size)
+            except ValueError as error:
+                write({'id': line_number, 'solver': solver_name, 'status': 'error', 'reason': f"line {line_number}: {error}"})
+                continue
+            if puzzle is None:
+                continue
+            if len(pending) >= max_in_flight:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+            pending.add(executor.submit(solve_puzzle, puzzle, solver_name, timeout, max_nodes, cache_dir))
+        for future in concurrent.futures.as_completed(pending):
+            write(future.result())
+    return statuses
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many arrowword word lists without the GUI.")
+    parser.add_argument('input', help="File with one word list per line (plain or JSON), or - for stdin.")
+    parser.add_argument('-o', '--output', help="JSONL file to write results to (default: stdout).")
+    parser.add_argument('--solver', choices=list(SOLVERS), default='final', help="Solver to use.")
+    parser.add_argument('--grid-size', type=int, default=8, help="Grid size for lines that do not give one.")
+    parser.add_argument('--timeout', type=float, help="Time budget per puzzle in seconds.")
+    parser.add_argument('--max-nodes', type=int, help="Search node budget per puzzle.")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU).")
+    parser.add_argument('--max-in-flight', type=int, help="Puzzles queued or running at once (default: 2 per worker).")
+    parser.add_argument('--cache', metavar='DIR', help="Directory of cached results to reuse and add to.")
+    args = parser.parse_args(argv)
+
+    input_file = sys.stdin if args.input == '-' else open(args.input)
+    output_file = sys.stdout if args.output is None else open(args.output, 'w')
+    try:
+        statuses = run_batch(
+            input_file, output_file, args.solver, args.grid_size, args.timeout, args.max_nodes,
+            args.workers, args.max_in_flight, args.cache,
+        )
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(statuses.items()))
+    print(f"Finished {sum(statuses.values())} puzzles: {summary or 'none'}", file=sys.stderr)
+    return 1 if statuses['error'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+import tracemalloc
+
+from app.bitboard import BitboardGrid
+from app.budget import BudgetExhausted, SearchBudget
+from app.grid_check import check_grid
+from app.slots import slots_by_length
+
+# --- Corpus ---
+# Every case is generated from its seed, so all runs and machines see the same word lists.
+# Arrowword cases are built by laying random words out under the crossword rules, which
+# let a word cover part of another, so a list need not have a solution that uses every
+# word; the axes give the scaling curves. The `solvable` cases do have one (see
+# generate_word_list), and are the ones where a full solution can be expected.
+ARROWWORD_CASES = [
+    # Word count on the standard 8x8 grid.
+    {'name': 'words-4', 'seed': 1, 'grid_size': 8, 'word_count': 4, 'max_length': 7},
+    {'name': 'words-6', 'seed': 1, 'grid_size': 8, 'word_count': 6, 'max_length': 7},
+    {'name': 'words-8', 'seed': 1, 'grid_size': 8, 'word_count': 8, 'max_length': 7},
+    {'name': 'words-10', 'seed': 1, 'grid_size': 8, 'word_count': 10, 'max_length': 7},
+    {'name': 'words-12', 'seed': 1, 'grid_size': 8, 'word_count': 12, 'max_length': 7},
+    # A long list on a larger grid, where the exact searches that may leave words out work hardest.
+    {'name': 'words-20', 'seed': 2, 'grid_size': 10, 'word_count': 20, 'max_length': 10},
+    # Word length, with the word count fixed.
+    {'name': 'length-4', 'seed': 2, 'grid_size': 8, 'word_count': 8, 'max_length': 4},
+    {'name': 'length-6', 'seed': 2, 'grid_size': 8, 'word_count': 8, 'max_length': 6},
+    {'name': 'length-8', 'seed': 2, 'grid_size': 8, 'word_count': 8, 'max_length': 8},
+    # Grid size, with words up to the grid width.
+    {'name': 'grid-6', 'seed': 3, 'grid_size': 6, 'word_count': 8, 'max_length': 6},
+    {'name': 'grid-10', 'seed': 3, 'grid_size': 10, 'word_count': 8, 'max_length': 10},
+    {'name': 'grid-12', 'seed': 3, 'grid_size': 12, 'word_count': 8, 'max_length': 12},
+    # Larger lists that have a full solution.
+    {'name': 'solvable-10', 'seed': 1, 'grid_size': 8, 'word_count': 10, 'max_length': 7, 'solvable': True},
+    {'name': 'solvable-14', 'seed': 3, 'grid_size': 10, 'word_count': 14, 'max_length': 10, 'solvable': True},
+    {'name': 'solvable-20', 'seed': 5, 'grid_size': 12, 'word_count': 20, 'max_length': 10, 'solvable': True},
+    {'name': 'solvable-24', 'seed': 3, 'grid_size': 15, 'word_count': 24, 'max_length': 12, 'solvable': True},
+    # The word list used throughout the solvers' examples.
+    {'name': 'sample', 'grid_size': 8, 'words': [
+        'HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE'
+    ]},
+]
+
+# Word square cases for fill(): the rows and columns of a random square plus `extra` distractors.
+SQUARE_CASES = [
+    {'name': 'square-3', 'seed': 4, 'size': 3, 'extra': 50},
+    {'name': 'square-4', 'seed': 4, 'size': 4, 'extra': 200},
+    {'name': 'square-5', 'seed': 4, 'size': 5, 'extra': 1000},
+]
+
+def generate_word_list(seed, grid_size, word_count, max_length, min_length=3, solvable=False):
+    """
+    Returns up to `word_count` distinct words that fit together on a grid_size grid:
+    random words are laid across slots one at a time, reusing the letters they cross,
+    and kept only when the placement obeys the crossword rules.
+
+    Those rules let a word extend or cover one already placed in the same direction,
+    so the layout built is not always a valid grid. With `solvable`, a word is also
+    kept only if the grid still passes check_grid and it is no longer than the word
+    before it, so the layout is a solution that FinalArrowwordSolver, which places
+    the longest words first, can reach.
+    """
+    rng = random.Random(seed)
+    board = BitboardGrid(grid_size)
+    grid = [['' for _ in range(grid_size)] for _ in range(grid_size)]
+    slots = [
+        slot for length, group in sorted(slots_by_length(grid_size).items())
+        if min_length <= length <= max_length for slot in group
+    ]
+    words = []
+    for _ in range(1000 * word_count):
+        if len(words) == word_count:
+            break
+        slot = rng.choice(slots)
+        word = ''.join(grid[r][c] or rng.choice(string.ascii_uppercase) for r, c in slot.cells)
+        if word in words or not board.is_valid_placement(word, slot.row, slot.col, slot.direction, not words):
+            continue
+        if solvable:
+            if words and len(word) > len(words[-1]):
+                continue
+            trial = [row[:] for row in grid]
+            for char, (r, c) in zip(word, slot.cells):
+                trial[r][c] = char
+            if not check_grid(trial, words + [word]).valid:
+                continue
+        board.place_word(word, slot.row, slot.col, slot.direction)
+        for char, (r, c) in zip(word, slot.cells):
+            grid[r][c] = char
+        words.append(word)
+    return words
+
+def generate_square_words(seed, size, extra):
+    """Returns the rows and columns of a random size x size square, plus `extra` random words."""
+    rng = random.Random(seed)
+    rows = [''.join(rng.choice(string.ascii_uppercase) for _ in range(size)) for _ in range(size)]
+    columns = [''.join(row[c] for row in rows) for c in range(size)]
+    distractors = [''.join(rng.choice(string.ascii_uppercase) for _ in range(size)) for _ in range(extra)]
+    return rows + columns + distractors
+
+def case_words(case):
+    """Returns the word list of a corpus case."""
+    if 'size' in case:
+        return generate_square_words(case['seed'], case['size'], case['extra'])
+    if 'words' in case:
+        return list(case['words'])
+    return generate_word_list(
+        case['seed'], case['grid_size'], case['word_count'], case['max_length'], solvable=case.get('solvable', False)
+    )
+
+# --- Solver runners ---
+# Each runner solves one case within `timeout` seconds where the solver supports a budget,
+# and returns the words placed, the search nodes expanded (None for the greedy solvers,
+# which do not search) and whether the solver finished rather than running out of time.
+
+def _run_final(words, case, timeout, backend='list'):
+    from app.solver_final import FinalArrowwordSolver
+    solver = FinalArrowwordSolver(words, case['grid_size'], backend=backend)
+    _, placed_info, complete = solver.solve_anytime(timeout=timeout)
+    return len(placed_info or []), solver.budget.nodes, complete
+
+def _run_final_bitboard(words, case, timeout):
+    return _run_final(words, case, timeout, backend='bitboard')
+
+def _run_final_v2(words, case, timeout):
+    from app.solver_final_v2 import FinalArrowwordSolverV2
+    _, placed_info = FinalArrowwordSolverV2(words, case['grid_size']).solve()
+    return len(placed_info or []), None, True
+
+def _run_gemini(words, case, timeout):
+    from app.solver_gemini import ArrowwordSolver
+    solver = ArrowwordSolver(words, case['grid_size'])
+    solver.solve()
+    return len(solver.placed_words), None, True
+
+def _run_gemini_cli(words, case, timeout):
+    from app.solver_geminiCLI import ArrowwordSolver
+    solver = ArrowwordSolver(words, case['grid_size'])
+    _, placed_info, complete = solver.solve_anytime(timeout=timeout)
+    return len(placed_info or []), solver.budget.nodes, complete
+
+def _run_graph(words, case, timeout):
+    from app.solver_geminiCLI_2 import GraphArrowwordSolver
+    solver = GraphArrowwordSolver(words, case['grid_size'])
+    _, placed_info = next(solver.iter_solutions(limit=1, timeout=timeout), (None, None))
+    return len(placed_info or []), solver.budget.nodes, not solver.budget.exhausted
+
+def _run_bruteforce(words, case, timeout):
+    from app.solver_bruteforce import BruteForceArrowwordSolver
+    solver = BruteForceArrowwordSolver(words, case['grid_size'])
+    _, placed_info, complete = solver.solve_anytime(timeout=timeout)
+    return len(placed_info or []), solver.budget.nodes, complete
+
+def _run_greedy_gpt(words, case, timeout):
+    from app.solver_gpt import greedy_arrowword
+    grid = greedy_arrowword(words)
+    if grid is None:
+        return 0, None, True
+    return len(_words_in_grid(grid.tolist(), words)), None, True
+
+def _run_fill(words, case, timeout):
+    from app.solver_reddit import fill
+    size = case['size']
+    budget = SearchBudget(timeout)
+    try:
+        found = next(fill(size, sorted(w for w in words if len(w) == size), [], budget), None) is not None
+    except BudgetExhausted:
+        found = False
+    # A square uses its rows and its columns.
+    return 2 * size if found else 0, budget.nodes, not budget.exhausted
+
+def _words_in_grid(grid, words):
+    """Returns the input words that appear as across or down runs of the grid."""
+    lines = [''.join(char or ' ' for char in row) for row in grid]
+    lines += [''.join(row[c] or ' ' for row in grid) for c in range(len(grid[0]))]
+    runs = {run for line in lines for run in line.split() if len(run) > 1}
+    return [word for word in words if word in runs]
+
+# name -> (runner, module it imports, kind of case it solves, grid sizes it supports or None for any)
+SOLVERS = {
+    'final': (_run_final, 'app.solver_final', 'arrowword', None),
+    'final-bitboard': (_run_final_bitboard, 'app.solver_final', 'arrowword', None),
+    'final-v2': (_run_final_v2, 'app.solver_final_v2', 'arrowword', None),
+    'gemini': (_run_gemini, 'app.solver_gemini', 'arrowword', None),
+    'gemini-cli': (_run_gemini_cli, 'app.solver_geminiCLI', 'arrowword', None),
+    'graph': (_run_graph, 'app.solver_geminiCLI_2', 'arrowword', None),
+    'bruteforce': (_run_bruteforce, 'app.solver_bruteforce', 'arrowword', None),
+    'greedy-gpt': (_run_greedy_gpt, 'app.solver_gpt', 'arrowword', (8,)),  # greedy_arrowword always uses an 8x8 grid.
+    'fill': (_run_fill, 'app.solver_reddit', 'square', None),
+}
+
+# --- Running ---
+
+def run_case(solver_name, case, timeout, repeat=5):
+    """
+    Benchmarks one solver on one case. The time is the median of `repeat` runs, so
+    one slow or fast outlier does not move it; peak memory comes from one extra run
+    under tracemalloc, which would slow the timed runs down.
+    """
+    runner = SOLVERS[solver_name][0]
+    words = case_words(case)
+    times = []
+    # The solvers print progress and errors; keep the report readable.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            words_placed, nodes, complete = runner(list(words), case, timeout)
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            runner(list(words), case, timeout)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {
+        'solver': solver_name,
+        'case': case['name'],
+        'grid_size': case.get('grid_size', case.get('size')),
+        'word_count': len(words),
+        'time': statistics.median(times),
+        'nodes': nodes,
+        'peak_memory': peak_memory,
+        'words_placed': words_placed,
+        'complete': complete,
+    }
+
+def run_benchmarks(solver_names=None, case_names=None, timeout=5.0, repeat=5):
+    """Runs every selected solver on every case it supports and returns the result records."""
+    results = []
+    for solver_name, (runner, module, kind, grid_sizes) in SOLVERS.items():
+        if solver_names and solver_name not in solver_names:
+            continue
+        cases = [
+            case for case in (SQUARE_CASES if kind == 'square' else ARROWWORD_CASES)
+            if (not case_names or case['name'] in case_names)
+            and (grid_sizes is None or case['grid_size'] in grid_sizes)
+        ]
+        if not cases:
+            continue
+        # One untimed run first, so the timed ones do not pay for importing the solver
+        # or the modules it only imports when first called, such as numpy.
+        with contextlib.redirect_stdout(io.StringIO()):
+            importlib.import_module(module)
+            runner(case_words(cases[0]), cases[0], timeout)
+        for case in cases:
+            results.append(run_case(solver_name, case, timeout, repeat))
+    return results
+
+def compare(results, baseline, tolerance=0.25, min_time=0.01):
+    """
+    Compares results against baseline results and returns a list of regression messages.
+    A run regresses if it places fewer words, or takes more than `tolerance` longer than
+    the baseline (runs faster than `min_time` seconds are too noisy to compare).
+    """
+    baseline_runs = {(run['solver'], run['case']): run for run in baseline}
+    regressions = []
+    for run in results:
+        old = baseline_runs.get((run['solver'], run['case']))
+        if old is None:
+            continue
+        label = f"{run['solver']} on {run['case']}"
+        if run['words_placed'] < old['words_placed']:
+            regressions.append(f"{label}: placed {run['words_placed']} words, baseline {old['words_placed']}")
+        if max(run['time'], old['time']) >= min_time and run['time'] > old['time'] * (1 + tolerance):
+            regressions.append(f"{label}: {run['time']:.3f}s, baseline {old['time']:.3f}s")
+    return regressions
+
+def print_report(results, baseline=None):
+    """Prints one line per run, with the change in time against the baseline if one is given."""
+    baseline_runs = {(run['solver'], run['case']): run for run in baseline or []}
+    print(f"{'solver':<15}{'case':<13}{'time (s)':>10}{'nodes':>10}{'peak KiB':>10}{'placed':>8}  done  vs baseline")
+    for run in results:
+        old = baseline_runs.get((run['solver'], run['case']))
+        change = f"{run['time'] / old['time']:.2f}x" if old and old['time'] else ''
+        nodes = run['nodes'] if run['nodes'] is not None else '-'
+        print(f"{run['solver']:<15}{run['case']:<13}{run['time']:>10.4f}{nodes:>10}"
+              f"{run['peak_memory'] / 1024:>10.1f}{run['words_placed']:>4}/{run['word_count']:<3}"
+              f"  {'yes' if run['complete'] else 'no':<4}  {change}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the arrowword solvers on a fixed, seeded corpus.")
+    parser.add_argument('--solvers', nargs='+', choices=list(SOLVERS), help="Solvers to run (default: all).")
+    parser.add_argument('--cases', nargs='+', help="Corpus cases to run (default: all).")
+    parser.add_argument('--timeout', type=float, default=5.0, help="Time budget per run in seconds.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case; the median counts.")
+    parser.add_argument('--output', help="Write the results to this JSON file.")
+    parser.add_argument('--baseline', help="Compare against results previously written with --output.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown against the baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.solvers, args.cases, args.timeout, args.repeat)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    print_report(results, baseline)
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timeout': args.timeout,
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
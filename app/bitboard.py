@@ -0,0 +1,149 @@
+class BitboardGrid:
+    """
+    An arrowword grid stored as integer bitmasks instead of a list of lists.
+
+    Cell (r, c) maps to bit r * (grid_size + 1) + c. The extra column on every
+    row is never occupied, so shifting a mask left or right by one cell cannot
+    wrap onto the neighbouring row, and shifting by a whole row moves a mask
+    straight up or down. `occupied` holds every filled cell and `letters` maps
+    each letter to the cells that contain it.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.stride = grid_size + 1
+        self.occupied = 0
+        self.letters = {}
+        self._patterns = {}
+        self._fits = {}
+
+    def _pattern(self, word, direction):
+        """
+        Returns the masks of a word anchored at bit 0: the cells it covers, the
+        bit distance between its letters, the bit offset of the cell just after
+        it, and for every distinct letter the cells holding that letter.
+        """
+        patterns = self._patterns.setdefault(direction, {})
+        pattern = patterns.get(word)
+        if pattern is None:
+            step = 1 if direction == 'H' else self.stride
+            cells = 0
+            letter_masks = {}
+            for i, char in enumerate(word):
+                bit = 1 << (i * step)
+                cells |= bit
+                letter_masks[char] = letter_masks.get(char, 0) | bit
+            pattern = (cells, step, len(word) * step, tuple(letter_masks.items()))
+            patterns[word] = pattern
+        return pattern
+
+    def is_valid_placement(self, word, r, c, direction, is_first_word=False):
+        """
+        Bitmask equivalent of FinalArrowwordSolver._is_valid_placement.
+        """
+        size = self.grid_size
+        if direction == 'H':
+            if c < 0 or c + len(word) > size or r < 0 or r >= size: return False
+            side = self.stride
+        elif direction == 'V':
+            if r < 0 or r + len(word) > size or c < 0 or c >= size: return False
+            side = 1
+        else:
+            return False
+
+        cells, step, span, letter_masks = self._pattern(word, direction)
+        origin = r * self.stride + c
+        # Work relative to the start of the word; cells before it are only needed
+        # for the leading end cap and the neighbours above / to the left.
+        occupied = self.occupied >> origin
+        if origin >= step and self.occupied >> (origin - step) & 1: return False
+        # The cell after the end is on the padding column or past the last row if it is off the grid.
+        if occupied >> span & 1: return False
+
+        # Letter conflicts: every occupied cell under the word must hold the same letter.
+        covered = occupied & cells
+        if covered:
+            letters = self.letters
+            for char, mask in letter_masks:
+                if covered & mask and (covered & mask) != (letters.get(char, 0) >> origin) & mask:
+                    return False
+                covered &= ~mask
+            # covered now holds occupied cells whose letters matched nothing in the word.
+            if covered: return False
+            has_intersection = True
+        else:
+            has_intersection = False
+
+        # Parallel neighbours: empty cells under the word must not touch a letter on either side.
+        empty = cells & ~occupied
+        if (empty << side) & occupied: return False
+        if (empty << origin >> side) & self.occupied: return False
+
+        return is_first_word or has_intersection
+
+    def valid_starts(self, word, direction, is_first_word=False):
+        """
+        Returns the mask of every start cell where a word can go in a direction,
+        checking all of them at once: one round of whole-board shifts per letter
+        instead of one is_valid_placement call per slot.
+        """
+        cells, step, span, _ = self._pattern(word, direction)
+        side = self.stride if direction == 'H' else 1
+        occupied = self.occupied
+        letters = self.letters
+        # Bit s of each mask below describes the placement that starts at cell s.
+        blocked = (occupied << step) | (occupied >> span)  # End caps.
+        touches = 0
+        for i, char in enumerate(word):
+            offset = i * step
+            under = occupied >> offset
+            touches |= under
+            blocked |= under & ~(letters.get(char, 0) >> offset)  # Conflicting letter.
+            # An empty cell under the word must not have a letter on either side.
+            blocked |= ~under & ((occupied >> (offset + side)) | ((occupied << side) >> offset))
+        valid = self._fit_mask(len(word), direction) & ~blocked
+        return valid if is_first_word else valid & touches
+
+    def _fit_mask(self, length, direction):
+        """Returns the mask of the start cells from which a word of a length stays on the grid."""
+        key = (length, direction)
+        mask = self._fits.get(key)
+        if mask is None:
+            size = self.grid_size
+            rows, cols = (size, size - length + 1) if direction == 'H' else (size - length + 1, size)
+            mask = 0
+            for r in range(rows):
+                for c in range(cols):
+                    mask |= 1 << (r * self.stride + c)
+            self._fits[key] = mask
+        return mask
+
+    def place_word(self, word, r, c, direction):
+        """Writes a word onto the grid in place and returns the mask of newly filled cells."""
+        cells, _, _, letter_masks = self._pattern(word, direction)
+        origin = r * self.stride + c
+        written = (cells << origin) & ~self.occupied
+        self.occupied |= written
+        for char, mask in letter_masks:
+            new_cells = (mask << origin) & written
+            if new_cells:
+                self.letters[char] = self.letters.get(char, 0) | new_cells
+        return written
+
+    def remove_cells(self, cells):
+        """Clears the given cells, e.g. the mask returned by place_word when backtracking."""
+        self.occupied &= ~cells
+        for char, mask in self.letters.items():
+            if mask & cells:
+                self.letters[char] = mask & ~cells
+
+    def to_list(self):
+        """Converts the grid to the list-of-lists format used by the other solvers."""
+        grid = [['' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        for char, mask in self.letters.items():
+            while mask:
+                low_bit = mask & -mask
+                r, c = divmod(low_bit.bit_length() - 1, self.stride)
+                grid[r][c] = char
+                mask ^= low_bit
+        return grid
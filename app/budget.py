@@ -0,0 +1,67 @@
+import time
+
+class BudgetExhausted(Exception):
+    """Raised inside a search when its SearchBudget runs out or is cancelled."""
+
+class SearchBudget:
+    """
+    Limits on a search: a wall-clock timeout in seconds, a maximum number of search
+    nodes, and an optional event (threading or multiprocessing) that cancels the
+    search when set. Any of them may be None for no limit. An optional `progress`
+    callable is called with the budget every PROGRESS_INTERVAL nodes, from inside
+    the search. Solvers keep the budget of their most recent search as `self.budget`,
+    so a caller can read its node count once the search returns.
+    """
+
+    # How many nodes pass between checks of the cancel event, which may be shared between processes.
+    CANCEL_CHECK_INTERVAL = 1024
+    # How many nodes pass between calls of the progress callable.
+    PROGRESS_INTERVAL = 128
+
+    def __init__(self, timeout=None, max_nodes=None, cancel_event=None, progress=None):
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.max_nodes = max_nodes
+        self.cancel_event = cancel_event
+        self.progress = progress
+        # A search that reports progress is being watched, so it also checks for cancellation as often.
+        self._cancel_check_interval = self.PROGRESS_INTERVAL if progress is not None else self.CANCEL_CHECK_INTERVAL
+        self.nodes = 0
+        self.exhausted = False
+
+    def tick(self):
+        """
+        Counts one search node and raises BudgetExhausted once a limit is reached.
+        """
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            self.exhausted = True
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            self.exhausted = True
+        elif (self.cancel_event is not None and self.nodes % self._cancel_check_interval == 0
+              and self.cancel_event.is_set()):
+            self.exhausted = True
+        if self.exhausted:
+            raise BudgetExhausted()
+        if self.progress is not None and self.nodes % self.PROGRESS_INTERVAL == 0:
+            self.progress(self)
+
+class BestLayout:
+    """
+    Keeps a copy of the best partial layout seen during a search: the one with the
+    most words placed, then the most intersections.
+    """
+
+    def __init__(self):
+        self.score = (0, 0)
+        self.grid = None
+        self.placed_words_info = None
+
+    def offer(self, state):
+        """Records the layout on a SearchState if it beats the best one so far."""
+        placed = len(state.placed_words_info)
+        if placed < self.score[0]:
+            return
+        score = (placed, state.intersections)
+        if score > self.score:
+            self.score = score
+            self.grid, self.placed_words_info = state.snapshot()
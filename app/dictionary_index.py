@@ -0,0 +1,231 @@
+import argparse
+import mmap
+import string
+import struct
+import sys
+
+ALPHABET = string.ascii_uppercase
+WILDCARDS = '?.'
+
+# File layout, all integers little-endian:
+#   header:  magic, number of word lengths
+#   table:   per word length: length, word count, offset of its words, offset of its bitsets
+#   words:   per length, the sorted words as fixed-width ASCII records, one after another
+#   bitsets: per length, for every (position, letter) a bitset of the ids (indices into
+#            the sorted words) of the words with that letter at that position
+MAGIC = b'ARWDIDX1'
+HEADER = struct.Struct('<8sI')
+TABLE_ENTRY = struct.Struct('<IIQQ')
+
+class DictionaryIndex:
+    """
+    A word list indexed for crossword fill, stored in one compact binary file.
+
+    Words are bucketed by length and sorted; a word's id is its index in its bucket.
+    For every (length, position, letter) the index holds a bitset of the ids of the
+    words with that letter there, so a pattern such as 'H?P??LY' is answered by
+    ANDing one bitset per fixed letter. load() memory-maps the file, so opening even
+    a large dictionary only reads the small table at its start, and words are only
+    turned into Python strings when a query returns them.
+    """
+
+    def __init__(self, data, closer=None):
+        self._data = data
+        self._closer = closer
+        magic, length_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a dictionary index file.")
+        self._buckets = {}  # length -> (word count, words offset, bitsets offset)
+        for i in range(length_count):
+            length, count, words_offset, bitsets_offset = TABLE_ENTRY.unpack_from(data, HEADER.size + i * TABLE_ENTRY.size)
+            self._buckets[length] = (count, words_offset, bitsets_offset)
+
+    @classmethod
+    def from_words(cls, words):
+        """Builds an in-memory index of the given words."""
+        return cls(build_index_bytes(words))
+
+    @classmethod
+    def load(cls, path):
+        """Opens an index file written by save() or build_index_file(), memory-mapping it."""
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, closer=data.close)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self._data)
+
+    def close(self):
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return sum(count for count, _, _ in self._buckets.values())
+
+    def __contains__(self, word):
+        return self.word_id(word) is not None
+
+    def lengths(self):
+        """Returns the word lengths present, shortest first."""
+        return sorted(self._buckets)
+
+    def count(self, length):
+        """Returns the number of words of a given length."""
+        return self._buckets.get(length, (0, 0, 0))[0]
+
+    def word(self, length, word_id):
+        """Returns the word with the given id among the words of that length."""
+        _, words_offset, _ = self._buckets[length]
+        start = words_offset + word_id * length
+        return self._data[start:start + length].decode('ascii')
+
+    def words(self, length):
+        """Returns every word of a given length, in sorted order."""
+        count, words_offset, _ = self._buckets.get(length, (0, 0, 0))
+        block = self._data[words_offset:words_offset + count * length].decode('ascii')
+        return [block[i:i + length] for i in range(0, len(block), length)]
+
+    def word_id(self, word):
+        """Returns the id of a word among the words of its length, or None if it is not in the index."""
+        length = len(word)
+        if length not in self._buckets:
+            return None
+        count, words_offset, _ = self._buckets[length]
+        target = word.upper().encode('ascii', 'replace')
+        data = self._data
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            start = words_offset + middle * length
+            if data[start:start + length] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < count and data[words_offset + low * length:words_offset + (low + 1) * length] == target:
+            return low
+        return None
+
+    def letter_bits(self, length, position, letter):
+        """Returns, as an int, the bitset of ids of the words of `length` with `letter` at `position`."""
+        count, _, bitsets_offset = self._buckets.get(length, (0, 0, 0))
+        letter_index = ALPHABET.find(letter)
+        if not count or letter_index < 0:
+            return 0
+        size = _bitset_size(count)
+        start = bitsets_offset + (position * len(ALPHABET) + letter_index) * size
+        return int.from_bytes(self._data[start:start + size], 'little')
+
+    def all_bits(self, length):
+        """Returns the bitset holding every word of a given length."""
+        return (1 << self.count(length)) - 1
+
+    def match_bits(self, pattern):
+        """
+        Returns the bitset of ids of the words matching a pattern, where '?' or '.'
+        matches any letter, e.g. 'H?P??LY'. The ids are among the words of len(pattern).
+        """
+        length = len(pattern)
+        bits = self.all_bits(length)
+        for position, letter in enumerate(pattern.upper()):
+            if letter not in WILDCARDS:
+                bits &= self.letter_bits(length, position, letter)
+                if not bits:
+                    break
+        return bits
+
+    def words_from_bits(self, length, bits):
+        """Returns the words whose ids are set in a bitset, in sorted order."""
+        if bits == self.all_bits(length):
+            return self.words(length)
+        return [self.word(length, word_id) for word_id in bit_indices(bits)]
+
+    def match(self, pattern):
+        """Returns the words matching a pattern such as 'H?P??LY', in sorted order."""
+        return self.words_from_bits(len(pattern), self.match_bits(pattern))
+
+def bit_indices(bits):
+    """Yields the positions of the set bits of a non-negative int, lowest first."""
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index * 8
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield base + bit
+
+def _bitset_size(count):
+    return (count + 7) // 8
+
+def build_index_bytes(words):
+    """
+    Returns the binary index of a word list. Words are upper-cased; duplicates and
+    words with anything but the letters A-Z are left out.
+    """
+    buckets = {}
+    for word in set(word.strip().upper() for word in words):
+        if word and all(char in ALPHABET for char in word):
+            buckets.setdefault(len(word), []).append(word)
+    lengths = sorted(buckets)
+
+    words_blocks = []
+    bitsets_blocks = []
+    for length in lengths:
+        bucket = sorted(buckets[length])
+        words_blocks.append(''.join(bucket).encode('ascii'))
+        size = _bitset_size(len(bucket))
+        bitsets = bytearray(length * len(ALPHABET) * size)
+        for word_id, word in enumerate(bucket):
+            byte, bit = divmod(word_id, 8)
+            for position, char in enumerate(word):
+                bitsets[(position * len(ALPHABET) + ord(char) - ord('A')) * size + byte] |= 1 << bit
+        bitsets_blocks.append(bytes(bitsets))
+
+    offset = HEADER.size + len(lengths) * TABLE_ENTRY.size
+    table = []
+    words_offsets = []
+    for block in words_blocks:
+        words_offsets.append(offset)
+        offset += len(block)
+    for length, words_offset, block in zip(lengths, words_offsets, bitsets_blocks):
+        table.append(TABLE_ENTRY.pack(length, len(buckets[length]), words_offset, offset))
+        offset += len(block)
+    return b''.join([HEADER.pack(MAGIC, len(lengths))] + table + words_blocks + bitsets_blocks)
+
+def build_index_file(word_path, index_path):
+    """Builds an index from a word file with one word per line and writes it to index_path."""
+    with open(word_path) as f:
+        data = build_index_bytes(f)
+    with open(index_path, 'wb') as f:
+        f.write(data)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query a dictionary index.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Index a word file with one word per line.")
+    build_parser.add_argument('words')
+    build_parser.add_argument('index')
+    match_parser = subparsers.add_parser('match', help="Print the words matching patterns such as H?P??LY.")
+    match_parser.add_argument('index')
+    match_parser.add_argument('patterns', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        build_index_file(args.words, args.index)
+        with DictionaryIndex.load(args.index) as index:
+            print(f"Indexed {len(index)} words of lengths {index.lengths()}.")
+    else:
+        with DictionaryIndex.load(args.index) as index:
+            for pattern in args.patterns:
+                print(f"{pattern}: {' '.join(index.match(pattern))}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
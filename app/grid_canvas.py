@@ -0,0 +1,79 @@
+import tkinter as tk
+
+class GridCanvas:
+    """
+    Draws a grid of any size on a single tk.Canvas: one rectangle and one text item
+    per cell, created once by resize(), and a small arrow at the start of each placed
+    word pointing the way it reads. draw() compares the new frame with the last one
+    and only reconfigures the cells whose letter changed and the arrows that came or
+    went, so redrawing a large grid during a search costs little more than the change.
+    """
+
+    EMPTY_FILL = '#d9d9d9'
+    LETTER_FILL = 'white'
+    ARROW_FILL = '#c03030'
+
+    def __init__(self, master, grid_size=8, max_pixels=600, min_cell_size=16):
+        self.canvas = tk.Canvas(master, highlightthickness=0, background=self.EMPTY_FILL)
+        self.max_pixels = max_pixels
+        self.min_cell_size = min_cell_size
+        self.resize(grid_size)
+
+    def resize(self, grid_size):
+        """Recreates the cell items for a new grid size; the grid starts out empty."""
+        self.grid_size = grid_size
+        self.cell_size = cell = max(self.min_cell_size, self.max_pixels // grid_size)
+        canvas = self.canvas
+        canvas.delete('all')
+        canvas.config(width=grid_size * cell + 1, height=grid_size * cell + 1)
+        font = ('Helvetica', max(8, cell // 2), 'bold')
+        self._rectangles = []  # [row][col] -> item id
+        self._texts = []  # [row][col] -> item id
+        for r in range(grid_size):
+            rectangles, texts = [], []
+            for c in range(grid_size):
+                x, y = c * cell, r * cell
+                rectangles.append(canvas.create_rectangle(x, y, x + cell, y + cell, fill=self.EMPTY_FILL, outline='#808080'))
+                texts.append(canvas.create_text(x + cell / 2, y + cell / 2, text='', font=font))
+            self._rectangles.append(rectangles)
+            self._texts.append(texts)
+        self._letters = [[''] * grid_size for _ in range(grid_size)]
+        self._arrows = {}  # (row, col, direction) -> item id
+
+    def draw(self, grid, placed_words_info=None):
+        """
+        Shows a grid (list of lists of letters, '' or '.' for empty cells; None clears
+        it) and arrows for its placements. Returns the number of cells that changed.
+        """
+        canvas = self.canvas
+        changed = 0
+        for r in range(self.grid_size):
+            row = grid[r] if grid is not None and r < len(grid) else ()
+            letters = self._letters[r]
+            for c in range(self.grid_size):
+                letter = row[c] if c < len(row) else ''
+                if letter == '.':
+                    letter = ''
+                if letter != letters[c]:
+                    letters[c] = letter
+                    canvas.itemconfigure(self._texts[r][c], text=letter)
+                    canvas.itemconfigure(self._rectangles[r][c], fill=self.LETTER_FILL if letter else self.EMPTY_FILL)
+                    changed += 1
+
+        arrows = {(info['row'], info['col'], info['direction']) for info in placed_words_info or ()}
+        for key in self._arrows.keys() - arrows:
+            canvas.delete(self._arrows.pop(key))
+        for key in arrows - self._arrows.keys():
+            self._arrows[key] = canvas.create_polygon(*self._arrow_points(*key), fill=self.ARROW_FILL)
+        return changed
+
+    def _arrow_points(self, r, c, direction):
+        """A small triangle on the leading edge of a word's first cell, pointing along the word."""
+        cell = self.cell_size
+        size = max(3, cell // 5)
+        x, y = c * cell, r * cell
+        if direction == 'H':
+            middle = y + cell / 2
+            return (x + 1, middle - size, x + 1, middle + size, x + 1 + size, middle)
+        middle = x + cell / 2
+        return (middle - size, y + 1, middle + size, y + 1, middle, y + 1 + size)
@@ -1,3 +1,9 @@
+import collections
+
+# The outcome of checking one grid: whether it is valid, the runs of letters that are
+# not in the word list, and the words of the list that do not appear in the grid.
+GridCheck = collections.namedtuple('GridCheck', ['valid', 'invalid_words', 'missing_words'])
+
 def is_valid_grid(grid, word_list):
     """
     Checks if an 8x8 grid is a valid arrowword solution.
@@ -44,6 +50,129 @@ def is_valid_grid(grid, word_list):
 
     return True
 
+def check_grid(grid, word_list):
+    """
+    Checks a grid of any size without printing. Empty cells may be '' or '.'.
+
+    Returns a GridCheck: every run of two or more letters across or down must be in
+    word_list, and every word of word_list must appear.
+    """
+    lines = [''.join(char if char and char != '.' else ' ' for char in row) for row in grid]
+    lines += [''.join(lines[r][c] for r in range(len(lines))) for c in range(len(lines[0]) if lines else 0)]
+    word_set = set(word_list)
+    found_words = set()
+    invalid_words = []
+    for line in lines:
+        for word in line.split():
+            if len(word) < 2:
+                continue
+            if word in word_set:
+                found_words.add(word)
+            else:
+                invalid_words.append(word)
+    missing_words = sorted(word_set - found_words)
+    return GridCheck(not invalid_words and not missing_words, invalid_words, missing_words)
+
+def grids_to_array(grids):
+    """
+    Packs list-of-lists grids of one size into the N x H x W uint8 array taken by
+    validate_grids: each letter as its ASCII code, and 0 for empty ('' or '.') cells.
+    Raises ValueError for a letter outside ASCII, which has no code in the array.
+    """
+    import numpy as np
+
+    codes = np.array(list(grids), dtype='U1').view(np.uint32)  # '' becomes 0
+    if codes.ndim != 3:
+        return np.zeros((len(codes), 0, 0), dtype=np.uint8)
+    if codes.size and codes.max() > 127:
+        raise ValueError("Grids for validate_grids may only hold ASCII letters.")
+    return np.where(codes == ord('.'), 0, codes).astype(np.uint8)
+
+def validate_grids(grids, word_list):
+    """
+    Checks many grids at once, without printing.
+
+    `grids` is an N x H x W uint8 array (see grids_to_array) holding the ASCII code
+    of each letter and 0 for empty cells. Runs of letters along rows and columns are
+    found and looked up in the word list with vectorized NumPy operations, so the
+    cost per grid is a few array operations rather than Python string handling.
+    Returns a list with one GridCheck per grid.
+    """
+    import numpy as np
+
+    grids = np.asarray(grids, dtype=np.uint8)
+    if grids.ndim != 3:
+        raise ValueError("Expected an N x H x W array of grids.")
+    count, height, width = grids.shape
+    size = max(height, width)
+    word_set = set(word_list)
+    if not count:
+        return []
+    if not size:
+        # No cells, so no runs: every word is missing.
+        return [GridCheck(not word_set, [], sorted(word_set)) for _ in range(count)]
+
+    # Rows, then columns (as the rows of the transposed grids), padded to one width.
+    grid_ids, letters = [], []
+    for oriented in (grids, grids.transpose(0, 2, 1)):
+        run_grid_ids, run_letters = _letter_runs(oriented)
+        grid_ids.append(run_grid_ids)
+        letters.append(np.pad(run_letters, ((0, 0), (0, size - run_letters.shape[1]))))
+    grid_ids = np.concatenate(grid_ids)
+    runs = np.ascontiguousarray(np.concatenate(letters)).view(f'S{size}').ravel()
+
+    # Words longer than the grid or with letters outside ASCII can never appear, so they are only ever missing.
+    unmatchable = sorted(word for word in word_set if len(word) > size or not word.isascii())
+    words = np.array(
+        sorted(word.encode('ascii') for word in word_set if len(word) <= size and word.isascii()), dtype=f'S{size}',
+    )
+
+    positions = np.searchsorted(words, runs)
+    in_list = positions < len(words)
+    in_list[in_list] = words[positions[in_list]] == runs[in_list]
+
+    present = np.zeros((count, len(words)), dtype=bool)
+    present[grid_ids[in_list], positions[in_list]] = True
+    invalid_counts = np.bincount(grid_ids[~in_list], minlength=count)
+    valid = (invalid_counts == 0) & present.all(axis=1) & (not unmatchable)
+
+    invalid_by_grid = collections.defaultdict(list)
+    for grid_id, run in zip(grid_ids[~in_list].tolist(), runs[~in_list].tolist()):
+        invalid_by_grid[grid_id].append(run.decode('ascii'))
+    results = []
+    for grid_id in range(count):
+        if valid[grid_id]:
+            results.append(GridCheck(True, [], []))
+            continue
+        missing_words = [word.decode('ascii') for word in words[~present[grid_id]].tolist()] + unmatchable
+        results.append(GridCheck(False, invalid_by_grid[grid_id], sorted(missing_words)))
+    return results
+
+def _letter_runs(grids):
+    """
+    Finds the runs of two or more letters along the last axis of an N x H x W array.
+    Returns the grid index of each run and its letters, zero-padded to width W.
+    """
+    import numpy as np
+
+    count, lines, width = grids.shape
+    filled = np.zeros((count, lines, width + 2), dtype=np.int8)
+    filled[:, :, 1:-1] = grids != 0
+    edges = np.diff(filled, axis=2)
+    grid_ids, line_ids, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[2]
+    lengths = ends - starts
+    keep = lengths > 1
+    grid_ids, line_ids, starts, lengths = grid_ids[keep], line_ids[keep], starts[keep], lengths[keep]
+
+    # Gather each run's letters from the flattened grids; the zero after the last
+    # cell of every line stands in for the cells past the end of a run.
+    padded = np.zeros((count, lines, width + 1), dtype=np.uint8)
+    padded[:, :, :width] = grids
+    offsets = np.minimum(np.arange(width), lengths[:, None])
+    first_cells = ((grid_ids * lines + line_ids) * (width + 1) + starts)[:, None]
+    return grid_ids, padded.reshape(-1)[first_cells + offsets]
+
 if __name__ == '__main__':
     # Example usage with the provided solution
     solution = [
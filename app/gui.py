@@ -1,18 +1,125 @@
 import tkinter as tk
 
+from app.grid_canvas import GridCanvas
+from app.solve_worker import RUNNERS, SolveWorker
+
+# How often, in milliseconds, the GUI checks a running solve for news.
+POLL_INTERVAL_MS = 50
+
 class ArrowwordGUI:
-    def __init__(self, root):
+    """
+    Shows the grid on a GridCanvas, and solves a word list of any grid size without
+    blocking the window:
+    the solver runs on a SolveWorker thread while the Tk loop polls it with
+    root.after, redrawing the partial grid and the node count as the search goes on.
+    Cancel stops the search and shows the best layout it found.
+    """
+
+    def __init__(self, root, grid_size=8):
         self.root = root
         self.root.title("Arrowword")
+        self.grid_size = grid_size
+        self.worker = None
         self.grid_frame = tk.Frame(root)
         self.grid_frame.pack()
         self.create_grid()
+        self.create_controls()
 
     def create_grid(self):
-        for i in range(8):
-            for j in range(8):
-                entry = tk.Entry(self.grid_frame, width=4, justify='center', state='disabled')
-                entry.grid(row=i, column=j)
+        self.grid_canvas = GridCanvas(self.grid_frame, self.grid_size)
+        self.grid_canvas.canvas.pack()
+
+    def create_controls(self):
+        controls = tk.Frame(self.root)
+        controls.pack(fill='x')
+        tk.Label(controls, text="Words:").pack(anchor='w')
+        self.words_text = tk.Text(controls, width=40, height=4)
+        self.words_text.pack(fill='x')
+        buttons = tk.Frame(controls)
+        buttons.pack(fill='x')
+        self.solver_name = tk.StringVar(value='final')
+        tk.OptionMenu(buttons, self.solver_name, *RUNNERS).pack(side='left')
+        tk.Label(buttons, text="Size:").pack(side='left')
+        self.size_input = tk.Spinbox(buttons, from_=3, to=30, width=3)
+        self.size_input.delete(0, 'end')
+        self.size_input.insert(0, str(self.grid_size))
+        self.size_input.pack(side='left')
+        self.solve_button = tk.Button(buttons, text="Solve", command=self.start_solve)
+        self.solve_button.pack(side='left')
+        self.cancel_button = tk.Button(buttons, text="Cancel", command=self.cancel_solve, state='disabled')
+        self.cancel_button.pack(side='left')
+        self.status = tk.StringVar()
+        tk.Label(controls, textvariable=self.status, anchor='w').pack(fill='x')
+
+    def show_grid(self, grid, placed_words_info=None):
+        """Draws a list of lists of letters and the arrows of its placements, or clears the grid for None."""
+        self.grid_canvas.draw(grid, placed_words_info)
+
+    def start_solve(self):
+        words = self.words_text.get('1.0', 'end').replace(',', ' ').upper().split()
+        if not words:
+            self.status.set("Enter some words first.")
+            return
+        try:
+            grid_size = int(self.size_input.get())
+        except ValueError:
+            grid_size = 0
+        if grid_size < 1:
+            self.status.set("The grid size must be a positive number.")
+            return
+        if grid_size != self.grid_size:
+            self.grid_size = grid_size
+            self.grid_canvas.resize(grid_size)
+        self.worker = SolveWorker(self.solver_name.get(), words, self.grid_size)
+        self.worker.start()
+        self.solve_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.status.set("Solving...")
+        self.root.after(POLL_INTERVAL_MS, self.poll_worker)
+
+    def cancel_solve(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.config(state='disabled')
+            self.status.set("Cancelling...")
+
+    def poll_worker(self):
+        """Handles the worker's events since the last poll and schedules the next poll while it runs."""
+        worker = self.worker
+        if worker is None:
+            return
+        events = worker.poll()
+        progress = [event for event in events if event['type'] == 'progress']
+        if progress:
+            # Only the latest partial grid is worth drawing.
+            event = progress[-1]
+            self.show_grid(event['grid'], event['placed_words_info'])
+            self.status.set(f"Searching: {event['nodes']:,} nodes, best so far places {event['best_words']} words.")
+        for event in events:
+            if event['type'] == 'done':
+                self.finish_solve(event)
+                return
+            if event['type'] == 'error':
+                self.status.set(f"Solver failed: {event['message']}")
+                self.finish_solve(None)
+                return
+        self.root.after(POLL_INTERVAL_MS, self.poll_worker)
+
+    def finish_solve(self, event):
+        self.worker = None
+        self.solve_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        if event is None:
+            return
+        self.show_grid(event['grid'], event['placed_words_info'])
+        placed = len(event['placed_words_info'] or [])
+        if event['cancelled']:
+            outcome = "Cancelled"
+        elif event['complete']:
+            outcome = "Done"
+        else:
+            outcome = "Out of time"
+        self.status.set(f"{outcome}: placed {placed} words in {event['nodes']:,} nodes, {event['time']:.2f}s.")
 
     def run(self):
         self.root.mainloop()
@@ -0,0 +1,103 @@
+import collections
+import json
+import time
+
+# Why a placement was rejected, in the order the checks are made.
+OUT_OF_BOUNDS = 'out_of_bounds'
+END_CAP = 'end_cap'
+LETTER_CONFLICT = 'letter_conflict'
+PARALLEL_NEIGHBOUR = 'parallel_neighbour'
+NO_INTERSECTION = 'no_intersection'
+REJECTION_REASONS = (OUT_OF_BOUNDS, END_CAP, LETTER_CONFLICT, PARALLEL_NEIGHBOUR, NO_INTERSECTION)
+
+def rejection_reason(word, slot, grid, is_first_word=False):
+    """
+    Returns why a word cannot go in a slot (see slots.Slot) of a list-of-lists grid,
+    or None if the placement is valid. `slot` is None for a placement off the grid.
+    Agrees with the solvers' _is_valid_placement checks, but names the rule that failed.
+    """
+    if slot is None:
+        return OUT_OF_BOUNDS
+    for end_r, end_c in slot.end_caps:
+        if grid[end_r][end_c] != '':
+            return END_CAP
+    has_intersection = False
+    for char, (cell_r, cell_c), neighbours in zip(word, slot.cells, slot.neighbours):
+        char_on_grid = grid[cell_r][cell_c]
+        if char_on_grid == char:
+            has_intersection = True
+        elif char_on_grid != '':
+            return LETTER_CONFLICT
+        else:
+            for side_r, side_c in neighbours:
+                if grid[side_r][side_c] != '':
+                    return PARALLEL_NEIGHBOUR
+    if not (is_first_word or has_intersection):
+        return NO_INTERSECTION
+    return None
+
+class SearchStats:
+    """
+    Counters and timings collected by a solver given `stats=SearchStats()`.
+
+    Records the search nodes entered at each depth (number of words placed), every
+    placement tried with the reason it was rejected, and the time spent in each phase
+    of the search at each depth. Solvers only call into it when one is given, so a
+    search without stats runs exactly as before. Subclasses can override node() or
+    check_placement() to receive the events as callbacks.
+    """
+
+    def __init__(self):
+        self.nodes_by_depth = collections.Counter()
+        self.placements_tried = 0
+        self.rejections = collections.Counter()
+        self.phase_times = collections.defaultdict(float)  # (depth, phase) -> seconds
+
+    def node(self, depth):
+        """Counts one search node at the given depth."""
+        self.nodes_by_depth[depth] += 1
+
+    def check_placement(self, depth, word, slot, grid, is_first_word=False):
+        """Checks a placement with rejection_reason, recording the outcome; returns True if valid."""
+        start = time.perf_counter()
+        reason = rejection_reason(word, slot, grid, is_first_word)
+        self.placements_tried += 1
+        if reason is not None:
+            self.rejections[reason] += 1
+        self.add_time(depth, 'validate', start)
+        return reason is None
+
+    def add_time(self, depth, phase, start):
+        """Adds the time since `start` (a time.perf_counter() value) to a phase at a depth."""
+        self.phase_times[depth, phase] += time.perf_counter() - start
+
+    @property
+    def nodes(self):
+        return sum(self.nodes_by_depth.values())
+
+    def to_dict(self):
+        """Returns the stats as plain data."""
+        return {
+            'nodes': self.nodes,
+            'nodes_by_depth': {str(depth): count for depth, count in sorted(self.nodes_by_depth.items())},
+            'placements_tried': self.placements_tried,
+            'rejections': {reason: self.rejections[reason] for reason in REJECTION_REASONS},
+            'phase_times': {
+                f'{depth}:{phase}': seconds for (depth, phase), seconds in sorted(self.phase_times.items())
+            },
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_collapsed_stacks(self, root='search'):
+        """
+        Returns the phase times in the collapsed-stack format read by flamegraph tools:
+        one line per phase, `search;depth 0;depth 1;validate 1234`, in microseconds,
+        so the time at each depth nests under the depths above it.
+        """
+        lines = []
+        for (depth, phase), seconds in sorted(self.phase_times.items()):
+            frames = [root] + [f'depth {d}' for d in range(depth + 1)] + [phase]
+            lines.append(f"{';'.join(frames)} {round(seconds * 1e6)}")
+        return '\n'.join(lines)
@@ -0,0 +1,40 @@
+import collections
+
+class LetterIndex:
+    """
+    An index from each letter to the occupied cells that hold it.
+
+    Every entry is a tuple (row, col, direction, word_number, offset): the cell,
+    the direction of the placed word covering it, which placed word that is (in
+    placement order) and the position of the letter within that word. A cell where
+    two words cross has one entry per word. Words must be removed in the reverse
+    order they were added, which is exactly how a backtracking search undoes them.
+    """
+
+    def __init__(self):
+        self.entries = collections.defaultdict(list)
+        self._words = []
+
+    def add_word(self, word, r, c, direction):
+        """Indexes every letter of a newly placed word."""
+        word_number = len(self._words)
+        for i, char in enumerate(word):
+            if direction == 'H':
+                self.entries[char].append((r, c + i, direction, word_number, i))
+            else:
+                self.entries[char].append((r + i, c, direction, word_number, i))
+        self._words.append(word)
+
+    def remove_last_word(self):
+        """Drops the entries of the most recently added word."""
+        word = self._words.pop()
+        for char in word:
+            self.entries[char].pop()
+
+    def lookup(self, letter):
+        """Returns the entries for the cells holding a letter."""
+        return self.entries.get(letter, ())
+
+    def cells(self, letter):
+        """Returns the distinct cells holding a letter in row-major order."""
+        return sorted({(entry[0], entry[1]) for entry in self.entries.get(letter, ())})
@@ -1,7 +1,11 @@
-import tkinter as tk
-from app.gui import ArrowwordGUI
+def main():
+    # Tk is loaded only when the GUI starts, so headless entry points can import this module.
+    import tkinter as tk
+    from app.gui import ArrowwordGUI
 
-if __name__ == "__main__":
     root = tk.Tk()
     app = ArrowwordGUI(root)
     app.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from app.slots import slots_touching
+
+class PlacementDomains:
+    """
+    The valid placements of each unplaced word, kept up to date during a search.
+
+    Each word, under a key chosen by the caller, has a domain: the set of
+    (row, col, direction) placements where it could go next. Searches that place
+    every word after the first across an existing one start on an empty grid where
+    every domain is empty. After a placement, only the cells it filled can change
+    which placements are valid, so place() rechecks the domain entries whose cells,
+    neighbours or end caps include a filled cell, and adds the placements that cross
+    a filled cell with a matching letter, the only ones that can have become valid.
+    The changes are recorded on a trail and undo() reverses them, like SearchState.
+
+    Keys are bucketed by domain size, so most_constrained() finds the word with the
+    fewest placements without looking at every domain.
+    """
+
+    def __init__(self, grid_size, words, is_valid):
+        """
+        `words` is an iterable of (key, word) pairs and `is_valid(word, r, c, direction)`
+        checks a placement against the current grid.
+        """
+        self._touching = slots_touching(grid_size)
+        self._is_valid = is_valid
+        self.words = {}  # key -> word
+        self.domains = {}  # key -> set of (row, col, direction)
+        self._rank = {}  # key -> position in `words`, to break ties the way a scan in order would
+        self._buckets = {}  # domain size -> keys with a domain of that size; only sizes in use
+        self._trail = []
+        for rank, (key, word) in enumerate(words):
+            self.words[key] = word
+            self.domains[key] = set()
+            self._rank[key] = rank
+            self._buckets.setdefault(0, set()).add(key)
+
+    def placements(self, key):
+        """Returns the placements of a word, sorted."""
+        return sorted(self.domains[key])
+
+    def most_constrained(self):
+        """
+        Returns the key of the word with the fewest placements, excluding words with
+        none, or None if every word has none. Ties go to the earliest key given.
+        """
+        sizes = [size for size in self._buckets if size]
+        if not sizes:
+            return None
+        return min(self._buckets[min(sizes)], key=self._rank.__getitem__)
+
+    def any_empty(self):
+        """Checks whether some word has no placement left."""
+        return 0 in self._buckets
+
+    def remove(self, key):
+        """Stops tracking a word once it has been placed or left out; undone by undo()."""
+        domain = self.domains.pop(key)
+        self._discard(key, len(domain))
+        self._trail.append((key, domain, None))
+
+    def place(self, grid, written):
+        """
+        Updates every domain after a placement that filled the `written` cells of `grid`.
+        """
+        changes = []
+        for key, domain in self.domains.items():
+            word = self.words[key]
+            length = len(word)
+            touching = self._touching.get(length, {})
+            removed = set()
+            added = set()
+            for cell in written:
+                for placement in touching.get(cell, ()):
+                    if placement in domain and placement not in removed and not self._is_valid(word, *placement):
+                        removed.add(placement)
+            for r, c in written:
+                char = grid[r][c]
+                for i, word_char in enumerate(word):
+                    if word_char != char:
+                        continue
+                    for placement in ((r, c - i, 'H'), (r - i, c, 'V')):
+                        if placement not in domain and placement not in added and self._is_valid(word, *placement):
+                            added.add(placement)
+            if removed or added:
+                self._resize(key, len(domain), len(domain) - len(removed) + len(added))
+                domain -= removed
+                domain |= added
+                changes.append((key, removed, added))
+        self._trail.append((None, None, changes))
+
+    def undo(self):
+        """Reverses the most recent place() or remove()."""
+        key, domain, changes = self._trail.pop()
+        if changes is None:
+            self.domains[key] = domain
+            self._buckets.setdefault(len(domain), set()).add(key)
+            return
+        for key, removed, added in changes:
+            domain = self.domains[key]
+            self._resize(key, len(domain), len(domain) - len(added) + len(removed))
+            domain -= added
+            domain |= removed
+
+    def _resize(self, key, old_size, new_size):
+        if old_size != new_size:
+            self._discard(key, old_size)
+            self._buckets.setdefault(new_size, set()).add(key)
+
+    def _discard(self, key, size):
+        bucket = self._buckets[size]
+        bucket.discard(key)
+        if not bucket:
+            del self._buckets[size]
@@ -0,0 +1,76 @@
+class RunValidator:
+    """
+    Detects accidental words while a grid is being built, one placement at a time.
+
+    A run is a maximal line of two or more letters across or down. In a finished grid
+    every run must be in the word list. During the search letters are only ever added,
+    so a run can still grow at an end that is an empty cell, but not past the edge of
+    the grid. A run is therefore hopeless, and the branch can be cut, when it is not a
+    word although it reaches both edges, not a prefix of a word although it starts at
+    an edge, not a suffix although it ends at one, or not part of any word at all.
+    After a placement only the runs through the cells it touched can have changed, so
+    only those are checked.
+    """
+
+    def __init__(self, word_list):
+        self.words = set(word_list)
+        self.prefixes = set()
+        self.suffixes = set()
+        self.fragments = set()
+        for word in self.words:
+            for start in range(len(word) - 1):
+                for end in range(start + 2, len(word) + 1):
+                    fragment = word[start:end]
+                    self.fragments.add(fragment)
+                    if start == 0:
+                        self.prefixes.add(fragment)
+                    if end == len(word):
+                        self.suffixes.add(fragment)
+
+    def run_through(self, grid, r, c, direction):
+        """
+        Returns the run through cell (r, c) in a direction ('H' or 'V') as
+        (letters, starts at the grid edge, ends at the grid edge).
+        """
+        dr, dc = (0, 1) if direction == 'H' else (1, 0)
+        while r - dr >= 0 and c - dc >= 0 and grid[r - dr][c - dc] != '':
+            r, c = r - dr, c - dc
+        start_r, start_c = r, c
+        height, width = len(grid), len(grid[0])
+        letters = []
+        while r < height and c < width and grid[r][c] != '':
+            letters.append(grid[r][c])
+            r, c = r + dr, c + dc
+        if direction == 'H':
+            return ''.join(letters), start_c == 0, c == width
+        return ''.join(letters), start_r == 0, r == height
+
+    def run_can_become_word(self, letters, closed_start, closed_end):
+        """Checks whether a run can still be, or grow into, a word of the list."""
+        if closed_start and closed_end:
+            return letters in self.words
+        if closed_start:
+            return letters in self.prefixes
+        if closed_end:
+            return letters in self.suffixes
+        return letters in self.fragments
+
+    def placement_is_possible(self, grid, word, r, c, direction):
+        """
+        Checks a grid right after `word` was placed at (r, c): the run along the word
+        and the crossing run through each of its cells must all be able to become words.
+        """
+        cross = 'V' if direction == 'H' else 'H'
+        dr, dc = (0, 1) if direction == 'H' else (1, 0)
+        cells = [(r, c, direction)] + [(r + dr * i, c + dc * i, cross) for i in range(len(word))]
+        for cell_r, cell_c, run_direction in cells:
+            letters, closed_start, closed_end = self.run_through(grid, cell_r, cell_c, run_direction)
+            if len(letters) > 1 and not self.run_can_become_word(letters, closed_start, closed_end):
+                return False
+        return True
+
+    def grid_is_valid(self, grid):
+        """Checks a finished grid, in which no run can grow any more: every run must be a word."""
+        lines = [''.join(char or ' ' for char in row) for row in grid]
+        lines += [''.join(line[c] for line in lines) for c in range(len(lines[0]) if lines else 0)]
+        return all(run in self.words for line in lines for run in line.split() if len(run) > 1)
@@ -0,0 +1,105 @@
+from app.bitboard import BitboardGrid
+
+class SearchState:
+    """
+    The grid and placement list of a backtracking search, modified in place.
+
+    Instead of copying the grid for every placement, place_word writes only the
+    empty cells a word covers and records them on a trail; undo clears the cells
+    written by the most recent placement. A search node therefore costs
+    O(word length) rather than O(grid_size ** 2).
+    When a ZobristHasher is given, `zobrist` holds the hash of the filled cells.
+    `intersections` counts the cells shared by two placed words.
+
+    With `bitboard`, the grid is a BitboardGrid alone: `grid` is None, placements
+    only update the bitmasks, and the list of lists is built by snapshot() and
+    current_grid() when it is asked for.
+    """
+
+    def __init__(self, grid_size, bitboard=False, hasher=None):
+        self.grid_size = grid_size
+        self.bitboard = BitboardGrid(grid_size) if bitboard else None
+        self.grid = None if bitboard else [['' for _ in range(grid_size)] for _ in range(grid_size)]
+        self.placed_words_info = []
+        self.hasher = hasher
+        self.zobrist = 0
+        self.intersections = 0
+        self._trail = []
+
+    def place_word(self, word, r, c, direction):
+        """Places a word on the grid and records the cells it filled."""
+        if self.bitboard is not None:
+            self._place_on_bitboard(word, r, c, direction)
+            return
+        grid = self.grid
+        written = []
+        if direction == 'H':
+            row = grid[r]
+            for i, char in enumerate(word):
+                if row[c + i] == '':
+                    row[c + i] = char
+                    written.append((r, c + i))
+        elif direction == 'V':
+            for i, char in enumerate(word):
+                if grid[r + i][c] == '':
+                    grid[r + i][c] = char
+                    written.append((r + i, c))
+        if self.hasher is not None:
+            for cell_r, cell_c in written:
+                self.zobrist ^= self.hasher.cell_key(cell_r, cell_c, grid[cell_r][cell_c])
+        self.placed_words_info.append({'word': word, 'row': r, 'col': c, 'direction': direction})
+        self.intersections += len(word) - len(written)
+        self._trail.append(written)
+
+    def _place_on_bitboard(self, word, r, c, direction):
+        written = self.bitboard.place_word(word, r, c, direction)
+        if self.hasher is not None:
+            for cell_r, cell_c, char in self._written_letters(word, r, c, direction, written):
+                self.zobrist ^= self.hasher.cell_key(cell_r, cell_c, char)
+        self.placed_words_info.append({'word': word, 'row': r, 'col': c, 'direction': direction})
+        self.intersections += len(word) - bin(written).count('1')
+        self._trail.append(written)
+
+    def _written_letters(self, word, r, c, direction, written):
+        """Yields (row, col, letter) for the cells of a placement set in a bitboard `written` mask."""
+        dr, dc = (0, 1) if direction == 'H' else (1, 0)
+        stride = self.bitboard.stride
+        for i, char in enumerate(word):
+            cell_r, cell_c = r + dr * i, c + dc * i
+            if written >> (cell_r * stride + cell_c) & 1:
+                yield cell_r, cell_c, char
+
+    def undo(self):
+        """Removes the most recently placed word."""
+        written = self._trail.pop()
+        info = self.placed_words_info.pop()
+        word = info['word']
+        if self.bitboard is not None:
+            if self.hasher is not None:
+                for r, c, char in self._written_letters(word, info['row'], info['col'], info['direction'], written):
+                    self.zobrist ^= self.hasher.cell_key(r, c, char)
+            self.intersections -= len(word) - bin(written).count('1')
+            self.bitboard.remove_cells(written)
+            return
+        self.intersections -= len(word) - len(written)
+        grid = self.grid
+        for r, c in written:
+            if self.hasher is not None:
+                self.zobrist ^= self.hasher.cell_key(r, c, grid[r][c])
+            grid[r][c] = ''
+
+    def last_written(self):
+        """
+        Returns the cells filled by the most recent placement, i.e. those not already
+        holding its letters: a list of (row, col), or a bitmask with a bitboard.
+        """
+        return self._trail[-1]
+
+    def current_grid(self):
+        """Returns the grid as a list of lists: the live one, or with a bitboard a new one built from it."""
+        return self.grid if self.bitboard is None else self.bitboard.to_list()
+
+    def snapshot(self):
+        """Returns copies of the grid and placement list that later moves will not change."""
+        grid = [row[:] for row in self.grid] if self.bitboard is None else self.bitboard.to_list()
+        return grid, [dict(info) for info in self.placed_words_info]
@@ -0,0 +1,76 @@
+import collections
+import functools
+
+Slot = collections.namedtuple('Slot', ['row', 'col', 'direction', 'cells', 'end_caps', 'neighbours'])
+Slot.__doc__ = """
+A run of cells a word of a given length can occupy, starting at (row, col).
+
+cells: the (row, col) of each letter, in reading order.
+end_caps: the cells just before and after the run that lie on the grid.
+neighbours: for each cell, the on-grid cells beside it across the run direction.
+"""
+
+@functools.lru_cache(maxsize=None)
+def slots_by_length(grid_size):
+    """
+    Lists every slot on a square grid that stays on the grid, grouped by length.
+
+    Within a length the slots are ordered by row, then column, then 'H' before 'V',
+    the order the backtracking solvers try placements in. The result is computed
+    once per grid_size and shared by every solver in the process.
+    """
+    table = {}
+    for length in range(1, grid_size + 1):
+        slots = []
+        for r in range(grid_size):
+            for c in range(grid_size):
+                if c + length <= grid_size:
+                    cells = tuple((r, c + i) for i in range(length))
+                    end_caps = tuple((r, cc) for cc in (c - 1, c + length) if 0 <= cc < grid_size)
+                    neighbours = tuple(
+                        tuple((rr, cc) for rr in (r - 1, r + 1) if 0 <= rr < grid_size)
+                        for _, cc in cells
+                    )
+                    slots.append(Slot(r, c, 'H', cells, end_caps, neighbours))
+                if r + length <= grid_size:
+                    cells = tuple((r + i, c) for i in range(length))
+                    end_caps = tuple((rr, c) for rr in (r - 1, r + length) if 0 <= rr < grid_size)
+                    neighbours = tuple(
+                        tuple((rr, cc) for cc in (c - 1, c + 1) if 0 <= cc < grid_size)
+                        for rr, _ in cells
+                    )
+                    slots.append(Slot(r, c, 'V', cells, end_caps, neighbours))
+        table[length] = tuple(slots)
+    return table
+
+@functools.lru_cache(maxsize=None)
+def slot_table(grid_size):
+    """
+    Indexes the slots of slots_by_length by (row, col, direction, length).
+
+    Placements that would leave the grid have no entry.
+    """
+    return {
+        (slot.row, slot.col, slot.direction, length): slot
+        for length, slots in slots_by_length(grid_size).items()
+        for slot in slots
+    }
+
+@functools.lru_cache(maxsize=None)
+def slots_touching(grid_size):
+    """
+    Indexes the slots of slots_by_length by the cells whose contents can change
+    whether a word fits them: their cells, the neighbours of those cells and their
+    end caps. Maps length -> (row, col) -> tuple of (row, col, direction) starts.
+    """
+    table = {}
+    for length, slots in slots_by_length(grid_size).items():
+        touching = collections.defaultdict(list)
+        for slot in slots:
+            cells = set(slot.cells) | set(slot.end_caps)
+            for neighbours in slot.neighbours:
+                cells.update(neighbours)
+            for cell in cells:
+                touching[cell].append((slot.row, slot.col, slot.direction))
+        table[length] = {cell: tuple(starts) for cell, starts in touching.items()}
+    return table
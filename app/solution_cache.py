@@ -0,0 +1,234 @@
+import collections
+import hashlib
+import json
+import os
+import tempfile
+
+from app.grid_check import check_grid
+
+# Bumped whenever the stored entry format changes, so old entries are simply missed.
+CACHE_VERSION = 1
+
+def cache_key(solver_name, words, grid_size, options=None):
+    """
+    Returns the cache key of a solve: a hash of the sorted word list (repeats kept,
+    since they change the puzzle), the grid size, the solver and its options, so the
+    same puzzle given in any word order maps to the same entry.
+    """
+    canonical = json.dumps(
+        [CACHE_VERSION, solver_name, grid_size, sorted(words), sorted((options or {}).items())],
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def verify_entry(entry, words, grid_size):
+    """
+    Checks that a cached entry is a well-formed result for this word list: the grid has
+    the right size, every letter belongs to a placement and every placement's letters
+    are on the grid, the placed words come from the list, and grid_check still agrees
+    with whether the grid was valid when it was stored.
+    """
+    grid, placed_words_info = entry['grid'], entry['placed_words_info']
+    if grid is None:
+        return placed_words_info is None
+    if len(grid) != grid_size or any(len(row) != grid_size for row in grid):
+        return False
+    unused = collections.Counter(words)
+    covered = set()
+    for info in placed_words_info:
+        word, r, c, direction = info['word'], info['row'], info['col'], info['direction']
+        if unused[word] <= 0 or direction not in ('H', 'V'):
+            return False
+        unused[word] -= 1
+        dr, dc = (0, 1) if direction == 'H' else (1, 0)
+        for i, char in enumerate(word):
+            cell_r, cell_c = r + dr * i, c + dc * i
+            if not (0 <= cell_r < grid_size and 0 <= cell_c < grid_size) or grid[cell_r][cell_c] != char:
+                return False
+            covered.add((cell_r, cell_c))
+    if any(grid[r][c] != '' and (r, c) not in covered for r in range(grid_size) for c in range(grid_size)):
+        return False
+    return check_grid(grid, [info['word'] for info in placed_words_info]).valid == entry['valid']
+
+class SolutionCache:
+    """
+    Remembers solver results so that a word list solved before is answered without
+    searching again.
+
+    Entries live in an in-memory LRU of up to `max_entries` results and, when a
+    `directory` is given, in one JSON file per key there, shared between processes
+    and runs. The directory is kept under `max_bytes` by deleting the least recently
+    used files (by modification time, which reads refresh). The cache keeps a running
+    total of the bytes it has written and deleted, and only lists the directory when
+    that total passes `max_bytes`: it then counts the files other processes wrote too,
+    and deletes down to EVICTION_TARGET of `max_bytes`, so the next eviction is some
+    writes away rather than on every one. Every entry read back is
+    checked with verify_entry, and one that fails is dropped and treated as a miss.
+
+    Only results of searches that finished are stored: a search cut short by its
+    budget may do better next time.
+    """
+
+    # The fraction of max_bytes an eviction brings the directory down to.
+    EVICTION_TARGET = 0.9
+
+    def __init__(self, directory=None, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = collections.OrderedDict()  # key -> entry, least recently used first
+        self._bytes = None  # Size of the entry files as of the last directory listing, plus changes since; None before one.
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, solver_name, words, grid_size, options=None):
+        """
+        Returns the cached (grid, placed_words_info, complete) of a solve, or None.
+        The returned grid and placements are copies the caller may change.
+        """
+        key = cache_key(solver_name, words, grid_size, options)
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            entry = self._read(key)
+            if entry is None or not verify_entry(entry, words, grid_size):
+                if entry is not None:
+                    self._delete(key)
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+        self.hits += 1
+        return _copy_result(entry)
+
+    def put(self, solver_name, words, grid_size, result, options=None):
+        """Stores the (grid, placed_words_info, complete) result of a solve, if it is complete."""
+        grid, placed_words_info, complete = result
+        if not complete:
+            return
+        grid = [list(row) for row in grid] if grid is not None else None
+        placed_words_info = [dict(info) for info in placed_words_info] if grid is not None else None
+        entry = {
+            'grid': grid,
+            'placed_words_info': placed_words_info,
+            'valid': grid is not None and check_grid(grid, [info['word'] for info in placed_words_info]).valid,
+        }
+        key = cache_key(solver_name, words, grid_size, options)
+        self._remember(key, entry)
+        if self.directory is not None:
+            self._write(key, entry)
+
+    def get_or_solve(self, solver_name, words, grid_size, solve, options=None):
+        """
+        Returns the cached result of a solve, or calls solve() for the
+        (grid, placed_words_info, complete) result and caches it.
+        """
+        result = self.get(solver_name, words, grid_size, options)
+        if result is None:
+            result = solve()
+            self.put(solver_name, words, grid_size, result, options)
+        return result
+
+    def clear(self):
+        """Drops every entry, in memory and on disk."""
+        self._memory.clear()
+        for name in self._entry_files():
+            self._delete(name[:-len('.json')])
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _entry_files(self):
+        if self.directory is None:
+            return []
+        return [name for name in os.listdir(self.directory) if name.endswith('.json')]
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path) # Mark as recently used for eviction.
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not {'grid', 'placed_words_info', 'valid'} <= entry.keys():
+            return None
+        return entry
+
+    def _write(self, key, entry):
+        # Write to a temporary file and rename it, so other processes never read half an entry.
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            size = os.path.getsize(temp_path)
+            replaced = self._file_size(key)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        if self._bytes is not None:
+            self._bytes += size - replaced
+        if self._bytes is None or self._bytes > self.max_bytes:
+            self._evict()
+
+    def _delete(self, key):
+        self._memory.pop(key, None)
+        size = self._file_size(key)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            return
+        if self._bytes is not None:
+            self._bytes -= size
+
+    def _file_size(self, key):
+        """Returns the size of an entry's file, or 0 if there is none."""
+        try:
+            return os.path.getsize(self._path(key))
+        except OSError:
+            return 0
+
+    def _evict(self):
+        """
+        Lists the directory and, if it is over max_bytes, deletes the least recently
+        used entry files until it fits in EVICTION_TARGET of max_bytes.
+        """
+        files = []
+        total = 0
+        for name in self._entry_files():
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue # Deleted by another process.
+            files.append((stat.st_mtime, name, stat.st_size))
+            total += stat.st_size
+        files.sort()
+        if total > self.max_bytes:
+            for _, name, size in files:
+                if total <= self.max_bytes * self.EVICTION_TARGET:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+                total -= size
+        self._bytes = total
+
+def _copy_result(entry):
+    if entry['grid'] is None:
+        return None, None, True
+    return [row[:] for row in entry['grid']], [dict(info) for info in entry['placed_words_info']], True
@@ -0,0 +1,105 @@
+import queue
+import threading
+import time
+
+# The solvers that can report progress and be cancelled, by the names used in solvers.py.
+# Each is called with (words, grid_size, timeout, cancel_event, progress) and returns
+# (grid, placed_words_info, complete) like FinalArrowwordSolver.solve_anytime, plus
+# the number of search nodes visited.
+
+def _run_final(words, grid_size, timeout, cancel_event, progress):
+    from app.solver_final import FinalArrowwordSolver
+    solver = FinalArrowwordSolver(words, grid_size)
+    return (*solver.solve_anytime(timeout, None, cancel_event, progress), solver.budget.nodes)
+
+def _run_gemini_cli(words, grid_size, timeout, cancel_event, progress):
+    from app.solver_geminiCLI import ArrowwordSolver
+    solver = ArrowwordSolver(words, grid_size)
+    return (*solver.solve_anytime(timeout, None, cancel_event, progress), solver.budget.nodes)
+
+RUNNERS = {
+    'final': _run_final,
+    'gemini-cli': _run_gemini_cli,
+}
+
+class SolveWorker:
+    """
+    Runs a solver on a background thread and reports on it through a queue, so that
+    a GUI can keep handling events while it searches and poll for news instead.
+
+    poll() returns the events posted since the last call, as dicts with a 'type':
+    'progress' while searching (at most every `progress_interval` seconds) with the
+    partial 'grid' being searched and its 'placed_words_info', the 'nodes' visited so far, and the best layout
+    so far as 'best_grid' and 'best_words' (the number of words it places); then
+    one 'done' with the result's 'grid', 'placed_words_info' and 'complete', whether
+    it was 'cancelled', 'nodes' and 'time', or one 'error' with a 'message'.
+    cancel() stops the search at its next cancel check; a 'done' event still follows,
+    with the best layout found.
+    """
+
+    def __init__(self, solver_name, words, grid_size=8, timeout=None, progress_interval=0.1):
+        if solver_name not in RUNNERS:
+            raise ValueError(f"Solver '{solver_name}' cannot run in the background, expected one of {tuple(RUNNERS)}.")
+        self.solver_name = solver_name
+        self.words = list(words)
+        self.grid_size = grid_size
+        self.timeout = timeout
+        self.progress_interval = progress_interval
+        self._events = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._last_progress = 0.0
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_running(self):
+        return self._thread.is_alive()
+
+    def poll(self):
+        """Returns the events posted since the last call, oldest first, without waiting."""
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _progress(self, state, best, nodes):
+        # Called inside the search, on the worker thread, so the state is not changing under us.
+        now = time.monotonic()
+        if now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        grid, placed_words_info = state.snapshot()
+        self._events.put({
+            'type': 'progress',
+            'grid': grid,
+            'placed_words_info': placed_words_info,
+            'nodes': nodes,
+            'best_grid': best.grid,  # BestLayout replaces its grid rather than changing it.
+            'best_words': best.score[0],
+        })
+
+    def _run(self):
+        start = time.monotonic()
+        self._last_progress = start
+        try:
+            grid, placed_words_info, complete, nodes = RUNNERS[self.solver_name](
+                self.words, self.grid_size, self.timeout, self._cancel_event, self._progress,
+            )
+        except Exception as error:
+            self._events.put({'type': 'error', 'message': f"{type(error).__name__}: {error}"})
+            return
+        self._events.put({
+            'type': 'done',
+            'grid': grid,
+            'placed_words_info': placed_words_info,
+            'complete': complete,
+            'cancelled': self._cancel_event.is_set(),
+            'nodes': nodes,
+            'time': time.monotonic() - start,
+        })
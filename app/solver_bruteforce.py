@@ -1,54 +1,266 @@
 import itertools
-from grid_check import is_valid_grid
+from app.budget import BestLayout, BudgetExhausted, SearchBudget
+from app.grid_check import check_grid
+from app.run_validator import RunValidator
+from app.search_state import SearchState
+from app.symmetry import canonical_form, first_word_directions
 
 class BruteForceArrowwordSolver:
     """
     A brute-force solver that tries all permutations of words.
+    With `symmetry_breaking`, the first word of each permutation is only tried across,
+    skipping layouts that are transposes of ones already covered, and solutions are
+    reported in canonical form.
+    With `validate_runs`, a placement that leaves a run of letters which can no longer
+    become a word is cut immediately (see RunValidator) instead of at the leaves.
     """
 
-    def __init__(self, words, grid_size=8):
+    def __init__(self, words, grid_size=8, symmetry_breaking=False, validate_runs=False):
         self.words = words
         self.grid_size = grid_size
-        self.iterations = 0
+        self.symmetry_breaking = symmetry_breaking
+        self._run_validator = RunValidator(words) if validate_runs else None
+        self.iterations = 0 # Permutations, or placements in solve_prefix_tree, tried by the most recent search.
+        self._layouts = {} # word order -> (its layouts so far, the generator of the rest), during solve_prefix_tree
+        self._best_layout = None
+        self.budget = None # See SearchBudget.
 
     def solve(self):
         """
         Attempts to solve the arrowword puzzle by trying all permutations of words.
         """
+        self.iterations = 0
         for word_permutation in itertools.permutations(self.words):
             if self.iterations >= 10000:
                 print("Brute-force solver reached 10,000 iterations without finding a solution.")
                 break
             self.iterations += 1
-            grid = [['' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-            placed_info = []
-            solution = self._solve_recursive(list(word_permutation), grid, placed_info)
-            if solution:
-                final_grid, final_placed_info = solution
-                if is_valid_grid(final_grid, self.words):
+            state = SearchState(self.grid_size)
+            if self._solve_recursive(word_permutation, state, 0):
+                final_grid, final_placed_info = state.snapshot()
+                if check_grid(final_grid, self.words).valid:
+                    if self.symmetry_breaking:
+                        return canonical_form(final_grid, final_placed_info)
                     return final_grid, final_placed_info
         return None, None
 
-    def _solve_recursive(self, words_to_place, grid, placed_words_info):
+    def solve_prefix_tree(self, timeout=None, max_nodes=None):
+        """
+        Runs the search of solve() over a tree of word orders.
+
+        solve() starts a fresh search for each permutation, so permutations that begin
+        with the same words place them again and again. Here the layouts of each word
+        order are built from those of the order without its last word, in the order
+        solve()'s search reaches them, and kept, so orders that share a prefix share
+        its placements. Like solve(), only the first full layout of each order is
+        checked, and the same grid is returned. The 10,000-iteration cap counts every
+        placement, and the search also stops after `timeout` seconds or `max_nodes`
+        placements.
+
+        Returns (grid, placed_words_info, complete), with (None, None) as the grid and
+        placements when no valid grid was found. `complete` is False when the cap or
+        the budget ran out first.
+        """
+        budget = self.budget = SearchBudget(timeout, max_nodes)
+        self.iterations = 0
+        self._layouts = {(): ([()], iter(()))}
+        try:
+            for order in self._orders(list(self.words), ()):
+                state = self._first_full_layout(order, budget)
+                if state is None:
+                    continue
+                final_grid, final_placed_info = state.snapshot()
+                if check_grid(final_grid, self.words).valid:
+                    if self.symmetry_breaking:
+                        final_grid, final_placed_info = canonical_form(final_grid, final_placed_info)
+                    return final_grid, final_placed_info, True
+        except BudgetExhausted:
+            return None, None, False
+        finally:
+            self._layouts = {}
+        return None, None, True
+
+    def solve_anytime(self, timeout=None, max_nodes=None):
+        """
+        Runs the search of solve() within a budget of `timeout` seconds and/or
+        `max_nodes` search nodes, and always returns an answer.
+
+        Returns (grid, placed_words_info, complete). If a valid grid is found it is
+        the one solve() would return. Otherwise it is the best partial layout seen
+        in any permutation (most words placed, then most intersections), or
+        (None, None) if no word fit. `complete` is False when the budget or the
+        10,000-permutation cap ran out before every permutation was tried.
+        """
+        budget = self.budget = SearchBudget(timeout, max_nodes)
+        self.iterations = 0
+        best = self._best_layout = BestLayout()
+        complete = True
+        try:
+            for word_permutation in itertools.permutations(self.words):
+                if self.iterations >= 10000:
+                    complete = False
+                    break
+                self.iterations += 1
+                state = SearchState(self.grid_size)
+                for _ in self._iter_recursive(word_permutation, state, 0, budget):
+                    final_grid, final_placed_info = state.snapshot()
+                    if check_grid(final_grid, self.words).valid:
+                        if self.symmetry_breaking:
+                            final_grid, final_placed_info = canonical_form(final_grid, final_placed_info)
+                        return final_grid, final_placed_info, True
+                    break # Like solve(), only the first layout of each permutation is checked.
+        except BudgetExhausted:
+            complete = False
+        finally:
+            self._best_layout = None
+        if best.grid is None:
+            return None, None, complete
+        if self.symmetry_breaking:
+            return (*canonical_form(best.grid, best.placed_words_info), complete)
+        return best.grid, best.placed_words_info, complete
+
+    def iter_solutions(self, limit=None, timeout=None, max_nodes=None):
+        """
+        Yields distinct valid grids one at a time. Unlike solve(), every placement
+        sequence of each permutation is searched, not just the first one. Stops after
+        `limit` solutions, `timeout` seconds, `max_nodes` search nodes or the
+        10,000-permutation cap.
+        """
+        budget = self.budget = SearchBudget(timeout, max_nodes)
+        self.iterations = 0
+        seen = set()
+        try:
+            for word_permutation in itertools.permutations(self.words):
+                if self.iterations >= 10000:
+                    return
+                self.iterations += 1
+                state = SearchState(self.grid_size)
+                for _ in self._iter_recursive(word_permutation, state, 0, budget):
+                    final_grid, final_placed_info = state.snapshot()
+                    if self.symmetry_breaking:
+                        final_grid, final_placed_info = canonical_form(final_grid, final_placed_info)
+                    grid_key = tuple(map(tuple, final_grid))
+                    # Different permutations often build the same layout.
+                    if grid_key in seen or not check_grid(final_grid, self.words).valid:
+                        continue
+                    seen.add(grid_key)
+                    yield final_grid, final_placed_info
+                    if limit is not None and len(seen) >= limit:
+                        return
+        except BudgetExhausted:
+            return
+
+    def _solve_recursive(self, words_to_place, state, index):
+        """
+        Places words_to_place[index:] on the shared search state and returns True once all are placed.
+        """
+        for _ in self._iter_recursive(words_to_place, state, index, SearchBudget()):
+            return True
+        return False
+
+    def _iter_recursive(self, words_to_place, state, index, budget):
         """
         The main recursive function that tries to place words.
+        Places words_to_place[index:] on the shared search state and yields each time all
+        are placed, leaving the solution on the state until it is resumed.
         """
-        if not words_to_place:
-            return grid, placed_words_info
+        if index == len(words_to_place):
+            if self._run_validator is None or self._run_validator.grid_is_valid(state.grid):
+                yield
+            return
 
-        word_to_place = words_to_place[0]
-        remaining_words = words_to_place[1:]
+        budget.tick()
+        if self._best_layout is not None:
+            # Full layouts are only kept if they pass check_grid, so partial ones are offered here.
+            self._best_layout.offer(state)
+        word_to_place = words_to_place[index]
+        grid = state.grid
+        validator = self._run_validator
+        directions = first_word_directions(self.symmetry_breaking) if index == 0 else ('H', 'V')
 
         for r in range(self.grid_size):
             for c in range(self.grid_size):
-                for direction in ['H', 'V']:
+                for direction in directions:
                     if self._is_valid_placement(word_to_place, r, c, direction, grid):
-                        new_grid = self._place_word(grid, word_to_place, r, c, direction)
-                        new_placed_info = placed_words_info + [{'word': word_to_place, 'row': r, 'col': c, 'direction': direction}]
-                        solution = self._solve_recursive(remaining_words, new_grid, new_placed_info)
-                        if solution:
-                            return solution
-        return None
+                        state.place_word(word_to_place, r, c, direction)
+                        if validator is None or validator.placement_is_possible(grid, word_to_place, r, c, direction):
+                            yield from self._iter_recursive(words_to_place, state, index + 1, budget)
+                        state.undo()
+
+    def _orders(self, remaining_words, order):
+        """Yields every order of the words, like itertools.permutations, but each repeated order once."""
+        if not remaining_words:
+            yield order
+            return
+        tried = set()
+        for i, word in enumerate(remaining_words):
+            if word not in tried:
+                tried.add(word)
+                yield from self._orders(remaining_words[:i] + remaining_words[i + 1:], order + (word,))
+
+    def _first_full_layout(self, order, budget):
+        """
+        Returns a SearchState holding the first layout of every word in `order` that
+        solve()'s search would accept, or None if there is none.
+        """
+        for n in itertools.count():
+            layout = self._layout(order, n, budget)
+            if layout is None:
+                return None
+            state = self._replay(layout)
+            if self._run_validator is None or self._run_validator.grid_is_valid(state.grid):
+                return state
+
+    def _layout(self, order, n, budget):
+        """
+        Returns the n-th layout of the words in `order` as a tuple of (word, row, col,
+        direction) placements, or None if there are fewer. Layouts are computed on
+        first use and kept in self._layouts for every order that shares the prefix.
+        """
+        if order not in self._layouts:
+            self._layouts[order] = ([], self._extend_layouts(order, budget))
+        layouts, source = self._layouts[order]
+        while len(layouts) <= n:
+            layout = next(source, None)
+            if layout is None:
+                return None
+            layouts.append(layout)
+        return layouts[n]
+
+    def _extend_layouts(self, order, budget):
+        """
+        Yields the layouts of the words in `order`: each layout of the order without
+        its last word, extended by every valid placement of that word, as the
+        recursive search of solve() would try them.
+        """
+        parent, word = order[:-1], order[-1]
+        validator = self._run_validator
+        directions = first_word_directions(self.symmetry_breaking) if not parent else ('H', 'V')
+        for n in itertools.count():
+            layout = self._layout(parent, n, budget)
+            if layout is None:
+                return
+            state = self._replay(layout)
+            grid = state.grid
+            for r in range(self.grid_size):
+                for c in range(self.grid_size):
+                    for direction in directions:
+                        if self._is_valid_placement(word, r, c, direction, grid):
+                            if self.iterations >= 10000:
+                                raise BudgetExhausted()
+                            self.iterations += 1
+                            budget.tick()
+                            state.place_word(word, r, c, direction)
+                            if validator is None or validator.placement_is_possible(grid, word, r, c, direction):
+                                yield layout + ((word, r, c, direction),)
+                            state.undo()
+
+    def _replay(self, layout):
+        """Returns a new SearchState with the placements of a layout made."""
+        state = SearchState(self.grid_size)
+        for word, r, c, direction in layout:
+            state.place_word(word, r, c, direction)
+        return state
 
     def _is_valid_placement(self, word, r, c, direction, grid):
         """Checks if a word can be placed at a given position and direction."""
@@ -62,17 +274,6 @@ class BruteForceArrowwordSolver:
                 if grid[r + i][c] not in ('', word[i]): return False
         return True
 
-    def _place_word(self, grid, word, r, c, direction):
-        """Places a word on a copy of the grid and returns the new grid."""
-        new_grid = [row[:] for row in grid]
-        if direction == 'H':
-            for i in range(len(word)):
-                new_grid[r][c + i] = word[i]
-        elif direction == 'V':
-            for i in range(len(word)):
-                new_grid[r + i][c] = word[i]
-        return new_grid
-
 def print_grid(grid):
     """Utility function to print the grid nicely."""
     if not grid:
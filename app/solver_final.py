@@ -1,99 +1,318 @@
 import collections
+import time
+
+from app.budget import BestLayout, BudgetExhausted, SearchBudget
+from app.search_state import SearchState
+from app.slots import slot_table, slots_by_length
+from app.symmetry import canonical_form, first_word_directions
+from app.transposition import TranspositionTable, ZobristHasher
 
 class FinalArrowwordSolver:
     """
     A robust backtracking solver for arrowword puzzles.
+
+    The grid engine is selected with `backend`: 'list' keeps the grid as a list of
+    lists of letters, 'bitboard' keeps it as integer bitmasks only (see BitboardGrid)
+    and finds every valid placement of a word with a few whole-board shifts instead
+    of checking each slot in turn. Both return the same solution.
+
+    With `symmetry_breaking`, the first word is only tried across: every layout
+    with it placed down is the transpose of one with it placed across, so the
+    mirror half of the search tree is skipped. Solutions are then reported in
+    canonical form (see symmetry.canonical_form).
+
+    A positive `transposition_table_size` enables a transposition table: states
+    (grid contents plus remaining words, hashed with Zobrist keys) that were
+    searched without success are remembered, up to that many, and not searched
+    again when another placement order reaches them.
+
+    Passing a SearchStats as `stats` records nodes per depth, placements tried,
+    rejections by reason and time per phase (see instrumentation.SearchStats).
     """
 
-    def __init__(self, words, grid_size=8):
+    BACKENDS = ('list', 'bitboard')
+
+    def __init__(self, words, grid_size=8, backend='list', symmetry_breaking=False, transposition_table_size=None, stats=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}.")
         self.words = sorted(words, key=len, reverse=True)
         self.grid_size = grid_size
+        self.backend = backend
+        self.symmetry_breaking = symmetry_breaking
+        self.transposition_table_size = transposition_table_size
+        self.stats = stats
+        self._transpositions = None
+        self._remaining_hashes = None
+        self._best_layout = None
+        self.budget = None # See SearchBudget.
+        self._slots = slot_table(grid_size)
+        self._slots_by_length = slots_by_length(grid_size)
 
     def solve(self):
         """
         Attempts to solve the arrowword puzzle using backtracking.
         """
-        initial_grid = [['' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-        return self._solve_recursive(self.words, initial_grid, [])
+        return next(self.iter_solutions(limit=1), (None, None))
 
-    def _solve_recursive(self, words_to_place, grid, placed_words_info):
+    def iter_solutions(self, limit=None, timeout=None, max_nodes=None):
         """
-        The main recursive function that tries to place words.
+        Yields solutions, as (grid, placed_words_info) tuples, one at a time.
+
+        The search is a generator that pauses at each solution and resumes from the
+        same point when the next one is requested, so it never restarts from the
+        root. It stops after `limit` solutions, after `timeout` seconds or after
+        `max_nodes` search nodes, whichever comes first. With a transposition table,
+        states already searched to the end are skipped, so each layout is produced
+        only once even when the word list has repeated words.
+        """
+        budget = self.budget = SearchBudget(timeout, max_nodes)
+        state = self._new_state()
+        found = 0
+        try:
+            for _ in self._iter_recursive(state, 0, budget):
+                yield self._report(*state.snapshot())
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+        except BudgetExhausted:
+            return
+
+    def solve_anytime(self, timeout=None, max_nodes=None, cancel_event=None, progress=None):
+        """
+        Searches for a solution within a budget of `timeout` seconds and/or
+        `max_nodes` search nodes, and always returns an answer. Setting `cancel_event`
+        stops the search early. `progress`, if given, is called as
+        progress(state, best, nodes) every SearchBudget.PROGRESS_INTERVAL nodes with
+        the live SearchState and the BestLayout so far; it runs inside the search and
+        must not change the state.
+
+        Returns (grid, placed_words_info, complete). If every word could be placed
+        this is the solution solve() would find. Otherwise it is the best partial
+        layout seen (most words placed, then most intersections), or (None, None)
+        if not even one word fit. `complete` is False when the budget ran out
+        before the search finished.
+        """
+        best = self._best_layout = BestLayout()
+        state = self._new_state()
+        on_progress = None
+        if progress is not None:
+            on_progress = lambda budget: progress(state, best, budget.nodes)
+        budget = self.budget = SearchBudget(timeout, max_nodes, cancel_event, on_progress)
+        try:
+            for _ in self._iter_recursive(state, 0, budget):
+                return (*self._report(*state.snapshot()), True)
+        except BudgetExhausted:
+            pass
+        finally:
+            self._best_layout = None
+        if best.grid is None:
+            return None, None, not budget.exhausted
+        return (*self._report(best.grid, best.placed_words_info), not budget.exhausted)
+
+    def solve_parallel(self, max_workers=None, split_depth=2):
         """
-        if not words_to_place:
-            return grid, placed_words_info
-
-        word_to_place = words_to_place[0]
-        remaining_words = words_to_place[1:]
-        is_first_word = not placed_words_info
-
-        # Iterate through all possible placements
-        for r in range(self.grid_size):
-            for c in range(self.grid_size):
-                for direction in ['H', 'V']:
-                    if self._is_valid_placement(word_to_place, r, c, direction, grid, is_first_word):
-                        new_grid = self._place_word(grid, word_to_place, r, c, direction)
-                        new_placed_info = placed_words_info + [{'word': word_to_place, 'row': r, 'col': c, 'direction': direction}]
-                        
-                        solution_grid, solution_info = self._solve_recursive(remaining_words, new_grid, new_placed_info)
-                        if solution_grid:
-                            return solution_grid, solution_info
-        
+        Solves the puzzle across a pool of worker processes.
+
+        The search tree is split at the first `split_depth` words (1 or 2): every
+        valid placement of those words becomes one task that searches the rest of
+        the tree. The first task to find a solution stops all the others. Any
+        solution found is valid, but it need not be the one solve() returns.
+        """
+        split_depth = min(split_depth, len(self.words) - 1)
+        if split_depth < 1:
+            return self.solve()
+
+        prefixes = []
+        self._collect_prefixes(self._new_state(), split_depth, [], prefixes)
+        if not prefixes:
+            return None, None
+
+        # Imported here, so searches that never run a pool start without loading multiprocessing.
+        import concurrent.futures
+        import multiprocessing
+
+        stop_event = multiprocessing.Event()
+        with concurrent.futures.ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(stop_event,)) as executor:
+            futures = [
+                executor.submit(
+                    _solve_subtree, self.words, self.grid_size, self.backend, self.transposition_table_size, prefix
+                )
+                for prefix in prefixes
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                solution_grid, solution_info = future.result()
+                if solution_grid:
+                    stop_event.set()
+                    for pending in futures:
+                        pending.cancel()
+                    return self._report(solution_grid, solution_info)
         return None, None
 
-    def _is_valid_placement(self, word, r, c, direction, grid, is_first_word=False):
-        """Checks if a word can be placed at a given position and direction with strict crossword rules."""
-        has_intersection = False
-        # print(f'Checking {word} at ({r}, {c}) {direction}') # Debug
-        
-        if direction == 'H':
-            if c < 0 or c + len(word) > self.grid_size: return False
-            # Check word boundaries (must have empty cells or grid edge)
-            if c > 0 and grid[r][c - 1] != '': return False
-            if c + len(word) < self.grid_size and grid[r][c + len(word)] != '': return False
-
-            for i in range(len(word)):
-                char_on_grid = grid[r][c + i]
-                if char_on_grid == word[i]:
-                    has_intersection = True
-                elif char_on_grid != '':
-                    # print(f'  Conflict at ({r}, {c+i}): grid has {char_on_grid}, word has {word[i]}') # Debug
-                    return False # Conflict with existing letter
-                else: # Empty cell, check adjacent cells
-                    if r > 0 and grid[r - 1][c + i] != '': return False
-                    if r < self.grid_size - 1 and grid[r + 1][c + i] != '': return False
-        
-        elif direction == 'V':
-            if r < 0 or r + len(word) > self.grid_size: return False
-            # Check word boundaries
-            if r > 0 and grid[r - 1][c] != '': return False
-            if r + len(word) < self.grid_size and grid[r + len(word)][c] != '': return False
-
-            for i in range(len(word)):
-                char_on_grid = grid[r + i][c]
-                if char_on_grid == word[i]:
-                    has_intersection = True
-                elif char_on_grid != '':
-                    # print(f'  Conflict at ({r+i}, {c}): grid has {char_on_grid}, word has {word[i]}') # Debug
-                    return False # Conflict
-                else: # Empty cell, check adjacent cells
-                    if c > 0 and grid[r + i][c - 1] != '': return False
-                    if c < self.grid_size - 1 and grid[r + i][c + 1] != '': return False
+    def _new_state(self):
+        """Creates an empty search state, with a fresh transposition table if one is enabled."""
+        if not self.transposition_table_size:
+            return SearchState(self.grid_size, bitboard=self.backend == 'bitboard')
+        hasher = ZobristHasher()
+        self._transpositions = TranspositionTable(self.transposition_table_size)
+        # The words still to place at depth i are always self.words[i:].
+        self._remaining_hashes = [hasher.words_hash(self.words[i:]) for i in range(len(self.words) + 1)]
+        return SearchState(self.grid_size, bitboard=self.backend == 'bitboard', hasher=hasher)
+
+    def _report(self, grid, placed_words_info):
+        """Puts a found solution into canonical form when symmetry breaking is on."""
+        if self.symmetry_breaking:
+            return canonical_form(grid, placed_words_info)
+        return grid, placed_words_info
+
+    def _candidate_slots(self, index):
+        """Returns the on-grid slots to try for self.words[index], in search order."""
+        slots = self._slots_by_length.get(len(self.words[index]), ())
+        if index == 0 and self.symmetry_breaking:
+            directions = first_word_directions(self.symmetry_breaking)
+            slots = tuple(slot for slot in slots if slot.direction in directions)
+        return slots
+
+    def _collect_prefixes(self, state, depth, prefix, prefixes):
+        """Appends every valid sequence of placements for the first `depth` words to prefixes."""
+        index = len(prefix)
+        if index == depth:
+            prefixes.append(list(prefix))
+            return
+
+        word_to_place = self.words[index]
+        for r, c, direction in self._valid_placements(state, index):
+            state.place_word(word_to_place, r, c, direction)
+            prefix.append((r, c, direction))
+            self._collect_prefixes(state, depth, prefix, prefixes)
+            prefix.pop()
+            state.undo()
+
+    def _valid_placements(self, state, index):
+        """Returns the valid (row, col, direction) placements of self.words[index] on the state, in search order."""
+        word = self.words[index]
+        is_first_word = not state.placed_words_info
+        board = state.bitboard
+        if board is None:
+            grid = state.grid
+            return [
+                (slot.row, slot.col, slot.direction) for slot in self._candidate_slots(index)
+                if self._is_valid_placement(word, slot.row, slot.col, slot.direction, grid, is_first_word, slot)
+            ]
+        across = board.valid_starts(word, 'H', is_first_word)
+        down = 0
+        if index or 'V' in first_word_directions(self.symmetry_breaking):
+            down = board.valid_starts(word, 'V', is_first_word)
+        # Start bits ascend in row-major order, the order of _candidate_slots.
+        placements = []
+        starts = across | down
+        while starts:
+            low_bit = starts & -starts
+            r, c = divmod(low_bit.bit_length() - 1, board.stride)
+            if across & low_bit:
+                placements.append((r, c, 'H'))
+            if down & low_bit:
+                placements.append((r, c, 'V'))
+            starts ^= low_bit
+        return placements
+
+    def _solve_from_prefix(self, prefix, budget):
+        """Places the given first placements, then searches for the remaining words."""
+        state = self._new_state()
+        for word, (r, c, direction) in zip(self.words, prefix):
+            state.place_word(word, r, c, direction)
+        try:
+            for _ in self._iter_recursive(state, len(prefix), budget):
+                return state.snapshot()
+        except BudgetExhausted:
+            pass
+        return None, None
+
+    def _iter_recursive(self, state, index, budget):
+        """
+        The main recursive function that tries to place words.
+        Places self.words[index:] on the shared search state, undoing each placement
+        when backtracking. It is a generator that yields each time every word is
+        placed, leaving the solution on the state until it is resumed.
+        """
+        if index == len(self.words):
+            yield
+            return
+
+        budget.tick()
+        stats = self.stats
+        if stats is not None:
+            stats.node(index)
+        if self._best_layout is not None:
+            self._best_layout.offer(state)
+
+        transpositions = self._transpositions
+        if transpositions is not None:
+            state_key = state.zobrist ^ self._remaining_hashes[index]
+            if transpositions.is_refuted(state_key):
+                return
+
+        word_to_place = self.words[index]
+
+        if stats is None:
+            for r, c, direction in self._valid_placements(state, index):
+                state.place_word(word_to_place, r, c, direction)
+                yield from self._iter_recursive(state, index + 1, budget)
+                state.undo()
         else:
-            return False
+            # Check every slot one by one, so each rejection is counted with its reason.
+            is_first_word = not state.placed_words_info
+            grid = state.current_grid()
+            for slot in self._candidate_slots(index):
+                if not stats.check_placement(index, word_to_place, slot, grid, is_first_word):
+                    continue
+                start = time.perf_counter()
+                state.place_word(word_to_place, slot.row, slot.col, slot.direction)
+                stats.add_time(index, 'place', start)
+                yield from self._iter_recursive(state, index + 1, budget)
+                state.undo()
+
+        if transpositions is not None:
+            # Every solution below this state has been produced, so treat it as done.
+            transpositions.add_refuted(state_key)
+
+    def _is_valid_placement(self, word, r, c, direction, grid, is_first_word=False, slot=None):
+        """
+        Checks if a word can be placed at a given position and direction with strict crossword rules.
+        Callers that already hold the precomputed slot for the placement can pass it to skip the lookup.
+        """
+        has_intersection = False
+        if slot is None:
+            slot = self._slots.get((r, c, direction, len(word)))
+            if slot is None: return False  # Off the grid, or not a valid direction.
+
+        # Check word boundaries (must have empty cells or grid edge)
+        for end_r, end_c in slot.end_caps:
+            if grid[end_r][end_c] != '': return False
+
+        for char, (cell_r, cell_c), neighbours in zip(word, slot.cells, slot.neighbours):
+            char_on_grid = grid[cell_r][cell_c]
+            if char_on_grid == char:
+                has_intersection = True
+            elif char_on_grid != '':
+                return False # Conflict with existing letter
+            else: # Empty cell, check adjacent cells
+                for side_r, side_c in neighbours:
+                    if grid[side_r][side_c] != '': return False
 
         return is_first_word or has_intersection
 
-    def _place_word(self, grid, word, r, c, direction):
-        """Places a word on a copy of the grid and returns the new grid."""
-        new_grid = [row[:] for row in grid]
-        if direction == 'H':
-            for i in range(len(word)):
-                new_grid[r][c + i] = word[i]
-        elif direction == 'V':
-            for i in range(len(word)):
-                new_grid[r + i][c] = word[i]
-        return new_grid
+# --- Parallel search workers ---
+# The stop event is handed to each worker process once, when the pool starts it.
+_worker_stop_event = None
+
+def _init_worker(stop_event):
+    global _worker_stop_event
+    _worker_stop_event = stop_event
+
+def _solve_subtree(words, grid_size, backend, transposition_table_size, prefix):
+    """Runs in a worker process: searches the subtree below one prefix of placements."""
+    solver = FinalArrowwordSolver(words, grid_size, backend, transposition_table_size=transposition_table_size)
+    return solver._solve_from_prefix(prefix, SearchBudget(cancel_event=_worker_stop_event))
 
 def print_grid(grid):
     """Utility function to print the grid nicely."""
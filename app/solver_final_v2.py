@@ -1,3 +1,9 @@
+import os
+import random
+
+from app.letter_index import LetterIndex
+from app.slots import slot_table
+
 class FinalArrowwordSolverV2:
     """
     A greedy solver for arrowword puzzles based on the user's instructions.
@@ -10,15 +16,29 @@ class FinalArrowwordSolverV2:
     6. Use the first valid placement found and move to the next word.
     7. Words that cannot be placed are skipped and recorded.
     This is a greedy, non-backtracking approach.
+
+    Given a `seed`, the solver makes a randomized variant of these choices instead:
+    words of equal length are taken in a shuffled order, the longest word goes across
+    or down at a random position, and the placements of each word are tried in a
+    shuffled order. solve_restarts() runs many such variants and keeps the best.
     """
 
-    def __init__(self, words, grid_size=15):
+    def __init__(self, words, grid_size=15, seed=None):
+        self.seed = seed
+        self._random = random.Random(seed) if seed is not None else None
         # 1. Sort all the words by length, descending.
-        self.words = sorted(words, key=len, reverse=True)
+        if self._random is None:
+            self.words = sorted(words, key=len, reverse=True)
+        else:
+            self.words = list(words)
+            self._random.shuffle(self.words)
+            self.words.sort(key=len, reverse=True) # Stable, so equal lengths stay shuffled.
         self.grid_size = grid_size
         self.grid = [['' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
         self.placed_words_info = []
         self.unplaced_words = []
+        self.letter_index = LetterIndex()
+        self._slots = slot_table(grid_size)
 
     def solve(self):
         """
@@ -28,14 +48,11 @@ class FinalArrowwordSolverV2:
             return None, None
 
         # 2. Take the first word and place it on the board.
-        # We place it horizontally near the center for a good starting point.
         first_word = self.words[0]
-        r = self.grid_size // 2
-        c = (self.grid_size - len(first_word)) // 2
-        if c < 0: c = 0  # Handle words longer than the grid is wide.
+        r, c, direction = self._first_placement(first_word)
         
-        self._place_word_on_grid(first_word, r, c, 'H')
-        self.placed_words_info.append({'word': first_word, 'row': r, 'col': c, 'direction': 'H'})
+        self._place_word_on_grid(first_word, r, c, direction)
+        self.placed_words_info.append({'word': first_word, 'row': r, 'col': c, 'direction': direction})
 
         words_to_place = self.words[1:]
 
@@ -46,6 +63,54 @@ class FinalArrowwordSolverV2:
 
         return self.grid, self.placed_words_info
 
+    def solve_restarts(self, restarts=32, max_workers=None, seed=0, executor=None):
+        """
+        Runs the deterministic solve() and `restarts` randomized variants, with seeds
+        seed, seed + 1, ..., across a pool of `max_workers` processes (default: one
+        per CPU; 1 runs them here), and keeps the best: the most words placed, then
+        the smallest bounding box around the letters, then the earliest variant.
+        Starting a pool costs far more than a greedy pass, so a caller solving many
+        puzzles should pass its own long-lived `executor` (e.g. a ProcessPoolExecutor),
+        which is used instead and left running; `max_workers` then only sizes the chunks.
+        The solver is left holding the best variant's grid, placements, unplaced
+        words and seed (None for the deterministic one), and its grid and placements
+        are returned like solve().
+        """
+        seeds = [None] + [seed + i for i in range(restarts)]
+        if max_workers == 1 and executor is None:
+            results = [_solve_variant(self.words, self.grid_size, variant_seed) for variant_seed in seeds]
+        else:
+            # A few chunks per worker: one task per variant would cost more in messages than in solving.
+            chunksize = max(1, len(seeds) // (4 * (max_workers or os.cpu_count() or 1)))
+            args = ([self.words] * len(seeds), [self.grid_size] * len(seeds), seeds)
+            if executor is not None:
+                results = list(executor.map(_solve_variant, *args, chunksize=chunksize))
+            else:
+                # Lazy, like the pool imports of FinalArrowwordSolver.solve_parallel.
+                import concurrent.futures
+
+                with concurrent.futures.ProcessPoolExecutor(max_workers) as pool:
+                    results = list(pool.map(_solve_variant, *args, chunksize=chunksize))
+
+        best = max(zip(seeds, results), key=lambda item: (len(item[1][1] or ()), -bounding_box_area(item[1][0])))
+        self.seed, (self.grid, self.placed_words_info, self.unplaced_words) = best
+        return self.grid, self.placed_words_info
+
+    def _first_placement(self, word):
+        """
+        Chooses where the longest word goes: across, near the center, for a good
+        starting point; for a randomized variant, across or down anywhere it fits.
+        """
+        if self._random is None:
+            r = self.grid_size // 2
+            c = (self.grid_size - len(word)) // 2
+            if c < 0: c = 0  # Handle words longer than the grid is wide.
+            return r, c, 'H'
+        direction = self._random.choice('HV')
+        along = self._random.randint(0, max(0, self.grid_size - len(word)))
+        across = self._random.randrange(self.grid_size)
+        return (across, along, 'H') if direction == 'H' else (along, across, 'V')
+
     def _try_to_place_word(self, word):
         """
         Finds the first valid placement for a word and places it. If no placement is found,
@@ -53,6 +118,8 @@ class FinalArrowwordSolverV2:
         """
         # 4. Search through all the words that are already on the board for possible intersections.
         possible_placements = self._find_possible_placements(word)
+        if self._random is not None:
+            self._random.shuffle(possible_placements)
 
         for placement in possible_placements:
             # 5. If there is a possible location, check if it interferes with other words.
@@ -69,64 +136,45 @@ class FinalArrowwordSolverV2:
         """
         Generates a list of potential placements by finding all common letters
         between the word to place and the words already on the grid.
+        Common letters are looked up in the letter index, and the placements are
+        ordered by placed word, then letter of the new word, then letter of the
+        placed word.
         """
-        placements = []
-        for placed_info in self.placed_words_info:
-            placed_word = placed_info['word']
-            for i, char_to_place in enumerate(word_to_place):
-                for j, placed_char in enumerate(placed_word):
-                    if char_to_place == placed_char:
-                        # Found a common letter, which is a potential intersection.
-                        if placed_info['direction'] == 'H':
-                            # The existing word is horizontal, so the new word must be vertical.
-                            r = placed_info['row'] - i
-                            c = placed_info['col'] + j
-                            placements.append({'word': word_to_place, 'row': r, 'col': c, 'direction': 'V'})
-                        else:  # The existing word is vertical.
-                            # The new word must be horizontal.
-                            r = placed_info['row'] + j
-                            c = placed_info['col'] - i
-                            placements.append({'word': word_to_place, 'row': r, 'col': c, 'direction': 'H'})
-        return placements
+        candidates = []
+        for i, char_to_place in enumerate(word_to_place):
+            for r, c, direction, word_number, j in self.letter_index.lookup(char_to_place):
+                # Found a common letter, which is a potential intersection.
+                if direction == 'H':
+                    # The existing word is horizontal, so the new word must be vertical.
+                    placement = {'word': word_to_place, 'row': r - i, 'col': c, 'direction': 'V'}
+                else:  # The existing word is vertical.
+                    # The new word must be horizontal.
+                    placement = {'word': word_to_place, 'row': r, 'col': c - i, 'direction': 'H'}
+                candidates.append((word_number, i, j, placement))
+        candidates.sort(key=lambda candidate: candidate[:3])
+        return [candidate[3] for candidate in candidates]
 
     def _is_valid_placement(self, word, r, c, direction, grid):
         """
         Checks if a word can be placed at a given position and direction
         with strict crossword rules (no conflicts, no parallel neighbors).
         """
-        if direction == 'H':
-            if c < 0 or c + len(word) > self.grid_size: return False
-            # Check word boundaries (must have empty cells or grid edge).
-            if c > 0 and grid[r][c - 1] != '': return False
-            if c + len(word) < self.grid_size and grid[r][c + len(word)] != '': return False
-
-            for i in range(len(word)):
-                char_on_grid = grid[r][c + i]
-                if char_on_grid == word[i]:
-                    continue  # This is the intersection point, which is allowed.
-                elif char_on_grid != '':
-                    return False  # Conflict with an existing letter.
-                else:  # This is an empty cell, check for parallel words.
-                    if r > 0 and grid[r - 1][c + i] != '': return False
-                    if r < self.grid_size - 1 and grid[r + 1][c + i] != '': return False
-        
-        elif direction == 'V':
-            if r < 0 or r + len(word) > self.grid_size: return False
-            # Check word boundaries.
-            if r > 0 and grid[r - 1][c] != '': return False
-            if r + len(word) < self.grid_size and grid[r + len(word)][c] != '': return False
-
-            for i in range(len(word)):
-                char_on_grid = grid[r + i][c]
-                if char_on_grid == word[i]:
-                    continue  # Intersection point is allowed.
-                elif char_on_grid != '':
-                    return False  # Conflict.
-                else:  # Empty cell, check for parallel words.
-                    if c > 0 and grid[r + i][c - 1] != '': return False
-                    if c < self.grid_size - 1 and grid[r + i][c + 1] != '': return False
-        else:
-            return False
+        slot = self._slots.get((r, c, direction, len(word)))
+        if slot is None: return False  # Off the grid, or not a valid direction.
+
+        # Check word boundaries (must have empty cells or grid edge).
+        for end_r, end_c in slot.end_caps:
+            if grid[end_r][end_c] != '': return False
+
+        for char, (cell_r, cell_c), neighbours in zip(word, slot.cells, slot.neighbours):
+            char_on_grid = grid[cell_r][cell_c]
+            if char_on_grid == char:
+                continue  # This is the intersection point, which is allowed.
+            elif char_on_grid != '':
+                return False  # Conflict with an existing letter.
+            else:  # This is an empty cell, check for parallel words.
+                for side_r, side_c in neighbours:
+                    if grid[side_r][side_c] != '': return False
 
         return True
 
@@ -138,6 +186,23 @@ class FinalArrowwordSolverV2:
         elif direction == 'V':
             for i in range(len(word)):
                 self.grid[r + i][c] = word[i]
+        self.letter_index.add_word(word, r, c, direction)
+
+def _solve_variant(words, grid_size, seed):
+    """Runs in a worker process: solves one variant and returns (grid, placed_words_info, unplaced_words)."""
+    solver = FinalArrowwordSolverV2(words, grid_size, seed)
+    grid, placed_words_info = solver.solve()
+    return grid, placed_words_info, solver.unplaced_words
+
+def bounding_box_area(grid):
+    """Returns the area of the smallest rectangle holding every letter of a grid, or 0 if it has none."""
+    if not grid:
+        return 0
+    rows = [r for r, row in enumerate(grid) if any(row)]
+    cols = [c for c in range(len(grid[0])) if any(row[c] for row in grid)]
+    if not rows:
+        return 0
+    return (rows[-1] - rows[0] + 1) * (cols[-1] - cols[0] + 1)
 
 def print_grid(grid):
     """Utility function to print the grid nicely."""
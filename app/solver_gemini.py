@@ -1,5 +1,7 @@
 import collections
 
+from app.letter_index import LetterIndex
+
 class ArrowwordSolver:
     """
     A greedy algorithm to fill an arrowword grid with a given set of words.
@@ -11,6 +13,7 @@ class ArrowwordSolver:
         self.grid = [['' for _ in range(grid_size)] for _ in range(grid_size)]
         self.placed_words = []
         self.unplaced_words = collections.deque(self.words)
+        self.letter_index = LetterIndex()
 
     def solve(self):
         """
@@ -25,26 +28,23 @@ class ArrowwordSolver:
             word_to_place = self.unplaced_words.popleft()
             
             found_placement = False
-            # Find the first valid intersection point for the current word
-            for r in range(self.grid_size):
-                for c in range(self.grid_size):
-                    if self.grid[r][c] != '':
-                        # Try to find an intersection with the letter at (r,c)
-                        for i, char in enumerate(word_to_place):
-                            if char == self.grid[r][c]:
-                                # Try placing horizontally
-                                if self._is_valid_placement(word_to_place, r, c - i, 'H'):
-                                    self._place_word(word_to_place, r, c - i, 'H')
-                                    found_placement = True
-                                    break
-                                # Try placing vertically
-                                if self._is_valid_placement(word_to_place, r - i, c, 'V'):
-                                    self._place_word(word_to_place, r - i, c, 'V')
-                                    found_placement = True
-                                    break
-                        if found_placement:
-                            break
-                if found_placement:
+            # Find the first valid intersection point for the current word, visiting
+            # the occupied cells that share one of its letters in row-major order
+            intersections = sorted(
+                (r, c, i)
+                for i, char in enumerate(word_to_place)
+                for r, c in self.letter_index.cells(char)
+            )
+            for r, c, i in intersections:
+                # Try placing horizontally
+                if self._is_valid_placement(word_to_place, r, c - i, 'H'):
+                    self._place_word(word_to_place, r, c - i, 'H')
+                    found_placement = True
+                    break
+                # Try placing vertically
+                if self._is_valid_placement(word_to_place, r - i, c, 'V'):
+                    self._place_word(word_to_place, r - i, c, 'V')
+                    found_placement = True
                     break
             
             if not found_placement:
@@ -127,6 +127,7 @@ class ArrowwordSolver:
         elif direction == 'V':
             for i in range(len(word)):
                 self.grid[r + i][c] = word[i]
+        self.letter_index.add_word(word, r, c, direction)
         
         self.placed_words.append({
             'word': word,
@@ -1,147 +1,373 @@
 import collections
 import itertools
+import time
+
+from app.budget import BestLayout, BudgetExhausted, SearchBudget
+from app.placement_domains import PlacementDomains
+from app.search_state import SearchState
+from app.slots import slot_table, slots_by_length
+from app.transposition import TranspositionTable, ZobristHasher
 
 class ArrowwordSolver:
     """
     A backtracking algorithm to fill an arrowword grid with a given set of words.
     This version finds the best possible solution, even if it means omitting some words.
+    A positive `transposition_table_size` makes solve_by_combinations remember up to
+    that many refuted states (grid contents plus remaining words) so that they are not
+    searched again, whether reached by another placement order or from another subset.
+    Passing a SearchStats as `stats` records nodes per depth, placements tried,
+    rejections by reason and time per phase (see instrumentation.SearchStats).
+    Both searches keep the valid placements of every unplaced word in PlacementDomains,
+    updated around each placement, instead of recomputing them at every node.
     """
 
-    def __init__(self, words, grid_size=8):
+    def __init__(self, words, grid_size=8, transposition_table_size=None, stats=None):
         self.words = sorted(words, key=len, reverse=True) # Sort for better heuristic
         self.grid_size = grid_size
+        self.transposition_table_size = transposition_table_size
+        self.stats = stats
+        self._transpositions = None
+        self._slots = slot_table(grid_size)
+        self._slots_by_length = slots_by_length(grid_size)
+        self._best = BestLayout()
+        self._open_slots = {} # word index -> the last slot _could_still_fit found open for it
+        self._letter_positions = {word: {} for word in self.words}
+        for word, positions in self._letter_positions.items():
+            for i, char in enumerate(word):
+                positions.setdefault(char, []).append(i)
+        self._overlaps = [[_overlap(first, second) for second in self.words] for first in self.words]
+        self.budget = None # See SearchBudget.
 
     def solve(self):
         """
         Attempts to solve the arrowword puzzle by finding the best possible solution,
         even if it means omitting some words.
+
+        Runs a single branch-and-bound search in which leaving a word out is just
+        another branch. A subtree is pruned when the words placed so far plus the
+        remaining words that could still fit fall short of the best layout found; one
+        that can only tie it is still searched unless it cannot gain enough intersections.
+        Returns the layout with the most words placed, then the most intersections.
+        """
+        grid, placed_words_info, _ = self.solve_anytime()
+        return grid, placed_words_info
+
+    def solve_anytime(self, timeout=None, max_nodes=None, cancel_event=None, progress=None):
+        """
+        Runs the branch-and-bound search of solve() within a budget of `timeout`
+        seconds and/or `max_nodes` search nodes, or until `cancel_event` is set.
+        `progress` is called as in FinalArrowwordSolver.solve_anytime.
+
+        Returns (grid, placed_words_info, complete): the best layout found so far,
+        and whether the search finished, i.e. the layout is known to be the best.
         """
-        initial_grid = [['' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        best = self._best = BestLayout()
+        self._open_slots = {}
+        state = SearchState(self.grid_size)
+        on_progress = None
+        if progress is not None:
+            on_progress = lambda budget: progress(state, best, budget.nodes)
+        budget = self.budget = SearchBudget(timeout, max_nodes, cancel_event, on_progress)
+        domains = self._placement_domains(enumerate(self.words), state)
+        try:
+            self._branch_and_bound(list(range(len(self.words))), state, domains, budget)
+        except BudgetExhausted:
+            pass
+        return self._best.grid, self._best.placed_words_info, not budget.exhausted
+
+    def solve_by_combinations(self):
+        """
+        Finds the best possible solution by solving every subset of the words from
+        scratch, largest subsets first. Kept for comparison with solve().
+        """
+        # Every failed search undoes all of its placements, so one state serves every subset.
+        if self.transposition_table_size:
+            self._transpositions = TranspositionTable(self.transposition_table_size)
+            state = SearchState(self.grid_size, hasher=ZobristHasher())
+        else:
+            state = SearchState(self.grid_size)
         
         for i in range(len(self.words), 0, -1):
             for word_subset in itertools.combinations(self.words, i):
-                grid, placed_info = self._solve_recursive(list(word_subset), initial_grid, [])
-                if grid:
-                    return grid, placed_info
+                # Repeated words are placed once, as _solve_recursive drops every copy of a placed word.
+                domains = self._placement_domains(((word, word) for word in word_subset), state)
+                if self._solve_recursive(list(word_subset), state, domains):
+                    return state.snapshot()
         return None, None
 
-    def _get_next_word_and_placements(self, unplaced_words, grid, is_first_word):
+    def _placement_domains(self, words, state):
+        """Returns PlacementDomains for (key, word) pairs, checking placements on the given state."""
+        return PlacementDomains(
+            self.grid_size, words,
+            lambda word, r, c, direction: self._check_placement(word, r, c, direction, state, False),
+        )
+
+    def _place(self, word, r, c, direction, state, domains):
+        """Places a word on the state and updates the placement domains to match."""
+        state.place_word(word, r, c, direction)
+        if self.stats is None:
+            domains.place(state.grid, state.last_written())
+            return
+        start = time.perf_counter()
+        domains.place(state.grid, state.last_written())
+        self.stats.add_time(len(state.placed_words_info), 'update_domains', start)
+
+    def _unplace(self, state, domains):
+        """Undoes _place."""
+        domains.undo()
+        state.undo()
+
+    def _get_next_word_and_placements(self, unplaced_words, state, is_first_word, domains):
         """
         Determines the best word to place next based on the number of valid placements (minimum first).
         """
         if is_first_word:
             first_word = unplaced_words[0]
             # Place the first word at (0,0) horizontally
-            if self._is_valid_placement(first_word, 0, 0, 'H', grid, True):
+            if self._check_placement(first_word, 0, 0, 'H', state, True):
                 return first_word, [(0, 0, 'H')]
             else:
                 return None, []
 
 
-        candidate_words = []
-        for word in unplaced_words:
-            placements = self._find_all_valid_placements(word, grid)
-            valid_placements = [p for p in placements if self._is_valid_placement(word, p[0], p[1], p[2], grid, False)]
-            
-            if not valid_placements:
-                # If any word has zero valid placements, this path is invalid.
-                return None, []
-                
-            candidate_words.append((word, valid_placements))
+        if domains.any_empty():
+            # If any word has zero valid placements, this path is invalid.
+            return None, []
 
-        if not candidate_words:
+        word = domains.most_constrained()
+        if word is None:
             return None, []
+        return word, domains.placements(word)
 
-        # Sort by the number of valid placements, ascending
-        candidate_words.sort(key=lambda x: len(x[1]))
-        
-        return candidate_words[0]
+    def _check_placement(self, word, r, c, direction, state, is_first_word):
+        """Runs _is_valid_placement, or the instrumented check when stats are being collected."""
+        if self.stats is None:
+            return self._is_valid_placement(word, r, c, direction, state.grid, is_first_word)
+        slot = self._slots.get((r, c, direction, len(word)))
+        return self.stats.check_placement(len(state.placed_words_info), word, slot, state.grid, is_first_word)
 
 
-    def _solve_recursive(self, unplaced_words, grid, placed_words_info):
+    def _solve_recursive(self, unplaced_words, state, domains):
         """
         The main recursive function that tries to place words using a heuristic.
+        Placements are made on the shared search state and undone when backtracking;
+        returns True once every word is placed.
         """
         if not unplaced_words:
-            return grid, placed_words_info
+            return True
+        if self.stats is not None:
+            self.stats.node(len(state.placed_words_info))
+
+        transpositions = self._transpositions
+        if transpositions is not None:
+            state_key = state.zobrist ^ state.hasher.words_hash(unplaced_words)
+            if transpositions.is_refuted(state_key):
+                return False
 
-        is_first_word = not placed_words_info
+        is_first_word = not state.placed_words_info
         
         # Find the best word to place next
-        word_to_place, placements = self._get_next_word_and_placements(unplaced_words, grid, is_first_word)
+        word_to_place, placements = self._get_next_word_and_placements(unplaced_words, state, is_first_word, domains)
         
-        if not word_to_place:
-            return None, None
+        if word_to_place:
+            new_unplaced_words = [w for w in unplaced_words if w != word_to_place]
+
+            domains.remove(word_to_place)
+            for r, c, direction in placements:
+                self._place(word_to_place, r, c, direction, state, domains)
+                if self._solve_recursive(new_unplaced_words, state, domains):
+                    return True
+                self._unplace(state, domains)
+            domains.undo()
+        
+        if transpositions is not None:
+            transpositions.add_refuted(state_key)
+        return False
+
+    def _branch_and_bound(self, undecided, state, domains, budget, crossed=None):
+        """
+        Extends the layout with the words whose indices are in `undecided`.
+        Branches on every valid placement of the most constrained word, then on leaving
+        it out, and records the best layout in self._best.
+        `crossed` caches _most_letters_crossed by word index for the current grid, which
+        leaving a word out does not change.
+        """
+        budget.tick()
+        if self.stats is not None:
+            self.stats.node(len(state.placed_words_info))
+        if crossed is None:
+            crossed = {}
+        best = self._best
+        best.offer(state)
+        if not undecided:
+            return # Every word is placed or left out.
 
-        new_unplaced_words = [w for w in unplaced_words if w != word_to_place]
+        placed = len(state.placed_words_info)
+        grid = state.grid
+        # A word with a valid placement now certainly fits; only the others need the slot scan.
+        could_fit = [index for index in undecided if domains.domains[index] or self._could_still_fit(index, grid)]
+        if placed + len(could_fit) < best.score[0]:
+            return # Bound: this subtree cannot place as many words as the best layout.
+        if placed + len(could_fit) == best.score[0]:
+            # At best it ties on words, placing every word that could fit; it must then beat the intersections.
+            if not self._may_gain_intersections(could_fit, grid, best.score[1] - state.intersections + 1, crossed):
+                return
 
+        if not placed:
+            # Like the subset search, the first word of the layout goes at (0,0) horizontally.
+            word_index = undecided[0]
+            word = self.words[word_index]
+            placements = [(0, 0, 'H')] if self._check_placement(word, 0, 0, 'H', state, True) else []
+        else:
+            word_index = domains.most_constrained()
+            if word_index is None:
+                return # No remaining word touches the layout.
+            placements = domains.placements(word_index)
+
+        # A word that cannot fit now never will, so it is left out of the subtree's checks.
+        rest = [index for index in could_fit if index != word_index]
+        word = self.words[word_index]
+        domains.remove(word_index)
         for r, c, direction in placements:
-            new_grid = self._place_word(grid, word_to_place, r, c, direction)
-            new_placed_info = placed_words_info + [{'word': word_to_place, 'row': r, 'col': c, 'direction': direction}]
-            
-            solution_grid, solution_info = self._solve_recursive(new_unplaced_words, new_grid, new_placed_info)
-            if solution_grid:
-                return solution_grid, solution_info
-        
-        return None, None
+            self._place(word, r, c, direction, state, domains)
+            self._branch_and_bound(rest, state, domains, budget)
+            self._unplace(state, domains)
+
+        # Leave this word out of the layout.
+        self._branch_and_bound(rest, state, domains, budget, crossed)
+        domains.undo()
+
+    def _may_gain_intersections(self, indices, grid, needed, crossed):
+        """
+        Checks an upper bound on the intersections that placing all of the words with
+        these indices could add against the `needed` number. Each word can cross at
+        most the letters already in one of its open slots, plus the cells the other new
+        words fill: two words cross at most once, or share every cell of the shorter one
+        if it lies inside the other, and k new words cross each other at most
+        (k // 2) * ((k + 1) // 2) times, when half of them run across and half down.
+        The pair terms come first, as they often settle the check on their own.
+        """
+        gain = 0
+        crossings = 0
+        for i, first in enumerate(indices):
+            for second in indices[i + 1:]:
+                overlap, nested = self._overlaps[first][second]
+                if nested:
+                    gain += overlap
+                else:
+                    crossings += overlap
+        k = len(indices)
+        gain += min(crossings, (k // 2) * ((k + 1) // 2))
+        if gain >= needed:
+            return True
+        filled = {}
+        for r, row in enumerate(grid):
+            for c, char in enumerate(row):
+                if char != '':
+                    filled.setdefault(char, []).append((r, c))
+        # A word crosses at most as many letters as the grid holds of its own; only
+        # when those counts leave enough room are the slots themselves looked at.
+        rough = [min(len(self.words[index]), sum(len(filled.get(char, ())) for char in set(self.words[index]))) for index in indices]
+        ceiling = gain + sum(rough)
+        for index, most_letters in zip(indices, rough):
+            if ceiling < needed:
+                return False
+            if gain >= needed:
+                return True
+            most = crossed.get(index)
+            if most is None:
+                most = crossed[index] = self._most_letters_crossed(self.words[index], filled, grid)
+            gain += most
+            ceiling -= most_letters - most
+        return ceiling >= needed
+
+    def _most_letters_crossed(self, word, filled, grid):
+        """
+        Returns the most filled cells in an open slot for the word, looking only at the
+        slots through a cell with a matching letter; `filled` maps each letter on the
+        grid to its (row, col) cells.
+        """
+        most = 0
+        length = len(word)
+        for char, positions in self._letter_positions[word].items():
+            for r, c in filled.get(char, ()):
+                for i in positions:
+                    for key in ((r, c - i, 'H', length), (r - i, c, 'V', length)):
+                        slot = self._slots.get(key)
+                        if slot is not None:
+                            most = max(most, self._letters_in_open_slot(word, slot, grid))
+        return most
 
-    def _find_all_valid_placements(self, word, grid):
-        """Finds all geometrically possible placements for a word based on intersections."""
-        placements = []
-        for r_intersect in range(self.grid_size):
-            for c_intersect in range(self.grid_size):
-                if grid[r_intersect][c_intersect] != '':
-                    for i, char in enumerate(word):
-                        if char == grid[r_intersect][c_intersect]:
-                            # Try placing horizontally
-                            placements.append((r_intersect, c_intersect - i, 'H'))
-                            # Try placing vertically
-                            placements.append((r_intersect - i, c_intersect, 'V'))
-        return list(set(placements)) # Remove duplicates
+    def _letters_in_open_slot(self, word, slot, grid):
+        """Returns the number of filled cells in a slot, or 0 if it is not open for the word."""
+        for end_r, end_c in slot.end_caps:
+            if grid[end_r][end_c] != '':
+                return 0
+        count = 0
+        for char, (cell_r, cell_c) in zip(word, slot.cells):
+            char_on_grid = grid[cell_r][cell_c]
+            if char_on_grid == char:
+                count += 1
+            elif char_on_grid != '':
+                return 0
+        return count
+
+    def _could_still_fit(self, index, grid):
+        """
+        Checks whether self.words[index] could be placed now or after more words are
+        added: some slot must have no conflicting letters and empty end cells. Letters
+        are never removed further down the search, so a word failing this check never
+        fits, and a slot passing it also passed at every ancestor node. The slot found
+        last for each word is therefore tried first, and the scan is rarely needed.
+        """
+        word = self.words[index]
+        slot = self._open_slots.get(index)
+        if slot is not None and self._slot_is_open(word, slot, grid):
+            return True
+        for slot in self._slots_by_length.get(len(word), ()):
+            if self._slot_is_open(word, slot, grid):
+                self._open_slots[index] = slot
+                return True
+        return False
+
+    def _slot_is_open(self, word, slot, grid):
+        """Checks that a slot has empty end cells and no letter that conflicts with the word."""
+        for end_r, end_c in slot.end_caps:
+            if grid[end_r][end_c] != '':
+                return False
+        for char, (cell_r, cell_c) in zip(word, slot.cells):
+            if grid[cell_r][cell_c] not in ('', char):
+                return False
+        return True
 
     def _is_valid_placement(self, word, r, c, direction, grid, is_first_word=False):
         """Checks if a word can be placed at a given position and direction."""
         has_intersection = False
-        
-        if direction == 'H':
-            if c < 0 or c + len(word) > self.grid_size: return False
-            for i in range(len(word)):
-                char_on_grid = grid[r][c + i]
-                if char_on_grid != '' and char_on_grid != word[i]: return False
-                if char_on_grid == word[i]: has_intersection = True
-                if char_on_grid == '':
-                    if r > 0 and grid[r - 1][c + i] != '': return False
-                    if r < self.grid_size - 1 and grid[r + 1][c + i] != '': return False
-            if c > 0 and grid[r][c - 1] != '': return False
-            if c + len(word) < self.grid_size and grid[r][c + len(word)] != '': return False
-        
-        elif direction == 'V':
-            if r < 0 or r + len(word) > self.grid_size: return False
-            for i in range(len(word)):
-                char_on_grid = grid[r + i][c]
-                if char_on_grid != '' and char_on_grid != word[i]: return False
-                if char_on_grid == word[i]: has_intersection = True
-                if char_on_grid == '':
-                    if c > 0 and grid[r + i][c - 1] != '': return False
-                    if c < self.grid_size - 1 and grid[r + i][c + 1] != '': return False
-            if r > 0 and grid[r - 1][c] != '': return False
-            if r + len(word) < self.grid_size and grid[r + len(word)][c] != '': return False
-        
-        else: # Invalid direction
-            return False
+        slot = self._slots.get((r, c, direction, len(word)))
+        if slot is None: return False # Off the grid, or invalid direction
+
+        for char, (cell_r, cell_c), neighbours in zip(word, slot.cells, slot.neighbours):
+            char_on_grid = grid[cell_r][cell_c]
+            if char_on_grid != '' and char_on_grid != char: return False
+            if char_on_grid == char: has_intersection = True
+            if char_on_grid == '':
+                for side_r, side_c in neighbours:
+                    if grid[side_r][side_c] != '': return False
+        for end_r, end_c in slot.end_caps:
+            if grid[end_r][end_c] != '': return False
 
         return is_first_word or has_intersection
 
-    def _place_word(self, grid, word, r, c, direction):
-        """Places a word on a copy of the grid and returns the new grid."""
-        new_grid = [row[:] for row in grid]
-        if direction == 'H':
-            for i in range(len(word)):
-                new_grid[r][c + i] = word[i]
-        elif direction == 'V':
-            for i in range(len(word)):
-                new_grid[r + i][c] = word[i]
-        return new_grid
+def _overlap(first, second):
+    """
+    Returns (the most cells two placed words can share, whether one lies inside the
+    other): all of the shorter word when it does, otherwise one crossing if they have
+    a letter in common.
+    """
+    shorter, longer = sorted((first, second), key=len)
+    if shorter in longer:
+        return len(shorter), True
+    return (1 if set(first) & set(second) else 0), False
 
 def print_grid(grid):
     """Utility function to print the grid nicely."""
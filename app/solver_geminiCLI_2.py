@@ -1,14 +1,26 @@
 import collections
 
+from app.budget import BudgetExhausted, SearchBudget
+from app.run_validator import RunValidator
+from app.search_state import SearchState
+from app.symmetry import canonical_form, first_word_directions
+
 class GraphArrowwordSolver:
     """
     A graph-based backtracking solver for arrowword puzzles.
+    With `symmetry_breaking`, the first word is only tried across, skipping layouts that
+    are transposes of ones already covered, and solutions are reported in canonical form.
+    With `validate_runs`, a placement that leaves a run of letters which can no longer
+    become a word is cut immediately (see RunValidator), so every run in a solution is a word.
     """
 
-    def __init__(self, words, grid_size=8):
+    def __init__(self, words, grid_size=8, symmetry_breaking=False, validate_runs=False):
         self.words = sorted(words, key=len, reverse=True)
         self.grid_size = grid_size
+        self.symmetry_breaking = symmetry_breaking
+        self._run_validator = RunValidator(words) if validate_runs else None
         self.graph = self._create_graph()
+        self.budget = None # See SearchBudget.
 
     def _create_graph(self):
         """Creates a graph representation of the grid."""
@@ -25,31 +37,53 @@ class GraphArrowwordSolver:
         """
         Attempts to solve the arrowword puzzle using a graph-based approach.
         """
-        initial_grid = [['' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
-        return self._solve_recursive(self.words, initial_grid, [])
+        return next(self.iter_solutions(limit=1), (None, None))
 
-    def _solve_recursive(self, words_to_place, grid, placed_words_info):
+    def iter_solutions(self, limit=None, timeout=None, max_nodes=None):
+        """
+        Yields solutions one at a time from a single resumable search, stopping after
+        `limit` solutions, `timeout` seconds or `max_nodes` search nodes.
+        """
+        budget = self.budget = SearchBudget(timeout, max_nodes)
+        state = SearchState(self.grid_size)
+        found = 0
+        try:
+            for _ in self._iter_recursive(state, 0, budget):
+                if self.symmetry_breaking:
+                    yield canonical_form(*state.snapshot())
+                else:
+                    yield state.snapshot()
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+        except BudgetExhausted:
+            return
+
+    def _iter_recursive(self, state, index, budget):
         """
         The main recursive function that tries to place words.
+        Places self.words[index:] on the shared search state and yields each time all
+        are placed, leaving the solution on the state until it is resumed.
         """
-        if not words_to_place:
-            return grid, placed_words_info
+        if index == len(self.words):
+            if self._run_validator is None or self._run_validator.grid_is_valid(state.grid):
+                yield
+            return
 
-        word_to_place = words_to_place[0]
-        remaining_words = words_to_place[1:]
+        budget.tick()
+        word_to_place = self.words[index]
+        grid = state.grid
+        validator = self._run_validator
+        directions = first_word_directions(self.symmetry_breaking) if index == 0 else ('H', 'V')
 
         for r in range(self.grid_size):
             for c in range(self.grid_size):
-                for direction in ['H', 'V']:
+                for direction in directions:
                     if self._is_valid_placement(word_to_place, r, c, direction, grid):
-                        new_grid = self._place_word(grid, word_to_place, r, c, direction)
-                        new_placed_info = placed_words_info + [{'word': word_to_place, 'row': r, 'col': c, 'direction': direction}]
-                        
-                        solution_grid, solution_info = self._solve_recursive(remaining_words, new_grid, new_placed_info)
-                        if solution_grid:
-                            return solution_grid, solution_info
-        
-        return None, None
+                        state.place_word(word_to_place, r, c, direction)
+                        if validator is None or validator.placement_is_possible(grid, word_to_place, r, c, direction):
+                            yield from self._iter_recursive(state, index + 1, budget)
+                        state.undo()
 
     def _is_valid_placement(self, word, r, c, direction, grid):
         """Checks if a word can be placed at a given position and direction."""
@@ -63,17 +97,6 @@ class GraphArrowwordSolver:
                 if grid[r + i][c] not in ('', word[i]): return False
         return True
 
-    def _place_word(self, grid, word, r, c, direction):
-        """Places a word on a copy of the grid and returns the new grid."""
-        new_grid = [row[:] for row in grid]
-        if direction == 'H':
-            for i in range(len(word)):
-                new_grid[r][c + i] = word[i]
-        elif direction == 'V':
-            for i in range(len(word)):
-                new_grid[r + i][c] = word[i]
-        return new_grid
-
 def print_grid(grid):
     """Utility function to print the grid nicely."""
     if not grid:
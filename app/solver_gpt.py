@@ -1,5 +1,6 @@
 from collections import defaultdict
-import numpy as np
+
+from app.letter_index import LetterIndex
 
 def can_place_word(grid, word, row, col, direction):
     n = len(grid)
@@ -43,59 +44,67 @@ def place_word(grid, word, row, col, direction):
         for i in range(len(word)):
             grid[row + i][col] = word[i]
 
-def find_all_intersections(grid, word):
+def find_all_intersections(grid, word, letter_index=None):
     n = len(grid)
     for i, char in enumerate(word):
-        for r in range(n):
-            for c in range(n):
-                if grid[r][c] == char:
-                    # Try across
-                    start_col = c - i
-                    if 0 <= start_col and start_col + len(word) <= n:
-                        if can_place_word(grid, word, r, start_col, 'across'):
-                            return (word, r, start_col, 'across')
-                    # Try down
-                    start_row = r - i
-                    if 0 <= start_row and start_row + len(word) <= n:
-                        if can_place_word(grid, word, start_row, c, 'down'):
-                            return (word, start_row, c, 'down')
+        if letter_index is not None:
+            cells = letter_index.cells(char)
+        else:
+            cells = [(r, c) for r in range(n) for c in range(n) if grid[r][c] == char]
+        for r, c in cells:
+            # Try across
+            start_col = c - i
+            if 0 <= start_col and start_col + len(word) <= n:
+                if can_place_word(grid, word, r, start_col, 'across'):
+                    return (word, r, start_col, 'across')
+            # Try down
+            start_row = r - i
+            if 0 <= start_row and start_row + len(word) <= n:
+                if can_place_word(grid, word, start_row, c, 'down'):
+                    return (word, start_row, c, 'down')
     return None
 
 def greedy_arrowword(words):
+    import numpy as np  # Only needed for the result, so importing this module stays cheap.
+
     words = sorted(words, key=lambda w: -len(w))  # Longest words first
     n = 8
     grid = [['' for _ in range(n)] for _ in range(n)]
     placed = []
+    letter_index = LetterIndex()
 
     # Try first word in top-left corner horizontally
     first_word = words.pop(0)
     if can_place_word(grid, first_word, 0, 0, 'across'):
         place_word(grid, first_word, 0, 0, 'across')
+        letter_index.add_word(first_word, 0, 0, 'H')
         placed.append((first_word, 0, 0, 'across'))
     else:
         return None  # Failed early, shouldn't happen with valid input
 
     # Place remaining words
     for word in words:
-        placement = find_all_intersections(grid, word)
+        placement = find_all_intersections(grid, word, letter_index)
         if placement:
             w, r, c, d = placement
             place_word(grid, w, r, c, d)
+            letter_index.add_word(w, r, c, 'H' if d == 'across' else 'V')
             placed.append(placement)
 
     return np.array(grid)
 
-# Example usage
-words = ['HAPPILY','HOLIDAY','YELLOW', 'LEGEND','LOVE','EWE','DONUT','LIT','POT','EVIL','EYE','END','NILE']
-grid_result = greedy_arrowword(words)
+# --- Main Execution ---
+if __name__ == "__main__":
+    words = ['HAPPILY','HOLIDAY','YELLOW', 'LEGEND','LOVE','EWE','DONUT','LIT','POT','EVIL','EYE','END','NILE']
+    grid_result = greedy_arrowword(words)
 
-# Display grid
-if grid_result is not None:
-    for row in grid_result:
-        print(' '.join(c if c else '.' for c in row))
-else:
-    print("No valid solution found.")
+    # Display grid
+    if grid_result is not None:
+        for row in grid_result:
+            print(' '.join(c if c else '.' for c in row))
+    else:
+        print("No valid solution found.")
 
-solution = solution = [list('HAPPILY.'),list('O.O..O..'),list('LIT.EVIL'),list('I....E.E'),list('DONUT..G'),list('A.I..EYE'),list('YELLOW.N'),list('..E..END')]
-for row in solution:
-    print(''.join(row))
\ No newline at end of file
+    solution = solution = [list('HAPPILY.'),list('O.O..O..'),list('LIT.EVIL'),list('I....E.E'),list('DONUT..G'),list('A.I..EYE'),list('YELLOW.N'),list('..E..END')]
+    for row in solution:
+        print(''.join(row))
\ No newline at end of file
@@ -1,36 +1,90 @@
-from bisect import bisect_left
+from app.budget import BudgetExhausted, SearchBudget
 
 # Fill a NxN crossword using a dictionary of words of length N.
 # Prints solution, and then waits until you hit Enter to try to find the next one.
 def make_crosswords(N, word_list):
-  for soln in fill(N, sorted([w for w in word_list if len(w) == N]), []):
+  for soln in iter_crosswords(N, word_list):
     for row in soln:
       print(row)
     input()
 
-def fill(N, words, crossword):
+# Non-interactive version: yields each NxN square as a list of rows, resuming the
+# same search for the next one. Stops after `limit` squares, `timeout` seconds or
+# `max_nodes` search nodes, whichever comes first.
+def iter_crosswords(N, word_list, limit=None, timeout=None, max_nodes=None):
+  budget = SearchBudget(timeout, max_nodes)
+  found = 0
+  try:
+    for soln in fill(N, sorted([w for w in word_list if len(w) == N]), [], budget):
+      yield list(soln) # fill keeps modifying its list, so hand out a copy
+      found += 1
+      if limit is not None and found >= limit: return
+  except BudgetExhausted:
+    return
+
+class TrieNode:
+  __slots__ = ('children', 'available')
+
+  def __init__(self):
+    self.children = {}  # letter -> TrieNode, in sorted order
+    self.available = 0  # words below this node that are not already used as a row
+
+def build_trie(words):
+  root = TrieNode()
+  for w in sorted(set(words)):
+    node = root
+    node.available += 1
+    for ch in w:
+      node = node.children.setdefault(ch, TrieNode())
+      node.available += 1
+  return root
+
+def fill(N, words, crossword, budget=None):
+  # Each column keeps a cursor on the trie node for the letters in it so far.
+  # Pushing a row advances every cursor by one letter and popping it moves them
+  # back, so checking a column is a single lookup instead of a dictionary scan.
+  root = build_trie(words)
+  cursors = [root] * N
+  for w in crossword:
+    mark_used(root, w, -1)
+    cursors = [cursors[col].children.get(w[col]) for col in range(N)]
+    if None in cursors: return # Dead end
+  yield from fill_rows(N, root, crossword, cursors, budget)
+
+def fill_rows(N, root, crossword, cursors, budget):
+  if budget is not None: budget.tick()
   for col in range(N):
-    if not could_place_vertical_word(words, crossword, col):
-      return # Dead end
-  if len(crossword) == N: 
+    if not cursors[col].available:
+      return # Dead end: no unused word starts with this column
+  if len(crossword) == N:
     # Full, do final validity check
-    if len(set(get_col(crossword, i) for i in range(N))) < N: return # Invalid
+    if len(set(map(id, cursors))) < N: return # Invalid
     yield crossword # Valid!
-  for w in words:
-    if w in crossword: continue # already placed
+    return
+  for w, next_cursors in row_candidates(root, cursors, 0, ''):
     crossword.append(w)
-    yield from fill(N, words, crossword)
+    mark_used(root, w, -1)
+    yield from fill_rows(N, root, crossword, next_cursors, budget)
+    mark_used(root, w, 1)
     crossword.pop()
 
-def get_col(crossword, col):
-  return ''.join(w[col] for w in crossword)
-
-def could_place_vertical_word(words, crossword, col):
-  # The letters in this column so far
-  prefix = get_col(crossword, col)
-  # Just like you would in a dictionary, find the prefix and scan forward
-  for i in range(bisect_left(words, prefix), len(words)):
-    if words[i] in crossword: continue # already placed
-    if not words[i].startswith(prefix): break # passed the section for this prefix
-    return True
-  return False
\ No newline at end of file
+def row_candidates(node, cursors, col, prefix):
+  # Walk the trie for the next row, only following letters that also extend
+  # the column below them, and yield each unused word with the advanced cursors.
+  if col == len(cursors):
+    if node.available:
+      yield prefix, []
+    return
+  for ch, child in node.children.items():
+    below = cursors[col].children.get(ch)
+    if below is None or not child.available: continue
+    for w, next_cursors in row_candidates(child, cursors, col + 1, prefix + ch):
+      yield w, [below] + next_cursors
+
+def mark_used(root, w, delta):
+  # A word used as a row can no longer be used as a column
+  node = root
+  node.available += delta
+  for ch in w:
+    node = node.children[ch]
+    node.available += delta
@@ -0,0 +1,75 @@
+# A common entry point for the arrowword solvers: each one is looked up by name and
+# called with a word list, a grid size and an optional budget, and returns
+# (grid, placed_words_info, complete) like FinalArrowwordSolver.solve_anytime.
+# Solver modules are imported on first use, so only the chosen one is loaded.
+# Given a SolutionCache, solve() answers word lists it has solved before from the cache.
+
+def _solve_final(words, grid_size, timeout, max_nodes, backend='list'):
+    from app.solver_final import FinalArrowwordSolver
+    return FinalArrowwordSolver(words, grid_size, backend=backend).solve_anytime(timeout, max_nodes)
+
+def _solve_final_bitboard(words, grid_size, timeout, max_nodes):
+    return _solve_final(words, grid_size, timeout, max_nodes, backend='bitboard')
+
+def _solve_final_v2(words, grid_size, timeout, max_nodes):
+    # Greedy: it makes one pass over the words, so it needs no budget.
+    from app.solver_final_v2 import FinalArrowwordSolverV2
+    grid, placed_words_info = FinalArrowwordSolverV2(words, grid_size).solve()
+    return grid, placed_words_info, True
+
+def _solve_final_v2_restarts(words, grid_size, timeout, max_nodes):
+    # The restarts run in this process: batch and the CLI already spread puzzles over processes.
+    from app.solver_final_v2 import FinalArrowwordSolverV2
+    grid, placed_words_info = FinalArrowwordSolverV2(words, grid_size).solve_restarts(max_workers=1)
+    return grid, placed_words_info, True
+
+def _solve_gemini(words, grid_size, timeout, max_nodes):
+    # Greedy: stops at the first word it cannot place, keeping the ones before it.
+    from app.solver_gemini import ArrowwordSolver
+    solver = ArrowwordSolver(words, grid_size)
+    solver.solve()
+    if not solver.placed_words:
+        return None, None, True
+    return solver.grid, solver.placed_words, True
+
+def _solve_gemini_cli(words, grid_size, timeout, max_nodes):
+    from app.solver_geminiCLI import ArrowwordSolver
+    return ArrowwordSolver(words, grid_size).solve_anytime(timeout, max_nodes)
+
+def _solve_graph(words, grid_size, timeout, max_nodes):
+    from app.solver_geminiCLI_2 import GraphArrowwordSolver
+    solver = GraphArrowwordSolver(words, grid_size)
+    grid, placed_words_info = next(solver.iter_solutions(1, timeout, max_nodes), (None, None))
+    return grid, placed_words_info, not solver.budget.exhausted
+
+def _solve_bruteforce(words, grid_size, timeout, max_nodes):
+    from app.solver_bruteforce import BruteForceArrowwordSolver
+    return BruteForceArrowwordSolver(words, grid_size).solve_anytime(timeout, max_nodes)
+
+SOLVERS = {
+    'final': _solve_final,
+    'final-bitboard': _solve_final_bitboard,
+    'final-v2': _solve_final_v2,
+    'final-v2-restarts': _solve_final_v2_restarts,
+    'gemini': _solve_gemini,
+    'gemini-cli': _solve_gemini_cli,
+    'graph': _solve_graph,
+    'bruteforce': _solve_bruteforce,
+}
+
+def solve(solver_name, words, grid_size=8, timeout=None, max_nodes=None, cache=None):
+    """
+    Solves a word list with the named solver within an optional budget of `timeout`
+    seconds and/or `max_nodes` search nodes (ignored by the greedy solvers).
+    Returns (grid, placed_words_info, complete); see FinalArrowwordSolver.solve_anytime.
+    With a SolutionCache as `cache`, complete results are looked up there first and
+    stored there after solving.
+    """
+    if solver_name not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver_name}', expected one of {tuple(SOLVERS)}.")
+    words = list(words)
+    if cache is None:
+        return SOLVERS[solver_name](words, grid_size, timeout, max_nodes)
+    return cache.get_or_solve(
+        solver_name, words, grid_size, lambda: SOLVERS[solver_name](words, grid_size, timeout, max_nodes),
+    )
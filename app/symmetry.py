@@ -0,0 +1,37 @@
+# Of the eight symmetries of a square grid, only the reflection in the main diagonal
+# (transposition) keeps a valid layout valid: it swaps across and down words but every
+# word still reads left-to-right or top-to-bottom. The rotations and other reflections
+# reverse at least one reading direction, so each layout has exactly one mirror copy.
+
+def first_word_directions(symmetry_breaking):
+    """
+    Returns the directions to try for the first word of a layout. The transpose of any
+    layout with the first word down has it across, so with symmetry breaking only
+    across is tried and every layout is still found once, up to transposition.
+    """
+    return ('H',) if symmetry_breaking else ('H', 'V')
+
+def transpose_grid(grid):
+    """Reflects a grid in its main diagonal."""
+    return [list(column) for column in zip(*grid)]
+
+def transpose_placements(placed_words_info):
+    """Reflects placement records in the main diagonal, swapping across and down."""
+    return [
+        {**info, 'row': info['col'], 'col': info['row'], 'direction': 'V' if info['direction'] == 'H' else 'H'}
+        for info in placed_words_info
+    ]
+
+def canonical_form(grid, placed_words_info):
+    """
+    Returns the canonical representative of a layout and its transpose: the one whose
+    rows, read top to bottom with '.' for empty cells, sort first.
+    """
+    if not grid:
+        return grid, placed_words_info
+    transposed = transpose_grid(grid)
+    key = [''.join(char or '.' for char in row) for row in grid]
+    transposed_key = [''.join(char or '.' for char in row) for row in transposed]
+    if transposed_key < key:
+        return transposed, transpose_placements(placed_words_info)
+    return grid, placed_words_info
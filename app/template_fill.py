@@ -0,0 +1,219 @@
+import collections
+
+from app.budget import BudgetExhausted, SearchBudget
+from app.dictionary_index import ALPHABET, bit_indices
+
+BLOCKS = '.#'  # Block or clue cells, which hold no letter.
+OPEN = ('', ' ', '?', '_')  # Cells still to fill.
+ALL_LETTERS = (1 << len(ALPHABET)) - 1
+
+TemplateSlot = collections.namedtuple('TemplateSlot', ['row', 'col', 'direction', 'cells'])
+
+def parse_template(template):
+    """
+    Normalises a template, given as a list of strings or of lists of cells, to a
+    list of lists with '.' for blocks, '' for open cells and upper-case letters for
+    cells that are already filled.
+    """
+    grid = []
+    for row in template:
+        cells = []
+        for cell in row:
+            if cell in BLOCKS:
+                cells.append('.')
+            elif cell in OPEN:
+                cells.append('')
+            elif cell.upper() in ALPHABET:
+                cells.append(cell.upper())
+            else:
+                raise ValueError(f"Unexpected template cell {cell!r}.")
+        grid.append(cells)
+    if any(len(row) != len(grid[0]) for row in grid):
+        raise ValueError("Template rows must all have the same length.")
+    return grid
+
+def extract_slots(grid):
+    """Returns the across then down runs of two or more non-block cells, as TemplateSlots."""
+    height, width = len(grid), len(grid[0]) if grid else 0
+    slots = []
+    for direction, outer, inner in (('H', height, width), ('V', width, height)):
+        for i in range(outer):
+            run = []
+            for j in range(inner + 1):
+                r, c = (i, j) if direction == 'H' else (j, i)
+                if j < inner and grid[r][c] != '.':
+                    run.append((r, c))
+                    continue
+                if len(run) > 1:
+                    slots.append(TemplateSlot(run[0][0], run[0][1], direction, tuple(run)))
+                run = []
+    return slots
+
+class TemplateFiller:
+    """
+    Fills the open cells of a crossword template with words from a DictionaryIndex.
+
+    Every slot (run of two or more non-block cells) is a variable whose domain is a
+    bitset of the ids of the words that can still go there, and every cell keeps a
+    26-bit mask of the letters it can still take. Propagation is arc consistency over
+    crossing slots: a slot's domain is cut to the words whose letters are all allowed
+    by its cells, which in turn cuts each cell to the letters some remaining word has
+    there, waking the slot that crosses it. A slot narrowed to one word removes that
+    word from the other slots, so no word is used twice. The search fills the slot
+    with the fewest remaining words first (minimum remaining values).
+    """
+
+    def __init__(self, template, index):
+        self.grid = parse_template(template)
+        self.index = index
+        self.slots = extract_slots(self.grid)
+        self.budget = None # See SearchBudget.
+        self._letter_bits = {}  # length -> [position][letter index] -> bitset of word ids
+        self._crossings = collections.defaultdict(list)  # cell -> ids of the slots through it
+        self._same_length = collections.defaultdict(list)  # length -> ids of the slots of that length
+        for slot_id, slot in enumerate(self.slots):
+            for cell in slot.cells:
+                self._crossings[cell].append(slot_id)
+            self._same_length[len(slot.cells)].append(slot_id)
+
+    def fill(self, timeout=None, max_nodes=None):
+        """
+        Fills the template, stopping after `timeout` seconds or `max_nodes` search nodes.
+        Returns (grid, placed_words_info) with '.' for block cells, or (None, None) if
+        there is no fill or the budget ran out first.
+        """
+        budget = self.budget = SearchBudget(timeout, max_nodes)
+        cells = {}
+        for slot in self.slots:
+            for r, c in slot.cells:
+                letter = self.grid[r][c]
+                cells[r, c] = 1 << ALPHABET.index(letter) if letter else ALL_LETTERS
+        domains = [self.index.all_bits(len(slot.cells)) for slot in self.slots]
+        counts = [self.index.count(len(slot.cells)) for slot in self.slots]
+        if not all(domains):
+            return None, None # Some slot has no word of its length at all.
+        if not self._propagate(cells, domains, counts, range(len(self.slots))):
+            return None, None
+        try:
+            solution = self._search(cells, domains, counts, budget)
+        except BudgetExhausted:
+            return None, None
+        if solution is None:
+            return None, None
+        return self._report(*solution)
+
+    def _bits(self, length):
+        """Returns the per-position, per-letter bitsets of the words of a length, read once from the index."""
+        bits = self._letter_bits.get(length)
+        if bits is None:
+            bits = [
+                [self.index.letter_bits(length, position, letter) for letter in ALPHABET]
+                for position in range(length)
+            ]
+            self._letter_bits[length] = bits
+        return bits
+
+    def _search(self, cells, domains, counts, budget):
+        """Assigns words to slots depth first, propagating after each; returns (cells, domains) or None."""
+        budget.tick()
+        slot_id = None
+        for candidate, count in enumerate(counts):
+            if count > 1 and (slot_id is None or count < counts[slot_id]):
+                slot_id = candidate
+        if slot_id is None:
+            return cells, domains # Every slot is down to a single word.
+
+        for word_id in bit_indices(domains[slot_id]):
+            new_cells, new_domains, new_counts = dict(cells), list(domains), list(counts)
+            new_domains[slot_id] = 1 << word_id
+            new_counts[slot_id] = 1
+            if self._propagate(new_cells, new_domains, new_counts, [slot_id]):
+                solution = self._search(new_cells, new_domains, new_counts, budget)
+                if solution is not None:
+                    return solution
+        return None
+
+    def _propagate(self, cells, domains, counts, slot_ids):
+        """
+        Revises the given slots and every slot their changes reach, in place. Returns
+        False as soon as a slot has no word left.
+        """
+        queue = collections.deque(slot_ids)
+        queued = set(queue)
+        while queue:
+            slot_id = queue.popleft()
+            queued.discard(slot_id)
+            slot = self.slots[slot_id]
+            bits = self._bits(len(slot.cells))
+
+            # Keep the words whose letters are allowed by every cell.
+            domain = domains[slot_id]
+            for position, cell in enumerate(slot.cells):
+                mask = cells[cell]
+                if mask != ALL_LETTERS:
+                    allowed = 0
+                    for letter, letter_bits in enumerate(bits[position]):
+                        if mask >> letter & 1:
+                            allowed |= letter_bits
+                    domain &= allowed
+                    if not domain:
+                        return False
+            if domain != domains[slot_id]:
+                domains[slot_id] = domain
+                counts[slot_id] = bin(domain).count('1')
+
+            wake = []
+            if counts[slot_id] == 1:
+                # The slot's word cannot be used anywhere else.
+                for other_id in self._same_length[len(slot.cells)]:
+                    if other_id != slot_id and domains[other_id] & domain:
+                        domains[other_id] &= ~domain
+                        if not domains[other_id]:
+                            return False
+                        counts[other_id] -= 1
+                        wake.append(other_id)
+
+            # Keep the letters of each cell that some remaining word has there.
+            for position, cell in enumerate(slot.cells):
+                mask = cells[cell]
+                supported = 0
+                for letter, letter_bits in enumerate(bits[position]):
+                    if mask >> letter & 1 and domain & letter_bits:
+                        supported |= 1 << letter
+                if supported != mask:
+                    cells[cell] = supported
+                    wake.extend(other_id for other_id in self._crossings[cell] if other_id != slot_id)
+
+            for other_id in wake:
+                if other_id not in queued:
+                    queued.add(other_id)
+                    queue.append(other_id)
+        return True
+
+    def _report(self, cells, domains):
+        """Converts a finished search into (grid, placed_words_info)."""
+        grid = [row[:] for row in self.grid]
+        placed_words_info = []
+        for slot, domain in zip(self.slots, domains):
+            word = self.index.word(len(slot.cells), domain.bit_length() - 1)
+            for char, (r, c) in zip(word, slot.cells):
+                grid[r][c] = char
+            placed_words_info.append({'word': word, 'row': slot.row, 'col': slot.col, 'direction': slot.direction})
+        return grid, placed_words_info
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    from app.dictionary_index import DictionaryIndex
+
+    # The block layout of the example solution in grid_check.py, with every letter cleared.
+    template = ['???????.', '?.?..?..', '???.????', '?....?.?', '?????..?', '?.?..???', '??????.?', '..?..???']
+    word_list = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+
+    filler = TemplateFiller(template, DictionaryIndex.from_words(word_list))
+    final_grid, placed_info = filler.fill(timeout=10)
+    if final_grid is None:
+        print("No fill found.")
+    else:
+        for row in final_grid:
+            print(''.join(row))
+        print(f"\nFilled {len(placed_info)} slots in {filler.budget.nodes} search nodes.")
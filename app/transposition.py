@@ -0,0 +1,71 @@
+import collections
+import random
+
+class ZobristHasher:
+    """
+    Zobrist keys for search states: one random 64-bit key per (row, col, letter)
+    and per (position, word) in the list of remaining words. The hash of a state is
+    the XOR of the keys of its filled cells and of its remaining words, so placing
+    or removing a letter updates it with a single XOR.
+    """
+
+    def __init__(self, seed=0):
+        self._random = random.Random(seed)
+        self._cell_keys = {}
+        self._word_keys = {}
+
+    def cell_key(self, r, c, letter):
+        """Returns the key for a letter in a cell."""
+        key = self._cell_keys.get((r, c, letter))
+        if key is None:
+            key = self._cell_keys[(r, c, letter)] = self._random.getrandbits(64)
+        return key
+
+    def words_hash(self, words):
+        """
+        Returns the hash of the words still to place, in the order they will be tried.
+
+        The solvers break ties (and pick their first word) by list order, so two lists
+        holding the same words in a different order can lead to different searches and
+        must not share a table entry.
+        """
+        value = 0
+        for position, word in enumerate(words):
+            key = self._word_keys.get((position, word))
+            if key is None:
+                key = self._word_keys[(position, word)] = self._random.getrandbits(64)
+            value ^= key
+        return value
+
+class TranspositionTable:
+    """
+    A bounded set of state hashes known to have no solution.
+
+    Holds at most `max_entries` hashes; when full, the least recently used one is
+    evicted, so memory stays flat however long the search runs.
+    """
+
+    def __init__(self, max_entries=100000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_refuted(self, key):
+        """Returns True if the state was already searched without finding a solution."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+        return False
+
+    def add_refuted(self, key):
+        """Records a state that was searched completely without finding a solution."""
+        self._entries[key] = None
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
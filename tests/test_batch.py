@@ -0,0 +1,34 @@
+import pytest
+
+from app.__main__ import read_puzzle
+from app.batch import parse_puzzle
+
+def test_parse_plain_words():
+    assert parse_puzzle(' cat, dog\tEWE ', 3, 8) == {'id': 3, 'grid_size': 8, 'words': ['CAT', 'DOG', 'EWE']}
+    assert parse_puzzle('   ', 3, 8) is None
+
+def test_parse_json():
+    assert parse_puzzle('["cat", " dog ", ""]', 1, 8) == {'id': 1, 'grid_size': 8, 'words': ['CAT', 'DOG']}
+    puzzle = parse_puzzle('{"id": "p", "words": ["cat"], "grid_size": 5}', 1, 8)
+    assert puzzle == {'id': 'p', 'grid_size': 5, 'words': ['CAT']}
+
+@pytest.mark.parametrize('line, message', [
+    ('CAT D0G', "invalid word 'D0G' at line 1 column 5"),
+    ('CAT, DOG\nE-W', "invalid word 'E-W' at line 2 column 1"),
+    ('["cat", "it\'s"]', "invalid word \"it's\""),
+    ('["cat", 1]', "expected a list of words"),
+    ('[cat]', "invalid JSON"),
+    ('{"words": ["cat"], "grid_size": 0}', "invalid grid_size 0"),
+    ('{"words": []}', "no words"),
+])
+def test_parse_rejects_bad_input(line, message):
+    with pytest.raises(ValueError, match=message):
+        parse_puzzle(line, 1, 8)
+
+def test_read_puzzle_names_the_file(tmp_path):
+    path = tmp_path / 'words.txt'
+    path.write_text('CAT\nDOG\nEWE\n')
+    assert read_puzzle(str(path), 8)['words'] == ['CAT', 'DOG', 'EWE']
+    path.write_text('CAT\nDOG!\n')
+    with pytest.raises(ValueError, match="words.txt: invalid word 'DOG!' at line 2 column 1"):
+        read_puzzle(str(path), 8)
@@ -0,0 +1,13 @@
+from app.benchmark import ARROWWORD_CASES, case_words
+from app.grid_check import check_grid
+from app.solver_final import FinalArrowwordSolver
+
+def test_solvable_cases_have_a_full_solution():
+    cases = [case for case in ARROWWORD_CASES if case.get('solvable')]
+    assert cases
+    for case in cases:
+        words = case_words(case)
+        assert len(words) == case['word_count']
+        grid, placed_words_info, complete = FinalArrowwordSolver(words, case['grid_size']).solve_anytime(timeout=30)
+        assert grid is not None
+        assert check_grid(grid, words).valid
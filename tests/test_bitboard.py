@@ -0,0 +1,59 @@
+import pytest
+
+from app.benchmark import generate_word_list
+from app.bitboard import BitboardGrid
+from app.search_state import SearchState
+from app.slots import slots_by_length
+from app.solver_final import FinalArrowwordSolver
+
+def _board_with_words(words, grid_size):
+    """Places the words one after another wherever is_valid_placement first allows."""
+    board = BitboardGrid(grid_size)
+    for word in words:
+        for slot in slots_by_length(grid_size)[len(word)]:
+            if board.is_valid_placement(word, slot.row, slot.col, slot.direction, not board.occupied):
+                board.place_word(word, slot.row, slot.col, slot.direction)
+                break
+    return board
+
+@pytest.mark.parametrize('grid_size', [5, 8, 11])
+@pytest.mark.parametrize('seed', range(5))
+def test_valid_starts_matches_is_valid_placement(grid_size, seed):
+    words = generate_word_list(seed, grid_size, 6, grid_size)
+    board = _board_with_words(words[:4], grid_size)
+    for word in words + ['QQ']:
+        for direction in 'HV':
+            for is_first_word in (False, True):
+                starts = board.valid_starts(word, direction, is_first_word)
+                for r in range(grid_size):
+                    for c in range(grid_size):
+                        expected = board.is_valid_placement(word, r, c, direction, is_first_word)
+                        assert bool(starts >> (r * board.stride + c) & 1) == expected, (word, r, c, direction)
+
+def test_search_state_bitboard_snapshot_and_undo():
+    state = SearchState(6, bitboard=True)
+    assert state.grid is None
+    state.place_word('CAT', 0, 0, 'H')
+    state.place_word('ARM', 0, 1, 'V')
+    grid, placed_words_info = state.snapshot()
+    assert grid[0][:3] == ['C', 'A', 'T'] and grid[1][1] == 'R' and grid[2][1] == 'M'
+    assert state.intersections == 1
+    assert [info['word'] for info in placed_words_info] == ['CAT', 'ARM']
+    state.undo()
+    assert state.snapshot()[0] == [['C', 'A', 'T', '', '', '']] + [[''] * 6 for _ in range(5)]
+    assert state.intersections == 0
+
+@pytest.mark.parametrize('options', [{}, {'symmetry_breaking': True}, {'transposition_table_size': 1000}])
+@pytest.mark.parametrize('grid_size', [6, 8, 10])
+def test_bitboard_backend_matches_list_backend(grid_size, options):
+    for seed in range(4):
+        words = generate_word_list(seed, grid_size, 7, grid_size)
+        list_solver = FinalArrowwordSolver(words, grid_size, backend='list', **options)
+        bitboard_solver = FinalArrowwordSolver(words, grid_size, backend='bitboard', **options)
+        assert (list(list_solver.iter_solutions(limit=5, max_nodes=5000))
+                == list(bitboard_solver.iter_solutions(limit=5, max_nodes=5000)))
+        assert list_solver.budget.nodes == bitboard_solver.budget.nodes
+
+def test_bitboard_backend_on_unsolvable_list():
+    words = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+    assert FinalArrowwordSolver(words, backend='list').solve_anytime() == FinalArrowwordSolver(words, backend='bitboard').solve_anytime()
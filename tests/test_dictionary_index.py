@@ -0,0 +1,45 @@
+import re
+
+from app.dictionary_index import DictionaryIndex, bit_indices, build_index_file
+
+WORDS = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+
+def _scan(words, pattern):
+    """The words matching a pattern, found by a regular expression over the plain list."""
+    regex = re.compile(pattern.replace('?', '.') + '$')
+    return sorted(word for word in set(words) if len(word) == len(pattern) and regex.match(word))
+
+def test_match_agrees_with_scanning_the_list():
+    index = DictionaryIndex.from_words(WORDS)
+    for pattern in ['H?????Y', '???', 'E??', 'L???', '?O??', 'YELLOW', 'ZZZ', '????????', 'H?P??LY']:
+        assert index.match(pattern) == _scan(WORDS, pattern), pattern
+
+def test_words_ids_and_lengths():
+    index = DictionaryIndex.from_words(WORDS + ['lit', 'no-good', ''])
+    assert len(index) == len(WORDS)
+    assert index.lengths() == [3, 4, 5, 6, 7]
+    assert index.words(3) == sorted(word for word in WORDS if len(word) == 3)
+    for word in WORDS:
+        assert word in index
+        assert index.word(len(word), index.word_id(word)) == word
+    assert 'NOPE' not in index
+    assert index.count(9) == 0 and index.words(9) == [] and index.match('?????????') == []
+
+def test_empty_index():
+    index = DictionaryIndex.from_words([])
+    assert len(index) == 0
+    assert index.lengths() == []
+    assert index.match('???') == []
+
+def test_bit_indices():
+    assert list(bit_indices(0)) == []
+    assert list(bit_indices(0b1000000101)) == [0, 2, 9]
+
+def test_file_round_trip(tmp_path):
+    word_path = tmp_path / 'words.txt'
+    word_path.write_text('\n'.join(WORDS) + '\n')
+    index_path = tmp_path / 'words.idx'
+    build_index_file(word_path, index_path)
+    with DictionaryIndex.load(index_path) as index:
+        assert len(index) == len(WORDS)
+        assert index.match('?O??') == _scan(WORDS, '?O??')
@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.grid_check import check_grid, grids_to_array, validate_grids
+
+WORDS = ['CAT', 'CAR', 'TAR', 'ART', 'RAT', 'AT', 'TO']
+
+def _normalized(result):
+    # validate_grids may list a grid's invalid runs in another order than check_grid.
+    return result.valid, sorted(result.invalid_words), result.missing_words
+
+def _random_grid(rng, size):
+    return [[rng.choice('CATRO') if rng.random() < 0.6 else '' for _ in range(size)] for _ in range(size)]
+
+def _assert_agrees(grids, word_list):
+    expected = [_normalized(check_grid(grid, word_list)) for grid in grids]
+    assert [_normalized(result) for result in validate_grids(grids_to_array(grids), word_list)] == expected
+
+def test_agrees_with_check_grid_on_random_grids():
+    rng = random.Random(0)
+    for size in (1, 2, 3, 5):
+        _assert_agrees([_random_grid(rng, size) for _ in range(200)], WORDS)
+
+def test_agrees_with_check_grid_on_valid_grids():
+    grids = [
+        [['C', 'A', 'T'], ['', 'T', ''], ['', '', '']],
+        [['C', 'A', 'R'], ['', 'T', ''], ['', '.', '']],
+    ]
+    _assert_agrees(grids, ['CAT', 'AT'])
+    assert [result.valid for result in validate_grids(grids_to_array(grids), ['CAT', 'AT'])] == [True, False]
+
+def test_unmatchable_words_are_missing():
+    grids = [[['C', 'A', 'T'], ['', '', ''], ['', '', '']]]
+    for word_list in (['CAT', 'CAFÉ'], ['CAT', 'CAÉ'], ['CAT', 'CATS']):
+        _assert_agrees(grids, word_list)
+    assert validate_grids(grids_to_array(grids), ['CAT', 'CAFÉ'])[0].missing_words == ['CAFÉ']
+
+def test_empty_inputs():
+    assert grids_to_array([]).shape[0] == 0
+    assert validate_grids(grids_to_array([]), WORDS) == []
+    assert validate_grids(np.zeros((1, 0, 0), np.uint8), []) == [(True, [], [])]
+    assert validate_grids(np.zeros((2, 0, 0), np.uint8), ['AT']) == [(False, [], ['AT'])] * 2
+    _assert_agrees([[[]]], ['AT'])
+
+def test_non_ascii_letters_are_rejected():
+    with pytest.raises(ValueError):
+        grids_to_array([[['É', '']]])
@@ -0,0 +1,65 @@
+import json
+import random
+
+import pytest
+
+from app.benchmark import generate_word_list
+from app.instrumentation import (
+    END_CAP, LETTER_CONFLICT, NO_INTERSECTION, OUT_OF_BOUNDS, PARALLEL_NEIGHBOUR, SearchStats, rejection_reason,
+)
+from app.search_state import SearchState
+from app.slots import slot_table, slots_by_length
+from app.solver_final import FinalArrowwordSolver
+from app.solver_geminiCLI import ArrowwordSolver
+
+WORDS = generate_word_list(3, 8, 6, 7)
+
+def test_rejection_reasons():
+    slots = slot_table(5)
+    state = SearchState(5)
+    state.place_word('CAT', 1, 1, 'H')
+    grid = state.grid
+    assert rejection_reason('CATS', slots.get((1, 3, 'H', 4)), grid) == OUT_OF_BOUNDS
+    assert rejection_reason('AT', slots.get((1, 3, 'H', 2)), grid) == END_CAP
+    assert rejection_reason('DOG', slots.get((0, 1, 'V', 3)), grid) == LETTER_CONFLICT
+    assert rejection_reason('DOG', slots.get((2, 0, 'H', 3)), grid) == PARALLEL_NEIGHBOUR
+    assert rejection_reason('DOG', slots.get((3, 0, 'H', 3)), grid) == NO_INTERSECTION
+    assert rejection_reason('DOG', slots.get((3, 0, 'H', 3)), grid, is_first_word=True) is None
+    assert rejection_reason('BAD', slots.get((0, 2, 'V', 3)), grid) is None
+
+def test_rejection_reason_agrees_with_the_solver():
+    rng = random.Random(0)
+    solver = FinalArrowwordSolver(WORDS, 8)
+    for _ in range(20):
+        state = SearchState(8)
+        for word in rng.sample(WORDS, 3):
+            slot = rng.choice(slots_by_length(8)[len(word)])
+            if rejection_reason(word, slot, state.grid, not state.placed_words_info) is None:
+                state.place_word(word, slot.row, slot.col, slot.direction)
+        for word in WORDS:
+            for slot in slots_by_length(8)[len(word)]:
+                valid = solver._is_valid_placement(word, slot.row, slot.col, slot.direction, state.grid)
+                assert (rejection_reason(word, slot, state.grid) is None) == valid
+
+@pytest.mark.parametrize('solver_class', [FinalArrowwordSolver, ArrowwordSolver])
+def test_stats_do_not_change_the_search(solver_class):
+    stats = SearchStats()
+    solver = solver_class(WORDS, 8, stats=stats)
+    assert solver.solve_anytime() == solver_class(WORDS, 8).solve_anytime()
+    assert stats.nodes == solver.budget.nodes
+    assert stats.placements_tried > sum(stats.rejections.values()) > 0
+
+def test_stats_export():
+    stats = SearchStats()
+    FinalArrowwordSolver(WORDS, 8, stats=stats).solve()
+    data = json.loads(stats.to_json())
+    assert data['nodes'] == stats.nodes
+    assert sum(data['nodes_by_depth'].values()) == stats.nodes
+    assert set(data['rejections']) == {OUT_OF_BOUNDS, END_CAP, LETTER_CONFLICT, PARALLEL_NEIGHBOUR, NO_INTERSECTION}
+    lines = stats.to_collapsed_stacks().splitlines()
+    assert len(lines) == len(stats.phase_times)
+    assert lines[0].startswith('search;depth 0;')
+    for line in lines:
+        frames, microseconds = line.rsplit(' ', 1)
+        assert frames.split(';')[-1] in ('place', 'validate', 'update_domains')
+        assert int(microseconds) >= 0
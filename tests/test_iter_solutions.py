@@ -0,0 +1,56 @@
+import itertools
+
+import pytest
+
+from app.benchmark import generate_word_list
+from app.grid_check import check_grid
+from app.solver_bruteforce import BruteForceArrowwordSolver
+from app.solver_final import FinalArrowwordSolver
+from app.solver_geminiCLI import ArrowwordSolver
+from app.solver_geminiCLI_2 import GraphArrowwordSolver
+
+WORDS = generate_word_list(3, 8, 6, 7)
+
+def _key(grid):
+    return tuple(map(tuple, grid))
+
+@pytest.mark.parametrize('solver_class', [FinalArrowwordSolver, GraphArrowwordSolver])
+def test_iter_solutions_resumes_one_search(solver_class):
+    solutions = list(solver_class(WORDS, 8).iter_solutions(limit=10))
+    assert len(solutions) > 1
+    assert len({_key(grid) for grid, _ in solutions}) == len(solutions)
+    assert solver_class(WORDS, 8).solve() == solutions[0]
+    # Taking solutions one at a time continues the same search.
+    assert list(itertools.islice(solver_class(WORDS, 8).iter_solutions(), 3)) == solutions[:3]
+
+def test_iter_solutions_stops_at_the_node_budget():
+    solver = FinalArrowwordSolver(WORDS, 8)
+    everything = list(solver.iter_solutions())
+    assert not solver.budget.exhausted
+    cut_short = list(solver.iter_solutions(max_nodes=solver.budget.nodes // 2))
+    assert solver.budget.exhausted
+    assert len(cut_short) < len(everything)
+    assert cut_short == everything[:len(cut_short)]
+
+def test_bruteforce_iter_solutions_yields_distinct_valid_grids():
+    words = ['CAT', 'TO', 'AT']
+    solutions = list(BruteForceArrowwordSolver(words, 4).iter_solutions())
+    assert solutions
+    assert len({_key(grid) for grid, _ in solutions}) == len(solutions)
+    assert all(check_grid(grid, words).valid for grid, _ in solutions)
+    assert list(BruteForceArrowwordSolver(words, 4).iter_solutions(limit=1)) == solutions[:1]
+
+@pytest.mark.parametrize('solver_class', [FinalArrowwordSolver, BruteForceArrowwordSolver, ArrowwordSolver])
+def test_solve_anytime_reports_whether_it_finished(solver_class):
+    grid, placed_words_info, complete = solver_class(WORDS, 8).solve_anytime()
+    assert complete
+    assert grid is not None
+    # Cut short, it still answers with the best partial layout it saw.
+    grid, placed_words_info, complete = solver_class(WORDS, 8).solve_anytime(max_nodes=3)
+    assert not complete
+    assert grid is not None and placed_words_info
+
+def test_solve_anytime_finds_the_solution_of_solve():
+    grid, placed_words_info, complete = FinalArrowwordSolver(WORDS, 8).solve_anytime()
+    assert (grid, placed_words_info) == FinalArrowwordSolver(WORDS, 8).solve()
+    assert len(placed_words_info) == len(WORDS)
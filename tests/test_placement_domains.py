@@ -0,0 +1,73 @@
+import random
+
+from app.benchmark import generate_word_list
+from app.placement_domains import PlacementDomains
+from app.search_state import SearchState
+from app.slots import slots_by_length
+from app.solver_geminiCLI import ArrowwordSolver
+
+def _recomputed(solver, word, grid):
+    """Every valid placement of a word, found by checking each slot from scratch."""
+    return {
+        (slot.row, slot.col, slot.direction) for slot in slots_by_length(solver.grid_size).get(len(word), ())
+        if solver._is_valid_placement(word, slot.row, slot.col, slot.direction, grid)
+    }
+
+def test_domains_match_recomputation_through_place_and_undo():
+    rng = random.Random(0)
+    for seed in range(6):
+        words = generate_word_list(seed, 9, 10, 9)
+        solver = ArrowwordSolver(words, 9)
+        state = SearchState(9)
+        is_valid = lambda word, r, c, direction: solver._is_valid_placement(word, r, c, direction, state.grid)
+        domains = PlacementDomains(9, enumerate(words), is_valid)
+        assert all(not domains.domains[key] for key in domains.domains)
+
+        history = []
+        state.place_word(words[0], 0, 0, 'H')
+        domains.remove(0)
+        domains.place(state.grid, state.last_written())
+        history.append(0)
+        for _ in range(5):
+            key = domains.most_constrained()
+            if key is None:
+                break
+            placement = rng.choice(domains.placements(key))
+            domains.remove(key)
+            state.place_word(words[key], *placement)
+            domains.place(state.grid, state.last_written())
+            history.append(key)
+            for other, domain in domains.domains.items():
+                assert domain == _recomputed(solver, words[other], state.grid)
+
+        while len(history) > 1:
+            domains.undo()
+            state.undo()
+            domains.undo()
+            history.pop()
+            for other, domain in domains.domains.items():
+                assert domain == _recomputed(solver, words[other], state.grid)
+
+def test_most_constrained_breaks_ties_in_given_order():
+    domains = PlacementDomains(5, [('b', 'AB'), ('a', 'AB')], lambda *placement: True)
+    assert domains.most_constrained() is None
+    assert domains.any_empty()
+    domains.place([['A', 'B', '', '', '']] + [[''] * 5 for _ in range(4)], [(0, 0), (0, 1)])
+    assert len(domains.domains['a']) == len(domains.domains['b'])
+    assert domains.most_constrained() == 'b'
+    domains.undo()
+    assert domains.most_constrained() is None
+
+def test_solver_results_are_stable():
+    words = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+    solver = ArrowwordSolver(words)
+    grid, placed_words_info = solver.solve()
+    assert len(placed_words_info) == 11
+    # The same search without its bounds finds the same layout in more nodes.
+    baseline = ArrowwordSolver(words)
+    baseline._could_still_fit = lambda index, grid: True
+    baseline._may_gain_intersections = lambda indices, grid, needed, crossed: True
+    assert baseline.solve() == (grid, placed_words_info)
+    assert solver.budget.nodes < baseline.budget.nodes
+    subset_grid, subset_info = ArrowwordSolver(words[:9]).solve_by_combinations()
+    assert subset_grid is not None
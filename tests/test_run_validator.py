@@ -0,0 +1,52 @@
+import random
+
+from app.grid_check import check_grid
+from app.run_validator import RunValidator
+from app.solver_bruteforce import BruteForceArrowwordSolver
+
+WORDS = ['CAT', 'CAR', 'TAR', 'ART', 'AT']
+
+def test_run_through():
+    validator = RunValidator(WORDS)
+    grid = [['', 'C', 'A', 'T'], ['', '', '', 'O'], ['', '', '', ''], ['', '', '', '']]
+    assert validator.run_through(grid, 0, 2, 'H') == ('CAT', False, True)
+    assert validator.run_through(grid, 1, 3, 'V') == ('TO', True, False)
+    assert validator.run_through(grid, 0, 1, 'V') == ('C', True, False)
+
+def test_run_can_become_word():
+    validator = RunValidator(WORDS)
+    assert validator.run_can_become_word('CAT', True, True)
+    assert not validator.run_can_become_word('CA', True, True)
+    assert validator.run_can_become_word('CA', True, False)
+    assert validator.run_can_become_word('AT', False, False)
+    assert validator.run_can_become_word('AR', False, True)
+    assert not validator.run_can_become_word('RA', False, True)
+    assert not validator.run_can_become_word('TT', False, False)
+
+def test_placement_is_possible():
+    validator = RunValidator(WORDS)
+    grid = [['C', 'A', 'T', ''], ['', '', '', ''], ['', '', '', ''], ['', '', '', '']]
+    assert validator.placement_is_possible(grid, 'CAT', 0, 0, 'H')
+    grid[1][0], grid[1][1] = 'A', 'T'
+    assert validator.placement_is_possible(grid, 'AT', 1, 0, 'H')  # 'CA' down can still grow into CAT or CAR.
+    grid[1][2] = 'Z'
+    assert not validator.placement_is_possible(grid, 'ATZ', 1, 0, 'H')
+
+def test_grid_is_valid_agrees_with_check_grid():
+    rng = random.Random(0)
+    validator = RunValidator(WORDS)
+    for _ in range(300):
+        grid = [[rng.choice('CATR') if rng.random() < 0.5 else '' for _ in range(4)] for _ in range(4)]
+        assert validator.grid_is_valid(grid) == (not check_grid(grid, WORDS).invalid_words)
+
+def test_validated_search_finds_the_same_solutions():
+    for words, grid_size in ((['CAT', 'AT'], 4), (['CAT', 'TO', 'AT'], 4), (['AB', 'CD'], 2)):
+        plain = list(BruteForceArrowwordSolver(words, grid_size).iter_solutions())
+        validated = list(BruteForceArrowwordSolver(words, grid_size, validate_runs=True).iter_solutions())
+        assert sorted(map(str, validated)) == sorted(map(str, plain))
+
+def test_empty_word_list():
+    validator = RunValidator([])
+    assert validator.grid_is_valid([['', ''], ['', '']])
+    assert not validator.grid_is_valid([['A', 'B'], ['', '']])
+    assert validator.grid_is_valid([])
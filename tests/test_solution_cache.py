@@ -0,0 +1,108 @@
+import json
+import os
+
+from app.solution_cache import SolutionCache, cache_key
+
+WORDS = ['CAT', 'AT']
+GRID = [['C', 'A', 'T'], ['', 'T', ''], ['', '', '']]
+PLACED = [
+    {'word': 'CAT', 'row': 0, 'col': 0, 'direction': 'H'},
+    {'word': 'AT', 'row': 0, 'col': 1, 'direction': 'V'},
+]
+
+def test_key_ignores_word_order_but_not_repeats():
+    assert cache_key('final', ['CAT', 'AT'], 3) == cache_key('final', ['AT', 'CAT'], 3)
+    assert cache_key('final', ['CAT', 'AT'], 3) != cache_key('final', ['CAT', 'AT', 'AT'], 3)
+    assert cache_key('final', WORDS, 3) != cache_key('final', WORDS, 4)
+    assert cache_key('final', WORDS, 3) != cache_key('final', WORDS, 3, {'timeout': 1})
+
+def test_round_trip_through_the_directory(tmp_path):
+    SolutionCache(str(tmp_path)).put('final', WORDS, 3, (GRID, PLACED, True))
+    cache = SolutionCache(str(tmp_path))  # A fresh cache only has the files.
+    grid, placed_words_info, complete = cache.get('final', ['AT', 'CAT'], 3)
+    assert (grid, placed_words_info, complete) == (GRID, PLACED, True)
+    grid[0][0] = 'X'
+    assert cache.get('final', WORDS, 3)[0] == GRID
+    assert (cache.hits, cache.misses) == (2, 0)
+    assert not [name for name in os.listdir(tmp_path) if not name.endswith('.json')]
+
+def test_no_solution_is_cached():
+    cache = SolutionCache()
+    cache.put('final', ['AB', 'CD'], 2, (None, None, True))
+    assert cache.get('final', ['AB', 'CD'], 2) == (None, None, True)
+
+def test_incomplete_results_are_not_cached(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    cache.put('final', WORDS, 3, (GRID, PLACED, False))
+    assert cache.get('final', WORDS, 3) is None
+    assert os.listdir(tmp_path) == []
+
+def test_corrupt_entries_are_dropped(tmp_path):
+    SolutionCache(str(tmp_path)).put('final', WORDS, 3, (GRID, PLACED, True))
+    path = tmp_path / (cache_key('final', WORDS, 3) + '.json')
+    entry = json.loads(path.read_text())
+    entry['grid'][2][2] = 'Z'  # A letter no placement accounts for.
+    path.write_text(json.dumps(entry))
+    cache = SolutionCache(str(tmp_path))
+    assert cache.get('final', WORDS, 3) is None
+    assert not path.exists()
+    path.write_text('{"grid": [')
+    assert cache.get('final', WORDS, 3) is None
+    assert cache.misses == 2
+
+def test_memory_and_directory_eviction(tmp_path):
+    cache = SolutionCache(max_entries=1)
+    cache.put('final', WORDS, 3, (GRID, PLACED, True))
+    cache.put('final', ['AB', 'CD'], 2, (None, None, True))
+    assert cache.get('final', WORDS, 3) is None
+
+    cache = SolutionCache(str(tmp_path), max_bytes=1)
+    cache.put('final', WORDS, 3, (GRID, PLACED, True))
+    assert os.listdir(tmp_path) == []
+
+def test_get_or_solve_calls_the_solver_once():
+    cache = SolutionCache()
+    calls = []
+    def solve():
+        calls.append(1)
+        return GRID, PLACED, True
+    assert cache.get_or_solve('final', WORDS, 3, solve) == (GRID, PLACED, True)
+    assert cache.get_or_solve('final', WORDS, 3, solve) == (GRID, PLACED, True)
+    assert len(calls) == 1
+
+def test_clear(tmp_path):
+    cache = SolutionCache(str(tmp_path))
+    cache.put('final', WORDS, 3, (GRID, PLACED, True))
+    cache.clear()
+    assert cache.get('final', WORDS, 3) is None
+    assert os.listdir(tmp_path) == []
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    def fail(source, destination):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'replace', fail)
+    cache = SolutionCache(str(tmp_path))
+    cache.put('final', WORDS, 3, (GRID, PLACED, True))
+    assert os.listdir(tmp_path) == []
+    assert cache.get('final', WORDS, 3) == (GRID, PLACED, True)  # Still answered from memory.
+
+def test_directory_is_listed_only_when_over_budget(tmp_path, monkeypatch):
+    listings = []
+    listdir = os.listdir
+    def counting_listdir(path):
+        listings.append(path)
+        return listdir(path)
+    monkeypatch.setattr(os, 'listdir', counting_listdir)
+    cache = SolutionCache(str(tmp_path))
+    for i in range(20):
+        cache.put('final', [f'W{i}'], 2, (None, None, True))
+    assert len(listings) == 1  # The first write counts what is already there.
+
+    entry_size = os.path.getsize(tmp_path / (cache_key('final', ['W0'], 2) + '.json'))
+    cache = SolutionCache(str(tmp_path), max_bytes=5 * entry_size)
+    listings.clear()
+    for i in range(20, 40):
+        cache.put('final', [f'W{i}'], 2, (None, None, True))
+        assert sum(os.path.getsize(tmp_path / name) for name in listdir(tmp_path)) <= 5 * entry_size
+    assert len(listings) < 20
+    assert (tmp_path / (cache_key('final', ['W39'], 2) + '.json')).exists()
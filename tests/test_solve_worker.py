@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from app import solve_worker
+from app.benchmark import generate_word_list
+from app.solve_worker import SolveWorker
+from app.solver_final import FinalArrowwordSolver
+
+WORDS = generate_word_list(3, 8, 6, 7)
+
+def _events(worker, timeout=30):
+    """Waits for the worker to finish and returns every event it posted."""
+    deadline = time.monotonic() + timeout
+    while worker.is_running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not worker.is_running()
+    return worker.poll()
+
+def test_done_event_has_the_solver_result():
+    worker = SolveWorker('final', WORDS, 8)
+    worker.start()
+    events = _events(worker)
+    assert [event['type'] for event in events] == ['done']
+    solver = FinalArrowwordSolver(WORDS, 8)
+    grid, placed_words_info, complete = solver.solve_anytime()
+    done = events[0]
+    assert (done['grid'], done['placed_words_info'], done['complete']) == (grid, placed_words_info, complete)
+    assert done['nodes'] == solver.budget.nodes
+    assert not done['cancelled']
+    assert worker.poll() == []
+
+def test_progress_and_cancel():
+    worker = SolveWorker('gemini-cli', generate_word_list(2, 10, 20, 10), 10, progress_interval=0)
+    worker.start()
+    deadline = time.monotonic() + 30
+    progress = []
+    while not progress and time.monotonic() < deadline:
+        progress = [event for event in worker.poll() if event['type'] == 'progress']
+        time.sleep(0.01)
+    assert progress
+    assert len(progress[0]['grid']) == 10
+    assert progress[0]['nodes'] > 0
+    worker.cancel()
+    done = [event for event in _events(worker) if event['type'] == 'done']
+    assert len(done) == 1
+    assert done[0]['cancelled'] and not done[0]['complete']
+    assert done[0]['grid'] is not None  # The best layout found before the cancel.
+
+def test_errors_are_reported(monkeypatch):
+    def fail(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setitem(solve_worker.RUNNERS, 'final', fail)
+    worker = SolveWorker('final', WORDS)
+    worker.start()
+    assert _events(worker) == [{'type': 'error', 'message': "RuntimeError: boom"}]
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        SolveWorker('bruteforce', WORDS)
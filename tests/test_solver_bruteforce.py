@@ -0,0 +1,44 @@
+from app.benchmark import generate_word_list
+from app.grid_check import check_grid
+from app.solver_bruteforce import BruteForceArrowwordSolver
+
+def test_prefix_tree_solves_like_permutations():
+    cases = [(['CAT', 'AT'], 4), (['CAT', 'TO', 'AT'], 4), (['DOG', 'GO', 'ODE'], 5)]
+    cases += [(generate_word_list(seed, 6, 4, 5), 6) for seed in range(4)]
+    for words, grid_size in cases:
+        for symmetry_breaking in (False, True):
+            expected = BruteForceArrowwordSolver(words, grid_size, symmetry_breaking).solve()
+            tree_grid, tree_info, complete = BruteForceArrowwordSolver(words, grid_size, symmetry_breaking).solve_prefix_tree()
+            assert (tree_grid, tree_info) == expected
+            assert complete
+            if tree_grid is not None:
+                assert check_grid(tree_grid, words).valid
+
+def test_prefix_tree_without_a_solution():
+    # Side by side or crossing, the two words always leave a run that is not a word.
+    solver = BruteForceArrowwordSolver(['AB', 'CD'], 2)
+    assert solver.solve_prefix_tree() == (None, None, True)
+    # One placement of each word in each of the two orders.
+    assert solver.iterations == 4
+
+def test_prefix_tree_cap_counts_placements():
+    words = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+    solver = BruteForceArrowwordSolver(words, 8)
+    assert solver.solve_prefix_tree() == (None, None, False)
+    assert solver.iterations == 10000
+    assert solver.budget.nodes == 10000
+
+def test_each_search_starts_its_own_count():
+    words = ['ABC', 'DEF', 'GHI', 'JKL', 'MNO']
+    solver = BruteForceArrowwordSolver(words, 5)
+    solver.solve_prefix_tree(max_nodes=2000)
+    first = solver.iterations
+    solver.solve_prefix_tree(max_nodes=2000)
+    assert solver.iterations == first
+    solver.solve_anytime(max_nodes=2000)
+    assert solver.iterations <= 120
+    assert list(solver.iter_solutions(max_nodes=2000)) == []
+    assert solver.iterations <= 120
+
+def test_no_words():
+    assert BruteForceArrowwordSolver([]).solve_prefix_tree() == ([[''] * 8 for _ in range(8)], [], True)
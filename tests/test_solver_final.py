@@ -0,0 +1,28 @@
+import pytest
+
+from app.benchmark import generate_word_list
+from app.grid_check import check_grid
+from app.solver_final import FinalArrowwordSolver
+
+SAMPLE = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+# (seed, grid size) of generated lists that the Final search can solve.
+SOLVABLE = [(1, 7), (4, 7), (3, 8), (6, 8)]
+
+def _words(seed, grid_size):
+    return generate_word_list(seed, grid_size, 6, grid_size)
+
+@pytest.mark.parametrize('split_depth', [1, 2])
+@pytest.mark.parametrize('seed, grid_size', SOLVABLE)
+def test_parallel_solves_what_serial_solves(seed, grid_size, split_depth):
+    words = _words(seed, grid_size)
+    assert FinalArrowwordSolver(words, grid_size).solve()[0] is not None
+    grid, placed_words_info = FinalArrowwordSolver(words, grid_size).solve_parallel(max_workers=2, split_depth=split_depth)
+    assert check_grid(grid, words).valid
+    assert sorted(info['word'] for info in placed_words_info) == sorted(words)
+
+def test_parallel_without_a_solution():
+    assert FinalArrowwordSolver(SAMPLE).solve() == (None, None)
+    assert FinalArrowwordSolver(SAMPLE).solve_parallel(max_workers=2) == (None, None)
+
+def test_parallel_with_one_word_searches_here():
+    assert FinalArrowwordSolver(['CAT'], 4).solve_parallel(max_workers=2) == FinalArrowwordSolver(['CAT'], 4).solve()
@@ -0,0 +1,23 @@
+import concurrent.futures
+
+from app.solver_final_v2 import FinalArrowwordSolverV2
+
+WORDS = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+
+def test_restarts_in_a_shared_pool_match_running_here():
+    expected = FinalArrowwordSolverV2(WORDS, 15).solve_restarts(restarts=8, max_workers=1)
+    with concurrent.futures.ProcessPoolExecutor(2) as executor:
+        for seed in (0, 0):
+            assert FinalArrowwordSolverV2(WORDS, 15).solve_restarts(restarts=8, seed=seed, executor=executor) == expected
+        # The pool is left running for the caller.
+        assert executor.submit(len, WORDS).result() == len(WORDS)
+
+def test_restarts_never_do_worse_than_one_pass():
+    greedy = FinalArrowwordSolverV2(WORDS, 10)
+    greedy.solve()
+    solver = FinalArrowwordSolverV2(WORDS, 10)
+    solver.solve_restarts(restarts=8, max_workers=1)
+    assert len(solver.placed_words_info) >= len(greedy.placed_words_info)
+
+def test_no_words():
+    assert FinalArrowwordSolverV2([], 5).solve_restarts(restarts=2, max_workers=1) == FinalArrowwordSolverV2([], 5).solve()
@@ -0,0 +1,39 @@
+from app.benchmark import generate_word_list
+from app.solver_geminiCLI import ArrowwordSolver
+
+def _unpruned_search(words, grid_size):
+    """A solver that has searched every layout, without the bounds."""
+    solver = ArrowwordSolver(words, grid_size)
+    solver._could_still_fit = lambda index, grid: True
+    solver._may_gain_intersections = lambda indices, grid, needed, crossed: True
+    solver.solve()
+    return solver
+
+def _unpruned_score(words, grid_size):
+    """The best (words placed, intersections) over every layout, searched without the bounds."""
+    return _unpruned_search(words, grid_size)._best.score
+
+def test_solve_breaks_ties_on_intersections():
+    for seed in range(4):
+        words = generate_word_list(seed, 6, 6, 5)
+        solver = ArrowwordSolver(words, 6)
+        solver.solve()
+        assert solver._best.score == _unpruned_score(words, 6)
+
+def test_intersection_bound_keeps_the_best_layout():
+    for seed in range(6):
+        words = generate_word_list(seed, 8, 10, 7)
+        solver = ArrowwordSolver(words, 8)
+        solver.solve()
+        unpruned = _unpruned_search(words, 8)
+        assert solver._best.score == unpruned._best.score
+        assert solver.budget.nodes <= unpruned.budget.nodes
+
+def test_sample_words_break_ties_on_intersections():
+    words = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+    solver = ArrowwordSolver(words[:6])
+    solver.solve()
+    assert solver._best.score == _unpruned_score(words[:6], 8)
+
+def test_no_words():
+    assert ArrowwordSolver([]).solve() == (None, None)
@@ -0,0 +1,50 @@
+from bisect import bisect_left
+
+from app.benchmark import generate_square_words
+from app.solver_reddit import fill, iter_crosswords
+
+def _baseline_fill(N, words, crossword):
+    """fill before the trie: rebuilds each column and scans the sorted words for it."""
+    for col in range(N):
+        if not _could_place_vertical_word(words, crossword, col):
+            return
+    if len(crossword) == N:
+        if len(set(_get_col(crossword, i) for i in range(N))) < N: return
+        yield crossword
+    for w in words:
+        if w in crossword: continue
+        crossword.append(w)
+        yield from _baseline_fill(N, words, crossword)
+        crossword.pop()
+
+def _get_col(crossword, col):
+    return ''.join(w[col] for w in crossword)
+
+def _could_place_vertical_word(words, crossword, col):
+    prefix = _get_col(crossword, col)
+    for i in range(bisect_left(words, prefix), len(words)):
+        if words[i] in crossword: continue
+        if not words[i].startswith(prefix): break
+        return True
+    return False
+
+def test_trie_fill_matches_the_baseline():
+    for seed, size, extra in ((1, 3, 40), (2, 3, 80), (3, 4, 120)):
+        words = sorted(w for w in generate_square_words(seed, size, extra) if len(w) == size)
+        expected = [list(square) for square in _baseline_fill(size, words, [])]
+        assert expected
+        assert [list(square) for square in fill(size, words, [])] == expected
+
+def test_fill_continues_a_started_square():
+    words = generate_square_words(4, 3, 60)
+    first_row = words[0]  # The rows of the square come first.
+    words.sort()
+    expected = [list(square) for square in _baseline_fill(3, words, [first_row])]
+    assert expected
+    assert [list(square) for square in fill(3, words, [first_row])] == expected
+
+def test_iter_crosswords_stops_at_the_limit():
+    words = generate_square_words(1, 3, 40)
+    squares = list(iter_crosswords(3, words, limit=2))
+    assert len(squares) == 2
+    assert squares[0] != squares[1]
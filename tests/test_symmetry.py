@@ -0,0 +1,43 @@
+import pytest
+
+from app.benchmark import generate_word_list
+from app.solver_bruteforce import BruteForceArrowwordSolver
+from app.solver_final import FinalArrowwordSolver
+from app.solver_geminiCLI_2 import GraphArrowwordSolver
+from app.symmetry import canonical_form, first_word_directions, transpose_grid, transpose_placements
+
+GRID = [['C', 'A', 'T'], ['', 'T', ''], ['', '', '']]
+PLACED = [{'word': 'CAT', 'row': 0, 'col': 0, 'direction': 'H'}, {'word': 'AT', 'row': 0, 'col': 1, 'direction': 'V'}]
+
+def _grids(solutions):
+    return [tuple(map(tuple, grid)) for grid, _ in solutions]
+
+def test_transpose_and_canonical_form():
+    assert transpose_grid(transpose_grid(GRID)) == GRID
+    assert transpose_placements(transpose_placements(PLACED)) == PLACED
+    assert transpose_placements(PLACED)[0] == {'word': 'CAT', 'row': 0, 'col': 0, 'direction': 'V'}
+    # A layout and its transpose share one canonical form.
+    assert canonical_form(GRID, PLACED) == canonical_form(transpose_grid(GRID), transpose_placements(PLACED))
+    assert canonical_form([], []) == ([], [])
+    assert first_word_directions(True) == ('H',)
+    assert first_word_directions(False) == ('H', 'V')
+
+@pytest.mark.parametrize('make_solver', [
+    lambda words, grid_size, **options: FinalArrowwordSolver(words, grid_size, **options),
+    lambda words, grid_size, **options: FinalArrowwordSolver(words, grid_size, backend='bitboard', **options),
+    lambda words, grid_size, **options: GraphArrowwordSolver(words, grid_size, validate_runs=True, **options),
+])
+@pytest.mark.parametrize('seed, grid_size', [(4, 7), (3, 8)])
+def test_symmetry_breaking_only_drops_transposes(make_solver, seed, grid_size):
+    words = generate_word_list(seed, grid_size, 6, grid_size)
+    plain = list(make_solver(words, grid_size).iter_solutions())
+    broken = list(make_solver(words, grid_size, symmetry_breaking=True).iter_solutions())
+    assert plain
+    assert set(_grids(broken)) == set(_grids(canonical_form(*solution) for solution in plain))
+    assert len(broken) < len(plain)
+
+def test_brute_force_symmetry_breaking_only_drops_transposes():
+    plain = list(BruteForceArrowwordSolver(['CAT', 'AT'], 4).iter_solutions())
+    broken = list(BruteForceArrowwordSolver(['CAT', 'AT'], 4, symmetry_breaking=True).iter_solutions())
+    assert set(_grids(broken)) == set(_grids(canonical_form(*solution) for solution in plain))
+    assert len(broken) < len(plain)
@@ -0,0 +1,34 @@
+from app.dictionary_index import DictionaryIndex
+from app.grid_check import check_grid
+from app.template_fill import TemplateFiller, extract_slots, parse_template
+
+WORDS = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+TEMPLATE = ['???????.', '?.?..?..', '???.????', '?....?.?', '?????..?', '?.?..???', '??????.?', '..?..???']
+
+def test_parse_template_and_slots():
+    grid = parse_template(['a?.', '#_ '])
+    assert grid == [['A', '', '.'], ['.', '', '']]
+    slots = extract_slots(grid)
+    assert [(slot.row, slot.col, slot.direction, len(slot.cells)) for slot in slots] == [
+        (0, 0, 'H', 2), (1, 1, 'H', 2), (0, 1, 'V', 2),
+    ]
+
+def test_fills_the_sample_template():
+    filler = TemplateFiller(TEMPLATE, DictionaryIndex.from_words(WORDS))
+    grid, placed_words_info = filler.fill(timeout=10)
+    assert grid is not None
+    assert len(placed_words_info) == len(WORDS)
+    assert check_grid(grid, WORDS).valid
+
+def test_no_words_of_a_slot_length():
+    index = DictionaryIndex.from_words(['ABCD'])
+    assert TemplateFiller(['???'], index).fill() == (None, None)
+    assert TemplateFiller(['??.', '...', '...'], index).fill() == (None, None)
+
+def test_no_consistent_fill():
+    # Both across slots need a word starting with A, but the only one can be used once.
+    index = DictionaryIndex.from_words(['AB', 'CD'])
+    assert TemplateFiller(['A?', '..', 'A?'], index).fill() == (None, None)
+
+def test_empty_template():
+    assert TemplateFiller(['...'], DictionaryIndex.from_words(['AB'])).fill() == ([['.', '.', '.']], [])
@@ -0,0 +1,55 @@
+import pytest
+
+from app.benchmark import generate_word_list
+from app.solver_final import FinalArrowwordSolver
+from app.solver_geminiCLI import ArrowwordSolver
+from app.transposition import TranspositionTable, ZobristHasher
+
+SAMPLE = ['HAPPILY', 'HOLIDAY', 'YELLOW', 'LEGEND', 'LOVE', 'EWE', 'DONUT', 'LIT', 'POT', 'EVIL', 'EYE', 'END', 'NILE']
+
+def _grids(solutions):
+    return {tuple(map(tuple, grid)) for grid, _ in solutions}
+
+def test_table_evicts_the_least_recently_used():
+    table = TranspositionTable(2)
+    table.add_refuted(1)
+    table.add_refuted(2)
+    assert table.is_refuted(1)
+    table.add_refuted(3)
+    assert len(table) == 2
+    assert table.is_refuted(1) and table.is_refuted(3) and not table.is_refuted(2)
+    assert table.hits == 3
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+
+def test_words_hash_depends_on_order():
+    hasher = ZobristHasher()
+    assert hasher.words_hash(['CAT', 'AT']) != hasher.words_hash(['AT', 'CAT'])
+    assert hasher.words_hash(['CAT', 'AT']) == hasher.words_hash(['CAT', 'AT'])
+    assert hasher.words_hash([]) == 0
+
+@pytest.mark.parametrize('backend', FinalArrowwordSolver.BACKENDS)
+@pytest.mark.parametrize('seed, grid_size', [(1, 7), (4, 7), (3, 8), (6, 8)])
+def test_final_finds_the_same_layouts_with_the_table(seed, grid_size, backend):
+    words = generate_word_list(seed, grid_size, 6, grid_size)
+    plain = FinalArrowwordSolver(words, grid_size, backend=backend)
+    table = FinalArrowwordSolver(words, grid_size, backend=backend, transposition_table_size=1000)
+    assert _grids(table.iter_solutions()) == _grids(plain.iter_solutions())
+    assert table.budget.nodes <= plain.budget.nodes
+
+def test_final_with_a_tiny_table_on_an_unsolvable_list():
+    plain = FinalArrowwordSolver(SAMPLE)
+    table = FinalArrowwordSolver(SAMPLE, transposition_table_size=1)
+    assert table.solve_anytime() == plain.solve_anytime()
+    assert table.budget.nodes <= plain.budget.nodes
+
+def test_subset_search_finds_the_same_layout_with_the_table():
+    words = SAMPLE[:9]
+    assert ArrowwordSolver(words, transposition_table_size=10000).solve_by_combinations() == ArrowwordSolver(words).solve_by_combinations()
+
+def test_repeated_words_give_each_layout_once():
+    words = ['TOT', 'TOT', 'OO']
+    plain = [grid for grid, _ in FinalArrowwordSolver(words, 5).iter_solutions()]
+    table = [grid for grid, _ in FinalArrowwordSolver(words, 5, transposition_table_size=1000).iter_solutions()]
+    assert len(plain) > len(_grids((grid, None) for grid in plain))
+    assert len(table) == len(_grids((grid, None) for grid in table)) == len(_grids((grid, None) for grid in plain))